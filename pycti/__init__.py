@@ -9,6 +9,7 @@ from .connector.opencti_connector_helper import (
     OpenCTIConnectorHelper,
     get_config_variable,
 )
+from .connector.opencti_connector_helper_async import AsyncOpenCTIConnectorHelper
 from .entities.opencti_attack_pattern import AttackPattern
 from .entities.opencti_campaign import Campaign
 from .entities.opencti_course_of_action import CourseOfAction
@@ -51,6 +52,7 @@ from .utils.opencti_stix2_update import OpenCTIStix2Update
 from .utils.opencti_stix2_utils import OpenCTIStix2Utils
 
 __all__ = [
+    "AsyncOpenCTIConnectorHelper",
     "AttackPattern",
     "Campaign",
     "ConnectorType",
@@ -1,10 +1,12 @@
 # coding: utf-8
 import base64
+import contextlib
+import contextvars
 import datetime
 import io
-import json
 import logging
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import magic
 import requests
@@ -46,10 +48,26 @@ from pycti.entities.opencti_stix_sighting_relationship import StixSightingRelati
 from pycti.entities.opencti_threat_actor import ThreatActor
 from pycti.entities.opencti_tool import Tool
 from pycti.entities.opencti_vulnerability import Vulnerability
+from pycti.utils import opencti_json
+from pycti.utils.opencti_graphql import (
+    FULL_PLAN,
+    SelectionPlan,
+    check_projection,
+    compact_query,
+    compile_plan,
+    parse_selection,
+    project_selection,
+)
 from pycti.utils.opencti_stix2 import OpenCTIStix2
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Request headers of the current context (such as the message processed by a
+# connector), added to the client headers
+context_request_headers: contextvars.ContextVar = contextvars.ContextVar(
+    "opencti_request_headers", default=None
+)
+
 
 class CustomJsonFormatter(jsonlogger.JsonFormatter):
     def add_fields(self, log_record, record, message_dict):
@@ -136,6 +154,11 @@ class OpenCTIApiClient:
         self.request_headers = {"Authorization": "Bearer " + token}
         self.session = requests.session()
 
+        # Compiled query documents and selection plans
+        self.query_documents = {}
+        self.selection_plans = {}
+        self.projections = {}
+
         # Define the dependencies
         self.work = OpenCTIApiWork(self)
         self.connector = OpenCTIApiConnector(self)
@@ -180,6 +203,39 @@ class OpenCTIApiClient:
                 "OpenCTI API is not reachable. Waiting for OpenCTI API to start or check your configuration..."
             )
 
+    @staticmethod
+    @contextlib.contextmanager
+    def request_headers_context(headers: Dict):
+        """add request headers to the queries sent from the current context
+
+        Unlike `set_applicant_id_header`, the headers are not shared with other
+        threads, so concurrent operations can use different headers.
+
+        :param headers: headers to add
+        :type headers: dict
+        """
+
+        current_headers = context_request_headers.get()
+        token = context_request_headers.set(
+            headers if current_headers is None else {**current_headers, **headers}
+        )
+        try:
+            yield
+        finally:
+            context_request_headers.reset(token)
+
+    def get_request_headers(self) -> Dict:
+        """get the headers of the requests sent from the current context
+
+        :return: the client headers with the context ones
+        :rtype: dict
+        """
+
+        headers = context_request_headers.get()
+        if headers is None:
+            return self.request_headers
+        return {**self.request_headers, **headers}
+
     def set_applicant_id_header(self, applicant_id):
         self.request_headers["opencti-applicant-id"] = applicant_id
 
@@ -188,13 +244,15 @@ class OpenCTIApiClient:
             "" if retry_number is None else str(retry_number)
         )
 
-    def query(self, query, variables={}):
+    def query(self, query, variables={}, raise_errors=True):
         """submit a query to the OpenCTI GraphQL API
 
         :param query: GraphQL query string
         :type query: str
         :param variables: GraphQL query variables, defaults to {}
         :type variables: dict, optional
+        :param raise_errors: raise on GraphQL errors instead of returning them, defaults to True
+        :type raise_errors: bool, optional
         :return: returns the response json content
         :rtype: Any
         """
@@ -222,7 +280,9 @@ class OpenCTIApiClient:
         # If yes, transform variable (file to null) and create multipart query
         if len(files_vars) > 0:
             multipart_data = {
-                "operations": json.dumps({"query": query, "variables": query_var})
+                "operations": opencti_json.dumps(
+                    {"query": query, "variables": query_var}
+                )
             }
             # Build the multipart map
             map_index = 0
@@ -238,7 +298,7 @@ class OpenCTIApiClient:
                 else:
                     file_vars[str(map_index)] = [var_name]
                     map_index += 1
-            multipart_data["map"] = json.dumps(file_vars)
+            multipart_data["map"] = opencti_json.dumps(file_vars)
             # Add the files
             file_index = 0
             multipart_files = []
@@ -281,7 +341,7 @@ class OpenCTIApiClient:
                 self.api_url,
                 data=multipart_data,
                 files=multipart_files,
-                headers=self.request_headers,
+                headers=self.get_request_headers(),
                 verify=self.ssl_verify,
                 proxies=self.proxies,
             )
@@ -289,37 +349,322 @@ class OpenCTIApiClient:
         else:
             r = self.session.post(
                 self.api_url,
-                json={"query": query, "variables": variables},
-                headers=self.request_headers,
+                data=opencti_json.dumps({"query": query, "variables": variables}),
+                headers={
+                    **self.get_request_headers(),
+                    "Content-Type": "application/json",
+                },
                 verify=self.ssl_verify,
                 proxies=self.proxies,
             )
         # Build response
         if r.status_code == 200:
-            result = r.json()
-            if "errors" in result:
-                main_error = result["errors"][0]
-                error_name = (
-                    main_error["name"]
-                    if "name" in main_error
-                    else main_error["message"]
-                )
-                if "data" in main_error and "reason" in main_error["data"]:
-                    logging.error(main_error["data"]["reason"])
-                    raise ValueError(
-                        {"name": error_name, "message": main_error["data"]["reason"]}
-                    )
-                else:
-                    logging.error(main_error["message"])
-                    raise ValueError(
-                        {"name": error_name, "message": main_error["message"]}
-                    )
+            result = opencti_json.loads(r.content)
+            if "errors" in result and raise_errors:
+                main_error = self.format_error(result["errors"][0])
+                logging.error(main_error["message"])
+                raise ValueError(main_error)
             else:
                 return result
         else:
             logging.info(r.text)
             raise ValueError(r.text)
 
+    @staticmethod
+    def format_error(error: Dict) -> Dict:
+        """normalize a GraphQL error returned by the OpenCTI API
+
+        :param error: GraphQL error entry
+        :type error: dict
+        :return: dict with the error `name` and `message`
+        :rtype: dict
+        """
+
+        error_name = error["name"] if "name" in error else error["message"]
+        if "data" in error and "reason" in error["data"]:
+            return {"name": error_name, "message": error["data"]["reason"]}
+        return {"name": error_name, "message": error["message"]}
+
+    def query_batch(
+        self,
+        operation: str,
+        field: str,
+        argument_types: Dict[str, str],
+        items: List[Dict],
+        selection: str,
+        batch_size: int = 50,
+        max_workers: int = 1,
+    ) -> List[Tuple[Any, Optional[Dict]]]:
+        """submit the same GraphQL field many times using aliased requests
+
+        Every item is sent as an aliased call of `field` so that a whole chunk
+        of items is resolved in a single round trip. Chunks can be sent
+        concurrently when `max_workers` is greater than 1.
+
+        :param operation: GraphQL operation type (`query` or `mutation`)
+        :type operation: str
+        :param field: GraphQL field to call for every item
+        :type field: str
+        :param argument_types: GraphQL type of every supported argument
+        :type argument_types: dict
+        :param items: list of arguments dict, one per call
+        :type items: list
+        :param selection: GraphQL selection of the field result
+        :type selection: str
+        :param batch_size: number of aliased calls per request, defaults to 50
+        :type batch_size: int, optional
+        :param max_workers: number of concurrent requests, defaults to 1
+        :type max_workers: int, optional
+        :return: list of (data, error) tuples in the order of `items`
+        :rtype: list
+        """
+
+        batch_size = max(batch_size, 1)
+        chunks = [
+            (start, items[start : start + batch_size])
+            for start in range(0, len(items), batch_size)
+        ]
+
+        def process_chunk(chunk):
+            start, chunk_items = chunk
+            declarations = []
+            calls = []
+            variables = {}
+            for index, arguments in enumerate(chunk_items):
+                alias = "a" + str(start + index)
+                call_arguments = []
+                for name, value in arguments.items():
+                    if name not in argument_types or value is None:
+                        continue
+                    variable = alias + "_" + name
+                    declarations.append("$" + variable + ": " + argument_types[name])
+                    call_arguments.append(name + ": $" + variable)
+                    variables[variable] = value
+                calls.append(
+                    alias
+                    + ": "
+                    + field
+                    + (
+                        "(" + ", ".join(call_arguments) + ")"
+                        if len(call_arguments) > 0
+                        else ""
+                    )
+                    + " { "
+                    + selection
+                    + " }"
+                )
+            query = (
+                operation
+                + " Batch"
+                + field[0].upper()
+                + field[1:]
+                + ("(" + ", ".join(declarations) + ")" if len(declarations) > 0 else "")
+                + " {\n"
+                + "\n".join(calls)
+                + "\n}"
+            )
+            try:
+                result = self.query(query, variables, raise_errors=False)
+            except Exception as e:  # pylint: disable=broad-except
+                error = {"name": "RequestError", "message": str(e)}
+                return [(None, error)] * len(chunk_items)
+            data = result.get("data") or {}
+            errors = {}
+            global_error = None
+            for error in result.get("errors", []):
+                path = error.get("path")
+                if path is not None and len(path) > 0:
+                    errors.setdefault(path[0], self.format_error(error))
+                elif global_error is None:
+                    global_error = self.format_error(error)
+            outcome = []
+            for index in range(len(chunk_items)):
+                alias = "a" + str(start + index)
+                error = errors.get(alias, global_error)
+                if error is not None:
+                    logging.error(error["message"])
+                outcome.append((data.get(alias), error))
+            return outcome
+
+        results = []
+        if max_workers > 1 and len(chunks) > 1:
+            # Chunks are sent with the request headers of the caller context
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        contextvars.copy_context().run, process_chunk, chunk
+                    )
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    results.extend(future.result())
+        else:
+            for chunk in chunks:
+                results.extend(process_chunk(chunk))
+        return results
+
+    def read_many(
+        self,
+        field: str,
+        ids: List[str],
+        selection: str,
+        batch_size: int = 50,
+        max_workers: int = 1,
+    ) -> Dict[str, Optional[Dict]]:
+        """read many entities by id using aliased requests
+
+        :param field: GraphQL field reading an entity by id
+        :type field: str
+        :param ids: the ids of the entities (internal, standard or STIX ids)
+        :type ids: list
+        :param selection: GraphQL selection of the entities
+        :type selection: str
+        :param batch_size: number of entities per request, defaults to 50
+        :type batch_size: int, optional
+        :param max_workers: number of concurrent requests, defaults to 1
+        :type max_workers: int, optional
+        :raises ValueError: if an entity cannot be read
+        :return: dict of the entities by requested id, None for the missing ones
+        :rtype: dict
+        """
+
+        ids = list(dict.fromkeys(ids))
+        results = self.query_batch(
+            "query",
+            field,
+            {"id": "String!"},
+            [{"id": id} for id in ids],
+            selection,
+            batch_size,
+            max_workers,
+        )
+        plan = self.compile_selection(selection)
+        entities = {}
+        for id, (data, error) in zip(ids, results):
+            if error is not None:
+                raise ValueError(error)
+            entities[id] = self.process_fields_plan(data, plan)
+        return entities
+
+    def read_many_entities(
+        self, field: str, name: str, properties: str, **kwargs
+    ) -> Optional[Dict[str, Optional[Dict]]]:
+        """read many entities by id, on behalf of the `read_many` of an entity
+
+        :param field: GraphQL field reading an entity by id
+        :type field: str
+        :param name: name of the entity type in the logs
+        :type name: str
+        :param properties: the full selection of the entity
+        :type properties: str
+        :param ids: the ids of the entities (internal, standard or STIX ids)
+        :type ids: list
+        :param customAttributes: (optional) the GraphQL selection of the entities
+        :type customAttributes: str
+        :param projection: (optional) projection preset, one of `ids`, `core`
+                           or `full` (default)
+        :type projection: str
+        :param batchSize: (optional) number of entities per request, defaults to 50
+        :type batchSize: int
+        :param maxWorkers: (optional) number of concurrent requests, defaults to 1
+        :type maxWorkers: int
+        :return: dict of the entities by requested id, None for the missing ones,
+                 None if the ids are missing
+        :rtype: dict
+        """
+
+        ids = kwargs.get("ids", None)
+        if ids is None:
+            self.log("error", "Missing parameters: ids")
+            return None
+        self.log("info", "Reading " + str(len(ids)) + " " + name + ".")
+        selection = self.select(
+            properties,
+            kwargs.get("customAttributes", None),
+            kwargs.get("projection", None),
+        )
+        return self.read_many(
+            field,
+            ids,
+            selection,
+            kwargs.get("batchSize", 50),
+            kwargs.get("maxWorkers", 1),
+        )
+
+    def compile_query(self, prefix: str, selection: str, suffix: str) -> str:
+        """build a GraphQL document around a selection, compiled once
+
+        The document is compacted and cached, so successive calls with the same
+        selection reuse it instead of rebuilding it.
+
+        :param prefix: the document up to the selection
+        :type prefix: str
+        :param selection: the selection of the queried entities
+        :type selection: str
+        :param suffix: the document after the selection
+        :type suffix: str
+        :return: the compiled document
+        :rtype: str
+        """
+
+        key = (prefix, selection, suffix)
+        document = self.query_documents.get(key)
+        if document is None:
+            document = compact_query(prefix + selection + suffix)
+            self.query_documents[key] = document
+        return document
+
+    def select(
+        self,
+        properties: str,
+        custom_attributes: Optional[str] = None,
+        projection: Optional[str] = None,
+    ) -> str:
+        """resolve the selection of an entity list or read query
+
+        :param properties: the full selection of the entity
+        :type properties: str
+        :param custom_attributes: (optional) selection given by the caller, takes
+                                  precedence over the projection
+        :type custom_attributes: str
+        :param projection: (optional) projection preset, one of `ids`, `core`
+                           or `full` (default)
+        :type projection: str
+        :return: the selection to query
+        :rtype: str
+        """
+
+        if projection is not None:
+            check_projection(projection)
+        if custom_attributes is not None:
+            return custom_attributes
+        if projection is None or projection == "full":
+            return properties
+        key = (properties, projection)
+        selection = self.projections.get(key)
+        if selection is None:
+            selection = project_selection(properties, projection)
+            self.projections[key] = selection
+        return selection
+
+    def compile_selection(self, selection: Optional[str]) -> SelectionPlan:
+        """compile the post-processing plan of a GraphQL selection, cached
+
+        :param selection: the selection of the processed entities, None to
+                          process every known field
+        :type selection: str
+        :return: the post-processing plan
+        :rtype: SelectionPlan
+        """
+
+        if selection is None:
+            return FULL_PLAN
+        plan = self.selection_plans.get(selection)
+        if plan is None:
+            plan = compile_plan(parse_selection(selection))
+            self.selection_plans[selection] = plan
+        return plan
+
     def fetch_opencti_file(self, fetch_uri, binary=False, serialize=False):
         """get file from the OpenCTI API
 
@@ -331,7 +676,7 @@ class OpenCTIApiClient:
         :rtype: str or bytes
         """
 
-        r = self.session.get(fetch_uri, headers=self.request_headers)
+        r = self.session.get(fetch_uri, headers=self.get_request_headers())
         if binary:
             if serialize:
                 return base64.b64encode(r.content).decode("utf-8")
@@ -432,14 +777,25 @@ class OpenCTIApiClient:
         else:
             return False
 
-    def process_multiple(self, data: dict, with_pagination=False) -> Union[dict, list]:
+    def process_multiple(
+        self, data: dict, with_pagination=False, selection=None
+    ) -> Union[dict, list]:
         """processes data returned by the OpenCTI API with multiple entities
 
         :param data: data to process
         :param with_pagination: whether to use pagination with the API
+        :param selection: (optional) the GraphQL selection of the entities, only
+                          the fields it requests are processed
         :returns: returns either a dict or list with the processes entities
         """
 
+        return self.process_multiple_plan(
+            data, with_pagination, self.compile_selection(selection)
+        )
+
+    def process_multiple_plan(
+        self, data: dict, with_pagination, plan: SelectionPlan
+    ) -> Union[dict, list]:
         if with_pagination:
             result = {"entities": [], "pagination": {}}
         else:
@@ -451,9 +807,9 @@ class OpenCTIApiClient:
         ):
             row = edge["node"]
             if with_pagination:
-                result["entities"].append(self.process_multiple_fields(row))
+                result["entities"].append(self.process_fields_plan(row, plan))
             else:
-                result.append(self.process_multiple_fields(row))
+                result.append(self.process_fields_plan(row, plan))
         if with_pagination and "pageInfo" in data:
             result["pagination"] = data["pageInfo"]
         return result
@@ -474,81 +830,42 @@ class OpenCTIApiClient:
                     result.append(d["id"])
         return result
 
-    def process_multiple_fields(self, data):
+    def process_multiple_fields(self, data, selection=None):
         """processes data returned by the OpenCTI API with multiple fields
 
         :param data: data to process
         :type data: dict
+        :param selection: (optional) the GraphQL selection of the data, only the
+                          fields it requests are processed
+        :type selection: str
         :return: returns the data dict with all fields processed
         :rtype: dict
         """
 
+        return self.process_fields_plan(data, self.compile_selection(selection))
+
+    def process_fields_plan(self, data, plan: SelectionPlan):
         if data is None:
             return data
-        if "createdBy" in data and data["createdBy"] is not None:
-            data["createdById"] = data["createdBy"]["id"]
-            if "objectMarking" in data["createdBy"]:
-                data["createdBy"]["objectMarking"] = self.process_multiple(
-                    data["createdBy"]["objectMarking"]
-                )
-                data["createdBy"]["objectMarkingIds"] = self.process_multiple_ids(
-                    data["createdBy"]["objectMarking"]
-                )
-            if "objectLabel" in data["createdBy"]:
-                data["createdBy"]["objectLabel"] = self.process_multiple(
-                    data["createdBy"]["objectLabel"]
-                )
-                data["createdBy"]["objectLabelIds"] = self.process_multiple_ids(
-                    data["createdBy"]["objectLabel"]
-                )
+        if (
+            plan.created_by is not None
+            and "createdBy" in data
+            and data["createdBy"] is not None
+        ):
+            created_by = data["createdBy"]
+            data["createdById"] = created_by["id"]
+            for key, node_plan in plan.created_by:
+                if key in created_by:
+                    created_by[key] = self.process_multiple_plan(
+                        created_by[key], False, node_plan
+                    )
+                    created_by[key + "Ids"] = self.process_multiple_ids(created_by[key])
         else:
             data["createdById"] = None
-        if "objectMarking" in data:
-            data["objectMarking"] = self.process_multiple(data["objectMarking"])
-            data["objectMarkingIds"] = self.process_multiple_ids(data["objectMarking"])
-        if "objectLabel" in data:
-            data["objectLabel"] = self.process_multiple(data["objectLabel"])
-            data["objectLabelIds"] = self.process_multiple_ids(data["objectLabel"])
-        if "reports" in data:
-            data["reports"] = self.process_multiple(data["reports"])
-            data["reportsIds"] = self.process_multiple_ids(data["reports"])
-        if "notes" in data:
-            data["notes"] = self.process_multiple(data["notes"])
-            data["notesIds"] = self.process_multiple_ids(data["notes"])
-        if "opinions" in data:
-            data["opinions"] = self.process_multiple(data["opinions"])
-            data["opinionsIds"] = self.process_multiple_ids(data["opinions"])
-        if "killChainPhases" in data:
-            data["killChainPhases"] = self.process_multiple(data["killChainPhases"])
-            data["killChainPhasesIds"] = self.process_multiple_ids(
-                data["killChainPhases"]
-            )
-        if "externalReferences" in data:
-            data["externalReferences"] = self.process_multiple(
-                data["externalReferences"]
-            )
-            data["externalReferencesIds"] = self.process_multiple_ids(
-                data["externalReferences"]
-            )
-        if "objects" in data:
-            data["objects"] = self.process_multiple(data["objects"])
-            data["objectsIds"] = self.process_multiple_ids(data["objects"])
-        if "observables" in data:
-            data["observables"] = self.process_multiple(data["observables"])
-            data["observablesIds"] = self.process_multiple_ids(data["observables"])
-        if "stixCoreRelationships" in data:
-            data["stixCoreRelationships"] = self.process_multiple(
-                data["stixCoreRelationships"]
-            )
-            data["stixCoreRelationshipsIds"] = self.process_multiple_ids(
-                data["stixCoreRelationships"]
-            )
-        if "indicators" in data:
-            data["indicators"] = self.process_multiple(data["indicators"])
-            data["indicatorsIds"] = self.process_multiple_ids(data["indicators"])
-        if "importFiles" in data:
-            data["importFiles"] = self.process_multiple(data["importFiles"])
-            data["importFilesIds"] = self.process_multiple_ids(data["importFiles"])
+        for key, node_plan in plan.fields:
+            if key in data:
+                data[key] = self.process_multiple_plan(data[key], False, node_plan)
+                data[key + "Ids"] = self.process_multiple_ids(data[key])
         return data
 
     def upload_file(self, **kwargs):
@@ -641,7 +958,7 @@ class OpenCTIApiClient:
             }
         """
         result = self.query(query, {"id": id})
-        return json.loads(result["data"]["stix"])
+        return opencti_json.loads(result["data"]["stix"])
 
     @staticmethod
     def get_attribute_in_extension(key, object) -> any:
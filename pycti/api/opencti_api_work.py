@@ -1,6 +1,239 @@
 import logging
+import threading
 import time
-from typing import Dict, List
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Selection of the work status, without the messages of the work.
+WORK_STATUS_SELECTION = """
+    id
+    status
+    completed_time
+    tracking {
+        import_expected_number
+        import_processed_number
+    }
+    errors {
+        timestamp
+        message
+    }
+"""
+# Names of the GraphQL errors of a missing entity
+NOT_FOUND_ERRORS = ("NOT_FOUND", "NotFoundError")
+
+
+def is_work_finished(work: Optional[Dict]) -> bool:
+    """check if a work is complete or in error
+
+    :param work: the work status
+    :type work: dict
+    :rtype: bool
+    """
+
+    return work is not None and (
+        work["status"] == "complete" or len(work.get("errors") or []) > 0
+    )
+
+
+def get_work_progress(work: Optional[Dict]) -> Optional[int]:
+    """get the number of processed imports of a work
+
+    :param work: the work status
+    :type work: dict
+    :rtype: int
+    """
+
+    if work is None or work.get("tracking") is None:
+        return None
+    return work["tracking"]["import_processed_number"]
+
+
+def is_not_found_error(error: Dict) -> bool:
+    """check if a GraphQL error reports a missing entity
+
+    :param error: the error, as formatted by `OpenCTIApiClient.format_error`
+    :type error: dict
+    :rtype: bool
+    """
+
+    return error["name"] in NOT_FOUND_ERRORS
+
+
+def work_status_error(work_id: str, error: Optional[Dict]) -> Exception:
+    """build the exception of a work status which cannot be fetched"""
+
+    if error is None or is_not_found_error(error):
+        return ValueError(f"Work {work_id} not found")
+    return ValueError(error)
+
+
+class WorkTracker(threading.Thread):
+    """Tracker of the completion of many works
+
+    The status of all the tracked works is fetched in a single request. The
+    polling interval doubles (up to `max_interval`) as long as no tracked
+    work progresses and is reset as soon as one does. The futures of the works
+    which are missing or whose status cannot be fetched fail with a
+    `ValueError`, the futures whose timeout is reached fail with a
+    `TimeoutError` without waiting for the next poll.
+
+    :param work: the work API
+    :type work: OpenCTIApiWork
+    :param interval: initial polling interval in seconds, defaults to 1
+    :type interval: float, optional
+    :param max_interval: maximum polling interval in seconds, defaults to 30
+    :type max_interval: float, optional
+    """
+
+    def __init__(self, work, interval: float = 1, max_interval: float = 30) -> None:
+        threading.Thread.__init__(self, daemon=True)
+        self.work = work
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.condition = threading.Condition()
+        self.tracked = {}
+        self.progress = {}
+        self.exit = False
+
+    def track(
+        self,
+        work_id: str,
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """track the completion of a work
+
+        :param work_id: the work id
+        :type work_id: str
+        :param timeout: time to wait for the work in seconds, defaults to None
+        :type timeout: float, optional
+        :param callback: function called with the future once done
+        :type callback: Callable, optional
+        :return: future of the work status, failing with a `TimeoutError` once
+                 the timeout is reached
+        :rtype: Future
+        """
+
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self.condition:
+            # New works are polled with the others, only wake an idle tracker
+            # or one which may have to expire the work before its next poll
+            if len(self.tracked) == 0 or deadline is not None:
+                self.condition.notify()
+            self.tracked.setdefault(work_id, []).append((future, deadline))
+        return future
+
+    def poll(self) -> bool:
+        """fetch the status of the tracked works and resolve the finished ones
+
+        :return: True if any tracked work progressed
+        :rtype: bool
+        """
+
+        with self.condition:
+            work_ids = list(self.tracked.keys())
+        if len(work_ids) == 0:
+            return False
+        works = self.work.query_works_status(work_ids)
+        now = time.monotonic()
+        progressed = False
+        with self.condition:
+            for work_id in work_ids:
+                work, error = works[work_id]
+                waiters = self.tracked.get(work_id, [])
+                if error is not None or work is None:
+                    del self.tracked[work_id]
+                    progressed = True
+                    for future, _ in waiters:
+                        future.set_exception(work_status_error(work_id, error))
+                    continue
+                if is_work_finished(work):
+                    del self.tracked[work_id]
+                    progressed = True
+                    for future, _ in waiters:
+                        future.set_result(work)
+                    continue
+                progress = get_work_progress(work)
+                if progress != self.progress.get(work_id):
+                    self.progress[work_id] = progress
+                    progressed = True
+            self.expire(now)
+            for work_id in list(self.progress.keys()):
+                if work_id not in self.tracked:
+                    del self.progress[work_id]
+        return progressed
+
+    def expire(self, now: float) -> None:
+        """fail the futures whose timeout is reached, with the condition held
+
+        :param now: the current time, from `time.monotonic`
+        :type now: float
+        """
+
+        for work_id in list(self.tracked.keys()):
+            pending = []
+            for future, deadline in self.tracked[work_id]:
+                if deadline is not None and now >= deadline:
+                    future.set_exception(
+                        TimeoutError(f"Work {work_id} is not finished")
+                    )
+                else:
+                    pending.append((future, deadline))
+            if len(pending) > 0:
+                self.tracked[work_id] = pending
+            else:
+                del self.tracked[work_id]
+
+    def run(self) -> None:
+        interval = self.interval
+        while True:
+            with self.condition:
+                while not self.exit and len(self.tracked) == 0:
+                    interval = self.interval
+                    self.condition.wait()
+                poll_time = time.monotonic() + interval
+                while not self.exit and len(self.tracked) > 0:
+                    now = time.monotonic()
+                    if now >= poll_time:
+                        break
+                    # Wake up at the earliest timeout, not only at the next poll
+                    wake_time = min(
+                        [poll_time]
+                        + [
+                            deadline
+                            for waiters in self.tracked.values()
+                            for _, deadline in waiters
+                            if deadline is not None
+                        ]
+                    )
+                    if now >= wake_time:
+                        self.expire(now)
+                    else:
+                        self.condition.wait(wake_time - now)
+                if self.exit:
+                    return
+                if len(self.tracked) == 0:
+                    continue
+            try:
+                progressed = self.poll()
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error("Unable to get the works status: %s", e)
+                progressed = False
+            interval = (
+                self.interval if progressed else min(interval * 2, self.max_interval)
+            )
+
+    def stop(self) -> None:
+        with self.condition:
+            self.exit = True
+            for waiters in self.tracked.values():
+                for future, _ in waiters:
+                    future.cancel()
+            self.tracked = {}
+            self.condition.notify()
 
 
 class OpenCTIApiWork:
@@ -8,6 +241,8 @@ class OpenCTIApiWork:
 
     def __init__(self, api):
         self.api = api
+        self.tracker = None
+        self.tracker_lock = threading.Lock()
 
     def to_received(self, work_id: str, message: str):
         logging.info("Reporting work update_received " + work_id)
@@ -99,22 +334,137 @@ class OpenCTIApiWork:
         )
         return work["data"]
 
-    def wait_for_work_to_finish(self, work_id: str):
-        status = ""
-        cnt = 0
-        while status != "complete":
-            state = self.get_work(work_id=work_id)
-            if len(state) > 0:
-                status = state["status"]
-
-                if state["errors"]:
-                    self.api.log(
-                        "error", f"Unexpected connector error {state['errors']}"
-                    )
-                    return ""
+    def wait_for_work_to_finish(
+        self,
+        work_id: str,
+        timeout: Optional[float] = None,
+        interval: float = 1,
+        max_interval: float = 30,
+    ):
+        """wait for a work to be complete
+
+        The status is polled with an exponential backoff (from `interval` up to
+        `max_interval` seconds) while the work does not progress.
+
+        :param work_id: the work id
+        :type work_id: str
+        :param timeout: time to wait in seconds, defaults to None (no timeout)
+        :type timeout: float, optional
+        :raises TimeoutError: if the work is not finished before the timeout
+        :raises ValueError: if the work is missing or its status cannot be
+                            fetched
+        :return: an empty string if the work is in error
+        """
+
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        current_interval = interval
+        progress = None
+        while True:
+            state, error = self.query_works_status([work_id])[work_id]
+            if error is not None or state is None:
+                raise work_status_error(work_id, error)
+            if state["errors"]:
+                self.api.log("error", f"Unexpected connector error {state['errors']}")
+                return ""
+            if state["status"] == "complete":
+                return None
+            if get_work_progress(state) != progress:
+                progress = get_work_progress(state)
+                current_interval = interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Work {work_id} is not finished")
+                time.sleep(min(current_interval, remaining))
+            else:
+                time.sleep(current_interval)
+            current_interval = min(current_interval * 2, max_interval)
+
+    def get_works_status(
+        self, work_ids: List[str], batch_size: int = 50
+    ) -> Dict[str, Optional[Dict]]:
+        """get the status of many works, in a single request per batch
+
+        Only the status, the tracking and the errors of the works are fetched.
+
+        :param work_ids: the work ids
+        :type work_ids: list
+        :param batch_size: number of works per request, defaults to 50
+        :type batch_size: int, optional
+        :raises ValueError: if the status of a work cannot be fetched
+        :return: dict of the work status by id, None for unknown works
+        :rtype: dict
+        """
+
+        works = {}
+        for work_id, (data, error) in self.query_works_status(
+            work_ids, batch_size
+        ).items():
+            if error is not None and not is_not_found_error(error):
+                raise ValueError(error)
+            works[work_id] = data
+        return works
+
+    def query_works_status(
+        self, work_ids: List[str], batch_size: int = 50
+    ) -> Dict[str, Tuple[Optional[Dict], Optional[Dict]]]:
+        """get the status of many works with the error of each one
+
+        :param work_ids: the work ids
+        :type work_ids: list
+        :param batch_size: number of works per request, defaults to 50
+        :type batch_size: int, optional
+        :return: dict of the (status, error) tuples by work id
+        :rtype: dict
+        """
+
+        results = self.api.query_batch(
+            "query",
+            "work",
+            {"id": "ID!"},
+            [{"id": work_id} for work_id in work_ids],
+            WORK_STATUS_SELECTION,
+            batch_size,
+        )
+        return dict(zip(work_ids, results))
+
+    def track(
+        self,
+        work_id: str,
+        timeout: Optional[float] = None,
+        callback: Optional[Callable[[Future], None]] = None,
+    ) -> Future:
+        """track the completion of a work without blocking
+
+        Works are tracked by a shared `WorkTracker`, polling all of them at
+        once.
+
+        :param work_id: the work id
+        :type work_id: str
+        :param timeout: time to wait for the work in seconds, defaults to None
+        :type timeout: float, optional
+        :param callback: function called with the future once done
+        :type callback: Callable, optional
+        :return: future of the work status
+        :rtype: Future
+        """
+
+        with self.tracker_lock:
+            # A stopped tracker is replaced, its works would never be polled
+            if self.tracker is None or self.tracker.exit or not self.tracker.is_alive():
+                self.tracker = WorkTracker(self)
+                self.tracker.start()
+            return self.tracker.track(work_id, timeout, callback)
+
+    def stop(self) -> None:
+        """stop tracking the works, the pending futures are cancelled"""
 
-            time.sleep(1)
-            cnt += 1
+        with self.tracker_lock:
+            tracker = self.tracker
+            self.tracker = None
+        if tracker is not None:
+            tracker.stop()
+            tracker.join()
 
     def get_work(self, work_id: str) -> Dict:
         query = """
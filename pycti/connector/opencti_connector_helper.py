@@ -1,8 +1,14 @@
 import base64
+import codecs
+import contextvars
 import datetime
-import json
+import functools
+import http.client
 import logging
+import multiprocessing
 import os
+import queue
+import random
 import signal
 import ssl
 import sys
@@ -10,14 +16,20 @@ import threading
 import time
 import traceback
 import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Dict, List, Optional, Union
 
 import pika
+import requests
+import urllib3
 from pika.exceptions import NackError, UnroutableError
-from sseclient import SSEClient
+from sseclient import Event
 
 from pycti.api.opencti_api_client import OpenCTIApiClient
 from pycti.connector.opencti_connector import OpenCTIConnector
+from pycti.utils import opencti_json
 from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
 
 TRUTHY: List[str] = ["yes", "true", "True"]
@@ -33,6 +45,11 @@ def killProgramHook(etype, value, tb):
 
 sys.excepthook = killProgramHook
 
+# Context of the message being processed in the current thread or task
+message_context: contextvars.ContextVar = contextvars.ContextVar(
+    "opencti_message_context", default=None
+)
+
 
 def get_config_variable(
     env_var: str,
@@ -93,6 +110,117 @@ def create_ssl_context() -> ssl.SSLContext:
     return ssl_context
 
 
+class MessageContext:
+    """Context of a message processed by a connector
+
+    The context is bound to the thread (or task) processing the message, so
+    the work, applicant and API headers of concurrent messages do not mix.
+
+    :param work_id: the work of the message
+    :type work_id: str
+    :param applicant_id: the user who triggered the message
+    :type applicant_id: str
+    """
+
+    def __init__(self, work_id: Optional[str], applicant_id: Optional[str]) -> None:
+        self.work_id = work_id
+        self.applicant_id = applicant_id
+        self.headers = (
+            {} if applicant_id is None else {"opencti-applicant-id": applicant_id}
+        )
+        self.logger = logging.LoggerAdapter(
+            logging.getLogger(), {"work_id": work_id, "applicant_id": applicant_id}
+        )
+
+
+class WorkKeepAlive(threading.Thread):
+    """Keep alive the works being processed by the connector
+
+    Each registered work is pinged on its own schedule: first after
+    `min_interval` seconds, then with an interval doubling up to
+    `max_interval`. A failing ping is retried after `min_interval`. The thread
+    only wakes up when a ping is due or the registered works change, so
+    processing short messages has no polling overhead.
+
+    :param api: instance of a `OpenCTIApiClient` class
+    :type api: OpenCTIApiClient
+    :param min_interval: first ping delay in seconds, defaults to 60
+    :type min_interval: int, optional
+    :param max_interval: maximum ping interval in seconds, defaults to 300
+    :type max_interval: int, optional
+    """
+
+    def __init__(self, api, min_interval=60, max_interval=300) -> None:
+        threading.Thread.__init__(self, daemon=True)
+        self.api = api
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.works = {}
+        self.condition = threading.Condition()
+        self.exit_event = threading.Event()
+
+    def register(self, work_id: str) -> None:
+        with self.condition:
+            count, _, _ = self.works.get(work_id, (0, None, None))
+            self.works[work_id] = (
+                count + 1,
+                time.monotonic() + self.min_interval,
+                self.min_interval,
+            )
+            self.condition.notify()
+
+    def unregister(self, work_id: str) -> None:
+        with self.condition:
+            count, next_ping, interval = self.works[work_id]
+            if count > 1:
+                self.works[work_id] = (count - 1, next_ping, interval)
+            else:
+                del self.works[work_id]
+            self.condition.notify()
+
+    def run(self) -> None:
+        while not self.exit_event.is_set():
+            with self.condition:
+                now = time.monotonic()
+                due = [
+                    work_id
+                    for work_id, (_, next_ping, _) in self.works.items()
+                    if next_ping <= now
+                ]
+                if len(due) == 0:
+                    timeout = min(
+                        (next_ping for _, next_ping, _ in self.works.values()),
+                        default=None,
+                    )
+                    self.condition.wait(None if timeout is None else timeout - now)
+                    continue
+            for work_id in due:
+                try:
+                    self.api.work.ping(work_id)
+                    success = True
+                except Exception:  # pylint: disable=broad-except
+                    logging.error("Error pinging the work %s", work_id)
+                    success = False
+                with self.condition:
+                    if work_id in self.works:
+                        count, _, interval = self.works[work_id]
+                        interval = (
+                            min(interval * 2, self.max_interval)
+                            if success
+                            else self.min_interval
+                        )
+                        self.works[work_id] = (
+                            count,
+                            time.monotonic() + interval,
+                            interval,
+                        )
+
+    def stop(self) -> None:
+        self.exit_event.set()
+        with self.condition:
+            self.condition.notify()
+
+
 class ListenQueue(threading.Thread):
     """Main class for the ListenQueue used in OpenCTIConnectorHelper
 
@@ -118,13 +246,20 @@ class ListenQueue(threading.Thread):
         self.user = config["connection"]["user"]
         self.password = config["connection"]["pass"]
         self.queue_name = config["listen"]
+        self.workers = max(helper.connect_listen_workers or 1, 1)
+        self.prefetch = max(helper.connect_listen_prefetch or self.workers, 1)
         self.exit_event = threading.Event()
-        self.thread = None
+        self.executor = None
+        self.keep_alive = None
 
     # noinspection PyUnusedLocal
     def _process_message(self, channel, method, properties, body) -> None:
         """process a message from the rabbit queue
 
+        The message is handed over to the worker pool so the connection I/O
+        loop keeps running (and heartbeating) while callbacks are executed, it
+        is acknowledged once processed.
+
         :param channel: channel instance
         :type channel: callable
         :param method: message methods
@@ -135,55 +270,124 @@ class ListenQueue(threading.Thread):
         :type body: str or bytes or bytearray
         """
 
-        json_data = json.loads(body)
-        channel.basic_ack(delivery_tag=method.delivery_tag)
-        self.thread = threading.Thread(target=self._data_handler, args=[json_data])
-        self.thread.start()
-        five_minutes = 60 * 5
-        time_wait = 0
-        while self.thread.is_alive():  # Loop while the thread is processing
-            if (
-                self.helper.work_id is not None and time_wait > five_minutes
-            ):  # Ping every 5 minutes
-                self.helper.api.work.ping(self.helper.work_id)
-                time_wait = 0
-            else:
-                time_wait += 1
-            time.sleep(1)
-
-        logging.info(
-            "%s",
-            (
-                f"Message (delivery_tag={method.delivery_tag}) processed"
-                ", thread terminated"
-            ),
+        if self.exit_event.is_set():
+            # Stopping, the message is requeued instead of being processed
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        json_data = opencti_json.loads(body)
+        self.executor.submit(
+            self._handle_message,
+            self.pika_connection,
+            channel,
+            method.delivery_tag,
+            json_data,
         )
 
+    def _handle_message(self, connection, channel, delivery_tag, json_data) -> None:
+        settle = self._ack_message
+        try:
+            work_id = json_data["internal"]["work_id"]
+            if work_id is not None:
+                self.keep_alive.register(work_id)
+            try:
+                self._data_handler(json_data)
+            finally:
+                if work_id is not None:
+                    self.keep_alive.unregister(work_id)
+        except Exception:  # pylint: disable=broad-except
+            # Not processable, rejected instead of holding a prefetch slot
+            logging.exception("Unable to process message %s", delivery_tag)
+            settle = self._reject_message
+
+        try:
+            connection.add_callback_threadsafe(
+                functools.partial(settle, channel, delivery_tag)
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            # The connection is gone, the message will be redelivered
+            logging.error("Unable to acknowledge message %s: %s", delivery_tag, e)
+
+        logging.info("%s", f"Message (delivery_tag={delivery_tag}) processed")
+
+    @staticmethod
+    def _ack_message(channel, delivery_tag) -> None:
+        if channel.is_open:
+            channel.basic_ack(delivery_tag=delivery_tag)
+        else:
+            logging.error(
+                "Channel closed, message %s will be redelivered", delivery_tag
+            )
+
+    @staticmethod
+    def _reject_message(channel, delivery_tag) -> None:
+        if channel.is_open:
+            channel.basic_nack(delivery_tag=delivery_tag, requeue=False)
+        else:
+            logging.error(
+                "Channel closed, message %s will be redelivered", delivery_tag
+            )
+
     def _data_handler(self, json_data) -> None:
-        # Set the API headers
         work_id = json_data["internal"]["work_id"]
         applicant_id = json_data["internal"]["applicant_id"]
-        self.helper.work_id = work_id
-        if applicant_id is not None:
-            self.helper.applicant_id = applicant_id
-            self.helper.api.set_applicant_id_header(applicant_id)
+        context = MessageContext(work_id, applicant_id)
+        token = message_context.set(context)
         # Execute the callback
         try:
-            self.helper.api.work.to_received(
-                work_id, "Connector ready to process the operation"
-            )
-            message = self.callback(json_data["event"])
-            self.helper.api.work.to_processed(work_id, message)
+            with self.helper.api.request_headers_context(context.headers):
+                self.helper.api.work.to_received(
+                    work_id, "Connector ready to process the operation"
+                )
+                message = self.callback(json_data["event"])
+                self.helper.api.work.to_processed(work_id, message)
         except Exception as e:  # pylint: disable=broad-except
-            logging.exception("Error in message processing, reporting error to API")
+            context.logger.exception(
+                "Error in message processing, reporting error to API"
+            )
             try:
-                self.helper.api.work.to_processed(work_id, str(e), True)
+                with self.helper.api.request_headers_context(context.headers):
+                    self.helper.api.work.to_processed(work_id, str(e), True)
             except:  # pylint: disable=bare-except
-                logging.error("Failing reporting the processing")
+                context.logger.error("Failing reporting the processing")
+        finally:
+            message_context.reset(token)
 
     def run(self) -> None:
+        self.keep_alive = WorkKeepAlive(self.helper.api)
+        self.keep_alive.start()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="ListenQueue"
+        )
+        try:
+            self.consume()
+        finally:
+            self.drain()
+
+    def drain(self) -> None:
+        """wait for the messages being processed, acknowledge them and close
+        the connection"""
+
+        self.executor.shutdown(wait=True)
+        self.keep_alive.stop()
+        self.close_connection()
+
+    def close_connection(self) -> None:
+        """run the pending acknowledgements and close the connection"""
+
+        if self.pika_connection is not None and self.pika_connection.is_open:
+            try:
+                # Run the acknowledgements of the last processed messages
+                self.pika_connection.process_data_events(time_limit=0)
+                self.pika_connection.close()
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error("Unable to close the connection: %s", e)
+
+    def consume(self) -> None:
+        """consume the queue, reconnecting the broker until stopped"""
+
         while not self.exit_event.is_set():
             try:
+                self.channel = None
                 # Connect the broker
                 self.pika_credentials = pika.PlainCredentials(self.user, self.password)
                 self.pika_parameters = pika.ConnectionParameters(
@@ -198,21 +402,127 @@ class ListenQueue(threading.Thread):
                 self.pika_connection = pika.BlockingConnection(self.pika_parameters)
                 self.channel = self.pika_connection.channel()
                 assert self.channel is not None
+                self.channel.basic_qos(prefetch_count=self.prefetch)
                 self.channel.basic_consume(
                     queue=self.queue_name, on_message_callback=self._process_message
                 )
+                # A stop requested before the channel was set
+                if self.exit_event.is_set():
+                    return
                 self.channel.start_consuming()
             except (KeyboardInterrupt, SystemExit):
                 self.helper.log_info("Connector stop")
                 sys.exit(0)
             except Exception as e:  # pylint: disable=broad-except
                 self.helper.log_error(str(e))
-                time.sleep(10)
+                self.exit_event.wait(10)
 
     def stop(self):
+        """stop consuming, waiting for the messages being processed"""
+
+        self.exit_event.set()
+        if self.pika_connection is not None and self.channel is not None:
+            try:
+                self.pika_connection.add_callback_threadsafe(
+                    self.channel.stop_consuming
+                )
+            except Exception:  # pylint: disable=broad-except
+                pass
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join()
+
+
+class ListenProcesses(threading.Thread):
+    """Supervisor of the worker processes consuming the connector queue
+
+    Each worker process creates its own API client and consumes the queue
+    with a `ListenQueue`, so CPU bound callbacks scale across cores. The
+    parent process keeps the registration and the ping of the connector and
+    restarts the workers exiting unexpectedly.
+
+    Worker processes are forked, the callback and the helper do not need to
+    be picklable, but a state set by a callback stays local to its process.
+    The workers are forked when the supervisor starts, before the helper
+    starts its ping thread.
+
+    :param helper: instance of a `OpenCTIConnectorHelper` class
+    :type helper: OpenCTIConnectorHelper
+    :param config: dict containing client config
+    :type config: Dict
+    :param callback: callback function to process queue
+    :type callback: callable
+    :param processes: number of worker processes
+    :type processes: int
+    :param check_interval: (optional) delay in seconds between two checks of
+                           the worker processes, defaults to 5
+    :type check_interval: float
+    """
+
+    def __init__(
+        self,
+        helper,
+        config: Dict,
+        callback,
+        processes: int,
+        check_interval: float = 5,
+    ) -> None:
+        threading.Thread.__init__(self)
+        self.helper = helper
+        self.config = config
+        self.callback = callback
+        self.processes = [None] * processes
+        self.check_interval = check_interval
+        self.context = multiprocessing.get_context("fork")
+        self.exit_event = threading.Event()
+
+    def _start_process(self, index: int) -> None:
+        process = self.context.Process(
+            target=self._run_process,
+            args=(self.helper, self.config, self.callback),
+            name=f"ListenProcess-{index}",
+        )
+        process.start()
+        self.processes[index] = process
+        logging.info("%s", f"Worker process {process.name} started ({process.pid})")
+
+    @staticmethod
+    def _run_process(helper, config: Dict, callback) -> None:
+        # The connections of the parent cannot be shared, use a new client
+        helper.api = helper.create_api_client()
+        helper.ping = None
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        listen_queue = ListenQueue(helper, config, callback)
+        try:
+            listen_queue.run()
+        finally:
+            listen_queue.stop()
+
+    def start(self) -> None:
+        for index in range(len(self.processes)):
+            self._start_process(index)
+        threading.Thread.start(self)
+
+    def run(self) -> None:
+        while not self.exit_event.wait(self.check_interval):
+            for index, process in enumerate(self.processes):
+                if not process.is_alive():
+                    logging.error(
+                        "%s",
+                        f"Worker process {process.name} exited "
+                        f"({process.exitcode}), restarting it",
+                    )
+                    self._start_process(index)
+
+    def stop(self) -> None:
         self.exit_event.set()
-        if self.thread:
-            self.thread.join()
+        if self.is_alive():
+            self.join()
+        for process in self.processes:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            if process is not None:
+                process.join()
 
 
 class PingAlive(threading.Thread):
@@ -227,32 +537,35 @@ class PingAlive(threading.Thread):
 
     def ping(self) -> None:
         while not self.exit_event.is_set():
-            try:
-                initial_state = self.get_state()
-                result = self.api.connector.ping(self.connector_id, initial_state)
-                remote_state = (
-                    json.loads(result["connector_state"])
-                    if result["connector_state"] is not None
-                    and len(result["connector_state"]) > 0
-                    else None
-                )
-                if initial_state != remote_state:
-                    self.set_state(result["connector_state"])
-                    logging.info(
-                        "%s",
-                        (
-                            "Connector state has been remotely reset to: "
-                            f'"{self.get_state()}"'
-                        ),
-                    )
-                if self.in_error:
-                    self.in_error = False
-                    logging.error("API Ping back to normal")
-            except Exception:  # pylint: disable=broad-except
-                self.in_error = True
-                logging.error("Error pinging the API")
+            self.ping_once()
             self.exit_event.wait(40)
 
+    def ping_once(self) -> None:
+        try:
+            initial_state = self.get_state()
+            result = self.api.connector.ping(self.connector_id, initial_state)
+            remote_state = (
+                opencti_json.loads(result["connector_state"])
+                if result["connector_state"] is not None
+                and len(result["connector_state"]) > 0
+                else None
+            )
+            if initial_state != remote_state:
+                self.set_state(result["connector_state"])
+                logging.info(
+                    "%s",
+                    (
+                        "Connector state has been remotely reset to: "
+                        f'"{self.get_state()}"'
+                    ),
+                )
+            if self.in_error:
+                self.in_error = False
+                logging.error("API Ping back to normal")
+        except Exception:  # pylint: disable=broad-except
+            self.in_error = True
+            logging.error("Error pinging the API")
+
     def run(self) -> None:
         logging.info("Starting ping alive thread")
         self.ping()
@@ -262,6 +575,411 @@ class PingAlive(threading.Thread):
         self.exit_event.set()
 
 
+class StreamCheckpointer:
+    """Checkpoint of the last event processed from a live stream
+
+    The last event ID is kept in memory and only written to the connector
+    state every `flush_events` events, every `flush_interval` seconds or when
+    `flush` is called (such as on shutdown). A restarted connector may receive
+    again the events processed since the last flush (at-least-once).
+
+    :param helper: instance of a `OpenCTIConnectorHelper` class
+    :type helper: OpenCTIConnectorHelper
+    :param flush_interval: maximum delay in seconds before a flush, defaults to 5
+    :type flush_interval: int, optional
+    :param flush_events: maximum number of events before a flush, defaults to 100
+    :type flush_events: int, optional
+    """
+
+    def __init__(self, helper, flush_interval=5, flush_events=100) -> None:
+        self.helper = helper
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.last_event_id = None
+        self.dirty = False
+        self.pending_events = 0
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, event_id: str) -> None:
+        with self.lock:
+            self.last_event_id = event_id
+            self.dirty = True
+            self.pending_events += 1
+            if (
+                self.pending_events >= self.flush_events
+                or time.monotonic() - self.last_flush >= self.flush_interval
+            ):
+                self._flush()
+
+    def tick(self) -> None:
+        """flush the checkpoint if the flush interval is elapsed"""
+
+        with self.lock:
+            if self.dirty and time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.dirty:
+            # Reload the state as the callback or the platform may have changed it
+            state = self.helper.get_state() or {}
+            state["connectorLastEventId"] = self.last_event_id
+            self.helper.set_state(state)
+            self.dirty = False
+        self.pending_events = 0
+        self.last_flush = time.monotonic()
+
+
+class StreamPipeline:
+    """Process live stream events with a pool of workers
+
+    Events are dispatched to `workers` bounded queues by hashing the ID of
+    their entity, so the events of a same entity are processed in order by
+    the same worker. The checkpoint only advances past events whose
+    predecessors have all been processed, at most `workers * queue_size`
+    events are submitted ahead of the checkpoint.
+
+    :param callback: callback function to process the events
+    :type callback: callable
+    :param checkpointer: checkpointer of the stream
+    :type checkpointer: StreamCheckpointer
+    :param workers: number of workers
+    :type workers: int
+    :param queue_size: maximum number of events waiting for each worker
+    :type queue_size: int
+    """
+
+    def __init__(self, callback, checkpointer, workers, queue_size=100) -> None:
+        self.callback = callback
+        self.checkpointer = checkpointer
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.threads = [
+            threading.Thread(target=self._process, args=[events], daemon=True)
+            for events in self.queues
+        ]
+        self.pending = OrderedDict()
+        self.max_pending = workers * queue_size
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.error = None
+
+    def start(self) -> None:
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, msg) -> None:
+        """dispatch an event, blocking while its worker queue or the events
+        ahead of the checkpoint are full
+
+        :param msg: the stream event
+        :type msg: Event
+        :raises Exception: the error of a failed callback
+        """
+
+        with self.condition:
+            # A slow partition holds the checkpoint, bound the events behind it
+            self.condition.wait_for(
+                lambda: len(self.pending) < self.max_pending or self.error is not None
+            )
+        self.check()
+        self.sequence += 1
+        sequence = self.sequence
+        if msg.id is not None:
+            with self.lock:
+                self.pending[sequence] = [str(msg.id), False]
+        if msg.event == "sync":
+            self._complete(sequence)
+            return
+        entity_id = None
+        try:
+            entity_id = opencti_json.loads(msg.data)["data"]["id"]
+        except Exception:  # pylint: disable=broad-except
+            pass
+        partition = (
+            sequence
+            if entity_id is None
+            else zlib.crc32(str(entity_id).encode("utf-8"))
+        ) % len(self.queues)
+        self.queues[partition].put((sequence, msg))
+
+    def check(self) -> None:
+        """raise the error of a failed callback, if any"""
+
+        if self.error is not None:
+            raise self.error
+
+    def stop(self) -> None:
+        """wait for the dispatched events to be processed"""
+
+        for events in self.queues:
+            events.put(None)
+        for thread in self.threads:
+            # The workers are not started if the stream failed to open
+            if thread.is_alive():
+                thread.join()
+
+    def _process(self, events) -> None:
+        while True:
+            item = events.get()
+            if item is None:
+                return
+            sequence, msg = item
+            if self.error is not None:
+                continue
+            try:
+                self.callback(msg)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.exception("Error processing stream event %s", msg.id)
+                with self.condition:
+                    self.error = e
+                    self.condition.notify_all()
+                continue
+            self._complete(sequence)
+
+    def _complete(self, sequence) -> None:
+        last_event_id = None
+        with self.lock:
+            if sequence in self.pending:
+                self.pending[sequence][1] = True
+            while len(self.pending) > 0:
+                first = next(iter(self.pending.values()))
+                if not first[1]:
+                    break
+                last_event_id = self.pending.popitem(last=False)[1][0]
+            self.condition.notify_all()
+        if last_event_id is not None:
+            self.checkpointer.update(last_event_id)
+
+
+class StreamBatcher:
+    """Group live stream events into batches
+
+    Events are decoded once and handed over to the callback as lists of
+    `{"id", "event", "data"}` dicts when `batch_size` events are pending or
+    the oldest pending event has waited `linger` seconds (checked on each
+    message, including heartbeats). The checkpoint advances once the callback
+    has returned.
+
+    :param callback: callback function processing a list of events
+    :type callback: callable
+    :param checkpointer: checkpointer of the stream
+    :type checkpointer: StreamCheckpointer
+    :param batch_size: maximum number of events in a batch
+    :type batch_size: int
+    :param linger: maximum delay in seconds before delivering a batch
+    :type linger: float
+    """
+
+    def __init__(self, callback, checkpointer, batch_size, linger=1.0) -> None:
+        self.callback = callback
+        self.checkpointer = checkpointer
+        self.batch_size = batch_size
+        self.linger = linger
+        self.events = []
+        self.last_event_id = None
+        self.started = None
+
+    def add(self, msg) -> None:
+        if self.started is None:
+            self.started = time.monotonic()
+        if msg.event != "sync":
+            self.events.append(
+                {
+                    "id": msg.id,
+                    "event": msg.event,
+                    "data": opencti_json.loads(msg.data),
+                }
+            )
+        if msg.id is not None:
+            self.last_event_id = str(msg.id)
+        if len(self.events) >= self.batch_size:
+            self.flush()
+        else:
+            self.tick()
+
+    def tick(self) -> None:
+        """deliver the pending events if the linger delay is elapsed"""
+
+        if self.started is not None and time.monotonic() - self.started >= self.linger:
+            self.flush()
+
+    def flush(self) -> None:
+        if len(self.events) > 0:
+            self.callback(self.events)
+        if self.last_event_id is not None:
+            self.checkpointer.update(self.last_event_id)
+        self.events = []
+        self.last_event_id = None
+        self.started = None
+
+
+class StreamReader:
+    """Resilient reader of an OpenCTI live stream
+
+    Iterating the reader yields the stream events (as `sseclient.Event`). When
+    the connection fails, is closed by the server or stalls (no data, not even
+    a heartbeat, for `stall_timeout` seconds), the reader reconnects with a
+    jittered exponential backoff and resumes after the last received event.
+
+    :param url: URL of the stream, including the initial `from` parameter
+    :type url: str
+    :param headers: request headers
+    :type headers: dict
+    :param verify: verify the SSL certificate
+    :type verify: bool
+    :param stall_timeout: seconds without data before reconnecting, defaults to 60
+    :type stall_timeout: int, optional
+    :param max_backoff: maximum seconds between reconnections, defaults to 60
+    :type max_backoff: int, optional
+    """
+
+    def __init__(self, url, headers, verify, stall_timeout=60, max_backoff=60) -> None:
+        self.url = url
+        self.headers = headers
+        self.verify = verify
+        self.stall_timeout = stall_timeout
+        self.max_backoff = max_backoff
+        self.last_event_id = None
+        self.exit_event = threading.Event()
+        self.metrics = {
+            "connections": 0,
+            "reconnects": 0,
+            "events": 0,
+            "last_event_id": None,
+            "last_event_time": None,
+        }
+
+    def get_url(self) -> str:
+        if self.last_event_id is None:
+            return self.url
+        return self.url.split("?")[0] + "?from=" + self.last_event_id
+
+    def get_lag(self) -> Optional[float]:
+        """seconds between now and the date of the last received event
+
+        :return: the lag, None if no event has been received
+        :rtype: float
+        """
+
+        try:
+            event_time = int(self.last_event_id.split("-")[0]) / 1000
+        except (AttributeError, ValueError):
+            return None
+        return max(time.time() - event_time, 0)
+
+    def get_metrics(self) -> Dict:
+        return {**self.metrics, "lag": self.get_lag()}
+
+    def __iter__(self):
+        attempt = 0
+        while not self.exit_event.is_set():
+            try:
+                with requests.get(
+                    self.get_url(),
+                    headers={**self.headers, "Accept": "text/event-stream"},
+                    verify=self.verify,
+                    stream=True,
+                    timeout=(30, self.stall_timeout),
+                ) as response:
+                    response.raise_for_status()
+                    self.metrics["connections"] += 1
+                    for event in self.parse(response):
+                        attempt = 0
+                        if event.id is not None:
+                            self.last_event_id = event.id
+                            self.metrics["last_event_id"] = event.id
+                            self.metrics["last_event_time"] = time.time()
+                        self.metrics["events"] += 1
+                        yield event
+                        if self.exit_event.is_set():
+                            return
+                reason = "stream closed by the server"
+            except (
+                requests.RequestException,
+                urllib3.exceptions.HTTPError,
+                http.client.HTTPException,
+                OSError,
+            ) as e:
+                reason = str(e)
+            if self.exit_event.is_set():
+                return
+            delay = min(self.max_backoff, 2**attempt) * random.uniform(0.5, 1)
+            attempt += 1
+            self.metrics["reconnects"] += 1
+            logging.warning(
+                "Live stream disconnected (%s), reconnecting in %.1fs from %s",
+                reason,
+                delay,
+                self.last_event_id,
+            )
+            self.exit_event.wait(delay)
+
+    @staticmethod
+    def parse(response):
+        """parse the server-sent events of a response
+
+        :param response: streamed response
+        :type response: requests.Response
+        :return: generator of events
+        """
+
+        data = []
+        event = "message"
+        event_id = None
+        retry = None
+        for line in StreamReader.iter_lines(response):
+            if line == "":
+                if len(data) > 0 or event != "message":
+                    yield Event("\n".join(data), event, event_id, retry)
+                data = []
+                event = "message"
+                event_id = None
+                retry = None
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "data":
+                data.append(value)
+            elif field == "event":
+                event = value
+            elif field == "id":
+                event_id = value
+            elif field == "retry" and value.isdigit():
+                retry = int(value)
+
+    @staticmethod
+    def iter_lines(response):
+        """split a streamed response into lines as soon as data is received
+
+        :param response: streamed response
+        :type response: requests.Response
+        :return: generator of lines
+        """
+
+        # The stream is sent with a chunked encoding, every chunk is yielded
+        # (decompressed) as soon as received so small events such as
+        # heartbeats are not delayed
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        buffer = ""
+        for chunk in response.iter_content(chunk_size=None):
+            buffer += decoder.decode(chunk)
+            lines = buffer.split("\n")
+            buffer = lines.pop()
+            for line in lines:
+                yield line[:-1] if line.endswith("\r") else line
+
+    def close(self) -> None:
+        self.exit_event.set()
+
+
 class ListenStream(threading.Thread):
     def __init__(
         self,
@@ -276,6 +994,10 @@ class ListenStream(threading.Thread):
         no_dependencies,
         recover_iso_date,
         with_inferences,
+        pipeline_workers=None,
+        pipeline_queue_size=100,
+        batch_size=None,
+        batch_linger=1.0,
     ) -> None:
         threading.Thread.__init__(self)
         self.helper = helper
@@ -291,156 +1013,231 @@ class ListenStream(threading.Thread):
         self.with_inferences = with_inferences if with_inferences is not None else False
         self.exit_event = threading.Event()
         self.exit = False
+        self.reader = None
+        self.checkpointer = StreamCheckpointer(
+            helper,
+            helper.connect_live_stream_checkpoint_interval,
+            helper.connect_live_stream_checkpoint_events,
+        )
+        if pipeline_workers and batch_size:
+            raise ValueError("Pipeline and batch modes cannot be combined")
+        self.batcher = (
+            StreamBatcher(callback, self.checkpointer, batch_size, batch_linger)
+            if batch_size
+            else None
+        )
+        self.pipeline = (
+            StreamPipeline(
+                callback, self.checkpointer, pipeline_workers, pipeline_queue_size
+            )
+            if pipeline_workers
+            else None
+        )
 
-    def run(self) -> None:  # pylint: disable=too-many-branches
-        try:
-            current_state = self.helper.get_state()
-            if current_state is None:
-                current_state = {
-                    "connectorStartTime": self.helper.date_now_z(),
-                    "connectorLastEventId": f"{self.start_timestamp}-0"
-                    if self.start_timestamp is not None
-                    and len(self.start_timestamp) > 0
-                    else "-",
-                }
-                self.helper.set_state(current_state)
-
-            # If URL and token are provided, likely consuming a remote stream
-            if self.url is not None and self.token is not None:
-                # If a live stream ID, appending the URL
-                if self.live_stream_id is not None:
-                    live_stream_uri = f"/{self.live_stream_id}"
-                elif self.helper.connect_live_stream_id is not None:
-                    live_stream_uri = f"/{self.helper.connect_live_stream_id}"
-                else:
-                    live_stream_uri = ""
-                # Live stream "from" should be empty if start from the beginning
-                if (
-                    self.live_stream_id is not None
-                    or self.helper.connect_live_stream_id is not None
-                ):
-
-                    live_stream_from = (
-                        f"?from={current_state['connectorLastEventId']}"
-                        if "connectorLastEventId" in current_state
-                        and current_state["connectorLastEventId"] != "-"
-                        else "?from=0-0&recover="
-                        + (
-                            current_state["connectorStartTime"]
-                            if self.recover_iso_date is None
-                            else self.recover_iso_date
-                        )
-                    )
-                # Global stream "from" should be 0 if starting from the beginning
-                else:
-                    live_stream_from = "?from=" + (
-                        current_state["connectorLastEventId"]
-                        if "connectorLastEventId" in current_state
-                        and current_state["connectorLastEventId"] != "-"
-                        else "0-0"
+    def init_state(self) -> Dict:
+        """get the connector state, initializing it on the first run
+
+        :return: the connector state
+        :rtype: Dict
+        """
+
+        current_state = self.helper.get_state()
+        if current_state is None:
+            current_state = {
+                "connectorStartTime": self.helper.date_now_z(),
+                "connectorLastEventId": f"{self.start_timestamp}-0"
+                if self.start_timestamp is not None and len(self.start_timestamp) > 0
+                else "-",
+            }
+            self.helper.set_state(current_state)
+        return current_state
+
+    def create_reader(
+        self, current_state
+    ) -> StreamReader:  # pylint: disable=too-many-branches
+        """create the reader of the stream, starting from the connector state
+
+        :param current_state: the connector state
+        :type current_state: Dict
+        :return: the stream reader
+        :rtype: StreamReader
+        """
+
+        # If URL and token are provided, likely consuming a remote stream
+        if self.url is not None and self.token is not None:
+            # If a live stream ID, appending the URL
+            if self.live_stream_id is not None:
+                live_stream_uri = f"/{self.live_stream_id}"
+            elif self.helper.connect_live_stream_id is not None:
+                live_stream_uri = f"/{self.helper.connect_live_stream_id}"
+            else:
+                live_stream_uri = ""
+            # Live stream "from" should be empty if start from the beginning
+            if (
+                self.live_stream_id is not None
+                or self.helper.connect_live_stream_id is not None
+            ):
+
+                live_stream_from = (
+                    f"?from={current_state['connectorLastEventId']}"
+                    if "connectorLastEventId" in current_state
+                    and current_state["connectorLastEventId"] != "-"
+                    else "?from=0-0&recover="
+                    + (
+                        current_state["connectorStartTime"]
+                        if self.recover_iso_date is None
+                        else self.recover_iso_date
                     )
-                live_stream_url = (
-                    f"{self.url}/stream{live_stream_uri}{live_stream_from}"
-                )
-                opencti_ssl_verify = (
-                    self.verify_ssl if self.verify_ssl is not None else True
-                )
-                logging.info(
-                    "%s",
-                    (
-                        "Starting listening stream events (URL: "
-                        f"{live_stream_url}, SSL verify: {opencti_ssl_verify}, Listen Delete: {self.listen_delete})"
-                    ),
-                )
-                messages = SSEClient(
-                    live_stream_url,
-                    headers={
-                        "authorization": "Bearer " + self.token,
-                        "listen-delete": "false"
-                        if self.listen_delete is False
-                        else "true",
-                        "no-dependencies": "true"
-                        if self.no_dependencies is True
-                        else "false",
-                        "with-inferences": "true"
-                        if self.helper.connect_live_stream_with_inferences is True
-                        else "false",
-                    },
-                    verify=opencti_ssl_verify,
                 )
+            # Global stream "from" should be 0 if starting from the beginning
             else:
-                live_stream_uri = (
-                    f"/{self.helper.connect_live_stream_id}"
-                    if self.helper.connect_live_stream_id is not None
-                    else ""
+                live_stream_from = "?from=" + (
+                    current_state["connectorLastEventId"]
+                    if "connectorLastEventId" in current_state
+                    and current_state["connectorLastEventId"] != "-"
+                    else "0-0"
                 )
-                if self.helper.connect_live_stream_id is not None:
-                    live_stream_from = (
-                        f"?from={current_state['connectorLastEventId']}"
-                        if "connectorLastEventId" in current_state
-                        and current_state["connectorLastEventId"] != "-"
-                        else "?from=0-0&recover="
-                        + (
-                            self.helper.date_now_z()
-                            if self.recover_iso_date is None
-                            else self.recover_iso_date
-                        )
-                    )
-                # Global stream "from" should be 0 if starting from the beginning
-                else:
-                    live_stream_from = "?from=" + (
-                        current_state["connectorLastEventId"]
-                        if "connectorLastEventId" in current_state
-                        and current_state["connectorLastEventId"] != "-"
-                        else "0-0"
+            live_stream_url = f"{self.url}/stream{live_stream_uri}{live_stream_from}"
+            opencti_ssl_verify = (
+                self.verify_ssl if self.verify_ssl is not None else True
+            )
+            logging.info(
+                "%s",
+                (
+                    "Starting listening stream events (URL: "
+                    f"{live_stream_url}, SSL verify: {opencti_ssl_verify}, Listen Delete: {self.listen_delete})"
+                ),
+            )
+            messages = StreamReader(
+                live_stream_url,
+                headers={
+                    "authorization": "Bearer " + self.token,
+                    "listen-delete": "false" if self.listen_delete is False else "true",
+                    "no-dependencies": "true"
+                    if self.no_dependencies is True
+                    else "false",
+                    "with-inferences": "true"
+                    if self.helper.connect_live_stream_with_inferences is True
+                    else "false",
+                },
+                verify=opencti_ssl_verify,
+                stall_timeout=self.helper.connect_live_stream_stall_timeout,
+            )
+        else:
+            live_stream_uri = (
+                f"/{self.helper.connect_live_stream_id}"
+                if self.helper.connect_live_stream_id is not None
+                else ""
+            )
+            if self.helper.connect_live_stream_id is not None:
+                live_stream_from = (
+                    f"?from={current_state['connectorLastEventId']}"
+                    if "connectorLastEventId" in current_state
+                    and current_state["connectorLastEventId"] != "-"
+                    else "?from=0-0&recover="
+                    + (
+                        self.helper.date_now_z()
+                        if self.recover_iso_date is None
+                        else self.recover_iso_date
                     )
-                live_stream_url = f"{self.helper.opencti_url}/stream{live_stream_uri}{live_stream_from}"
-                logging.info(
-                    "%s",
-                    (
-                        f"Starting listening stream events (URL: {live_stream_url}"
-                        f", SSL verify: {self.helper.opencti_ssl_verify}, Listen Delete: {self.helper.connect_live_stream_listen_delete}, No Dependencies: {self.helper.connect_live_stream_no_dependencies})"
-                    ),
                 )
-                messages = SSEClient(
-                    live_stream_url,
-                    headers={
-                        "authorization": "Bearer " + self.helper.opencti_token,
-                        "listen-delete": "false"
-                        if self.helper.connect_live_stream_listen_delete is False
-                        else "true",
-                        "no-dependencies": "true"
-                        if self.helper.connect_live_stream_no_dependencies is True
-                        else "false",
-                        "with-inferences": "true"
-                        if self.helper.connect_live_stream_with_inferences is True
-                        else "false",
-                    },
-                    verify=self.helper.opencti_ssl_verify,
+            # Global stream "from" should be 0 if starting from the beginning
+            else:
+                live_stream_from = "?from=" + (
+                    current_state["connectorLastEventId"]
+                    if "connectorLastEventId" in current_state
+                    and current_state["connectorLastEventId"] != "-"
+                    else "0-0"
                 )
+            live_stream_url = (
+                f"{self.helper.opencti_url}/stream{live_stream_uri}{live_stream_from}"
+            )
+            logging.info(
+                "%s",
+                (
+                    f"Starting listening stream events (URL: {live_stream_url}"
+                    f", SSL verify: {self.helper.opencti_ssl_verify}, Listen Delete: {self.helper.connect_live_stream_listen_delete}, No Dependencies: {self.helper.connect_live_stream_no_dependencies})"
+                ),
+            )
+            messages = StreamReader(
+                live_stream_url,
+                headers={
+                    "authorization": "Bearer " + self.helper.opencti_token,
+                    "listen-delete": "false"
+                    if self.helper.connect_live_stream_listen_delete is False
+                    else "true",
+                    "no-dependencies": "true"
+                    if self.helper.connect_live_stream_no_dependencies is True
+                    else "false",
+                    "with-inferences": "true"
+                    if self.helper.connect_live_stream_with_inferences is True
+                    else "false",
+                },
+                verify=self.helper.opencti_ssl_verify,
+                stall_timeout=self.helper.connect_live_stream_stall_timeout,
+            )
+        return messages
+
+    def run(self) -> None:
+        try:
+            messages = self.create_reader(self.init_state())
+            self.reader = messages
             # Iter on stream messages
+            if self.pipeline is not None:
+                self.pipeline.start()
             for msg in messages:
                 if self.exit:
                     break
                 if msg.event == "heartbeat" or msg.event == "connected":
+                    if self.pipeline is not None:
+                        self.pipeline.check()
+                    if self.batcher is not None:
+                        self.batcher.tick()
+                    self.checkpointer.tick()
+                    continue
+                if self.pipeline is not None:
+                    self.pipeline.submit(msg)
+                    continue
+                if self.batcher is not None:
+                    self.batcher.add(msg)
                     continue
-                if msg.event == "sync":
-                    if msg.id is not None:
-                        state = self.helper.get_state()
-                        state["connectorLastEventId"] = str(msg.id)
-                        self.helper.set_state(state)
-                else:
+                if msg.event != "sync":
                     self.callback(msg)
-                    if msg.id is not None:
-                        state = self.helper.get_state()
-                        state["connectorLastEventId"] = str(msg.id)
-                        self.helper.set_state(state)
+                if msg.id is not None:
+                    self.checkpointer.update(str(msg.id))
+            if self.pipeline is not None:
+                self.pipeline.stop()
+            if self.batcher is not None:
+                self.batcher.flush()
+            self.checkpointer.flush()
         except:
-            sys.excepthook(*sys.exc_info())
+            exc_info = sys.exc_info()
+            try:
+                if self.pipeline is not None:
+                    self.pipeline.stop()
+            finally:
+                # Persist the progress before the process is killed
+                self.checkpointer.flush()
+                self.helper.force_ping()
+                sys.excepthook(*exc_info)
+
+    def get_metrics(self) -> Optional[Dict]:
+        """get the metrics of the stream reader
+
+        :return: connections, reconnects, events, last event ID and time, and
+                 lag in seconds behind the stream, None if not started
+        :rtype: Dict
+        """
+
+        return self.reader.get_metrics() if self.reader is not None else None
 
     def stop(self):
         self.exit = True
         self.exit_event.set()
+        if self.reader is not None:
+            self.reader.close()
+        self.checkpointer.flush()
+        self.helper.force_ping()
 
 
 class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
@@ -499,6 +1296,27 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             False,
             False,
         )
+        self.connect_live_stream_checkpoint_interval = get_config_variable(
+            "CONNECTOR_LIVE_STREAM_CHECKPOINT_INTERVAL",
+            ["connector", "live_stream_checkpoint_interval"],
+            config,
+            True,
+            5,
+        )
+        self.connect_live_stream_checkpoint_events = get_config_variable(
+            "CONNECTOR_LIVE_STREAM_CHECKPOINT_EVENTS",
+            ["connector", "live_stream_checkpoint_events"],
+            config,
+            True,
+            100,
+        )
+        self.connect_live_stream_stall_timeout = get_config_variable(
+            "CONNECTOR_LIVE_STREAM_STALL_TIMEOUT",
+            ["connector", "live_stream_stall_timeout"],
+            config,
+            True,
+            60,
+        )
         self.connect_name = get_config_variable(
             "CONNECTOR_NAME", ["connector", "name"], config
         )
@@ -538,6 +1356,35 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             False,
             False,
         )
+        self.connect_listen_workers = get_config_variable(
+            "CONNECTOR_LISTEN_WORKERS",
+            ["connector", "listen_workers"],
+            config,
+            True,
+            1,
+        )
+        self.connect_listen_prefetch = get_config_variable(
+            "CONNECTOR_LISTEN_PREFETCH",
+            ["connector", "listen_prefetch"],
+            config,
+            True,
+            None,
+        )
+        self.connect_listen_processes = get_config_variable(
+            "CONNECTOR_LISTEN_PROCESSES",
+            ["connector", "listen_processes"],
+            config,
+            True,
+            1,
+        )
+        if (
+            self.listen_in_processes()
+            and "fork" not in multiprocessing.get_all_start_methods()
+        ):
+            raise ValueError(
+                "CONNECTOR_LISTEN_PROCESSES requires the fork start method, "
+                "which is not available on this platform"
+            )
 
         # Configure logger
         numeric_level = getattr(
@@ -548,12 +1395,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         logging.basicConfig(level=numeric_level)
 
         # Initialize configuration
-        self.api = OpenCTIApiClient(
-            self.opencti_url,
-            self.opencti_token,
-            self.log_level,
-            json_logging=self.opencti_json_logging,
-        )
+        self.api = self.create_api_client()
         # Register the connector in OpenCTI
         self.connector = OpenCTIConnector(
             self.connect_id,
@@ -566,27 +1408,94 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         connector_configuration = self.api.connector.register(self.connector)
         logging.info("%s", f"Connector registered with ID: {self.connect_id}")
         self.connector_id = connector_configuration["id"]
-        self.work_id = None
-        self.applicant_id = connector_configuration["connector_user"]["id"]
+        self._work_id = None
+        self._applicant_id = connector_configuration["connector_user"]["id"]
         self.connector_state = connector_configuration["connector_state"]
         self.config = connector_configuration["config"]
 
-        # Start ping thread
-        if not self.connect_run_and_terminate:
-            self.ping = PingAlive(
-                self.connector.id, self.api, self.get_state, self.set_state
-            )
-            self.ping.start()
+        # Start ping thread, after forking the worker processes if any
+        self.ping = None
+        if not self.listen_in_processes():
+            self.ensure_ping()
 
         # self.listen_stream = None
         self.listen_queue = None
 
+    def create_api_client(self) -> OpenCTIApiClient:
+        return OpenCTIApiClient(
+            self.opencti_url,
+            self.opencti_token,
+            self.log_level,
+            json_logging=self.opencti_json_logging,
+        )
+
+    def start_ping(self) -> None:
+        self.ping = PingAlive(
+            self.connector.id, self.api, self.get_state, self.set_state
+        )
+        self.ping.start()
+
+    def ensure_ping(self) -> None:
+        """start the ping of the connector if it is not started yet"""
+
+        if self.ping is None and not self.connect_run_and_terminate:
+            self.start_ping()
+
+    def listen_in_processes(self) -> bool:
+        """whether `listen` consumes the queue with worker processes"""
+
+        return (
+            self.connect_listen_processes is not None
+            and self.connect_listen_processes > 1
+        )
+
+    @property
+    def work_id(self) -> Optional[str]:
+        """the work of the message being processed, or the connector one"""
+
+        context = message_context.get()
+        return context.work_id if context is not None else self._work_id
+
+    @work_id.setter
+    def work_id(self, work_id: Optional[str]) -> None:
+        self._work_id = work_id
+
+    @property
+    def applicant_id(self) -> Optional[str]:
+        """the applicant of the message being processed, or the connector user"""
+
+        context = message_context.get()
+        if context is not None and context.applicant_id is not None:
+            return context.applicant_id
+        return self._applicant_id
+
+    @applicant_id.setter
+    def applicant_id(self, applicant_id: Optional[str]) -> None:
+        self._applicant_id = applicant_id
+
+    @staticmethod
+    def get_message_context() -> Optional[MessageContext]:
+        """get the context of the message being processed
+
+        :return: the message context or None outside of a message processing
+        :rtype: MessageContext
+        """
+
+        return message_context.get()
+
+    @staticmethod
+    def get_logger() -> Union[logging.Logger, logging.LoggerAdapter]:
+        context = message_context.get()
+        return context.logger if context is not None else logging.getLogger()
+
     def stop(self) -> None:
         if self.listen_queue:
             self.listen_queue.stop()
         # if self.listen_stream:
         #     self.listen_stream.stop()
-        self.ping.stop()
+        if self.ping:
+            self.ping.stop()
+        self.api.work.stop()
         self.api.connector.unregister(self.connector_id)
 
     def get_name(self) -> Optional[Union[bool, int, str]]:
@@ -608,7 +1517,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :type state: Dict
         """
 
-        self.connector_state = json.dumps(state)
+        self.connector_state = opencti_json.dumps_str(state)
 
     def get_state(self) -> Optional[Dict]:
         """get the connector state
@@ -619,7 +1528,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
 
         try:
             if self.connector_state:
-                state = json.loads(self.connector_state)
+                state = opencti_json.loads(self.connector_state)
                 if isinstance(state, Dict) and state:
                     return state
         except:  # pylint: disable=bare-except  # noqa: E722
@@ -631,7 +1540,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             initial_state = self.get_state()
             result = self.api.connector.ping(self.connector_id, initial_state)
             remote_state = (
-                json.loads(result["connector_state"])
+                opencti_json.loads(result["connector_state"])
                 if result["connector_state"] is not None
                 and len(result["connector_state"]) > 0
                 else None
@@ -648,8 +1557,15 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :type message_callback: Callable[[Dict], str]
         """
 
-        self.listen_queue = ListenQueue(self, self.config, message_callback)
+        if self.listen_in_processes():
+            self.listen_queue = ListenProcesses(
+                self, self.config, message_callback, self.connect_listen_processes
+            )
+        else:
+            self.listen_queue = ListenQueue(self, self.config, message_callback)
+        # The worker processes are forked on start, before the ping thread
         self.listen_queue.start()
+        self.ensure_ping()
 
     def listen_stream(
         self,
@@ -663,10 +1579,23 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         no_dependencies=False,
         recover_iso_date=None,
         with_inferences=False,
+        pipeline_workers=None,
+        pipeline_queue_size=100,
+        batch_size=None,
+        batch_linger=1.0,
     ) -> ListenStream:
         """listen for messages and register callback function
 
         :param message_callback: callback function to process messages
+        :param pipeline_workers: (optional) number of workers processing the
+                                 messages concurrently, messages of a same
+                                 entity being processed in order
+        :param pipeline_queue_size: (optional) maximum number of messages
+                                    waiting for each worker
+        :param batch_size: (optional) switch the callback to batches of at most
+                           `batch_size` decoded messages
+        :param batch_linger: (optional) maximum delay in seconds before
+                             delivering an incomplete batch, defaults to 1
         """
 
         self.listen_stream = ListenStream(
@@ -681,7 +1610,12 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             no_dependencies,
             recover_iso_date,
             with_inferences,
+            pipeline_workers,
+            pipeline_queue_size,
+            batch_size,
+            batch_linger,
         )
+        self.ensure_ping()
         self.listen_stream.start()
         return self.listen_stream
 
@@ -695,16 +1629,16 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         return self.connector
 
     def log_error(self, msg: str) -> None:
-        logging.error(msg)
+        self.get_logger().error(msg)
 
     def log_info(self, msg: str) -> None:
-        logging.info(msg)
+        self.get_logger().info(msg)
 
     def log_debug(self, msg: str) -> None:
-        logging.debug(msg)
+        self.get_logger().debug(msg)
 
     def log_warning(self, msg: str) -> None:
-        logging.warning(msg)
+        self.get_logger().warning(msg)
 
     def date_now(self) -> str:
         """get the current date (UTC)
@@ -841,7 +1775,9 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             "applicant_id": self.applicant_id,
             "action_sequence": sequence,
             "entities_types": entities_types,
-            "content": base64.b64encode(bundle.encode("utf-8")).decode("utf-8"),
+            "content": base64.b64encode(
+                bundle if isinstance(bundle, bytes) else bundle.encode("utf-8")
+            ).decode("ascii"),
             "update": update,
         }
         if work_id is not None:
@@ -853,7 +1789,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             channel.basic_publish(
                 exchange=self.config["push_exchange"],
                 routing_key=routing_key,
-                body=json.dumps(message),
+                body=opencti_json.dumps(message),
                 properties=pika.BasicProperties(
                     delivery_mode=2,  # make message persistent
                 ),
@@ -966,12 +1902,12 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
         :rtype: list
         """
 
-        ids = []
+        ids = set()
         final_items = []
         for item in items:
             if item["id"] not in ids:
                 final_items.append(item)
-                ids.append(item["id"])
+                ids.add(item["id"])
         return final_items
 
     @staticmethod
@@ -990,7 +1926,7 @@ class OpenCTIConnectorHelper:  # pylint: disable=too-many-public-methods
             "spec_version": "2.1",
             "objects": items,
         }
-        return json.dumps(bundle)
+        return opencti_json.dumps_str(bundle)
 
     @staticmethod
     def check_max_tlp(tlp: str, max_tlp: str) -> bool:
@@ -0,0 +1,440 @@
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from pycti.connector.opencti_connector_helper import (
+    ListenQueue,
+    ListenStream,
+    MessageContext,
+    OpenCTIConnectorHelper,
+    PingAlive,
+    StreamCheckpointer,
+    get_config_variable,
+    message_context,
+)
+from pycti.utils import opencti_json
+
+# Values returned as is by the API proxy, anything else is proxied.
+PLAIN_TYPES = (str, bytes, int, float, bool, dict, list, tuple, type(None))
+
+
+class AsyncApiProxy:
+    """Awaitable view of an `OpenCTIApiClient`
+
+    Methods of the client (and of its entities, such as `api.work` or
+    `api.indicator`) are returned as coroutine functions executed in the
+    executor of the helper, with the context of the caller so the headers of
+    the message being processed are used.
+
+    :param target: the proxied object
+    :param run: coroutine function running a blocking callable
+    :type run: Callable
+    """
+
+    def __init__(self, target, run) -> None:
+        self._target = target
+        self._run = run
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        if callable(value):
+            return functools.partial(self._run, value)
+        if isinstance(value, PLAIN_TYPES):
+            return value
+        return AsyncApiProxy(value, self._run)
+
+
+class AsyncListenQueue(ListenQueue):
+    """ListenQueue dispatching messages to an asyncio event loop
+
+    Up to `prefetch` messages are processed concurrently as tasks of the loop,
+    each one acknowledged from the connection thread once processed. Works are
+    kept alive by a single task per work id, whatever the number of messages
+    of this work in flight. Once stopping, new messages are requeued and the
+    messages in flight are awaited before the connection is closed.
+
+    :param helper: instance of a `AsyncOpenCTIConnectorHelper` class
+    :type helper: AsyncOpenCTIConnectorHelper
+    :param config: dict containing client config
+    :type config: Dict
+    :param callback: callback (or coroutine) function to process queue
+    :type callback: callable
+    :param loop: the event loop running the callbacks
+    :type loop: asyncio.AbstractEventLoop
+    """
+
+    def __init__(self, helper, config: Dict, callback, loop) -> None:
+        super().__init__(helper, config, callback)
+        self.loop = loop
+        self.prefetch = max(helper.connect_async_concurrency, 1)
+        self.keep_alive_min_interval = 60
+        self.keep_alive_max_interval = 300
+        self.works = {}
+        self.tasks = set()
+
+    # noinspection PyUnusedLocal
+    def _process_message(self, channel, method, properties, body) -> None:
+        if self.exit_event.is_set():
+            # Stopping, the message is requeued instead of being processed
+            channel.basic_nack(delivery_tag=method.delivery_tag, requeue=True)
+            return
+        json_data = opencti_json.loads(body)
+        task = asyncio.run_coroutine_threadsafe(
+            self._handle_message_async(
+                self.pika_connection, channel, method.delivery_tag, json_data
+            ),
+            self.loop,
+        )
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def _handle_message_async(
+        self, connection, channel, delivery_tag, json_data
+    ) -> None:
+        settle = self._ack_message
+        try:
+            work_id = json_data["internal"]["work_id"]
+            if work_id is not None:
+                self._register(work_id)
+            try:
+                await self._data_handler_async(json_data)
+            finally:
+                if work_id is not None:
+                    self._unregister(work_id)
+        except Exception:  # pylint: disable=broad-except
+            # Not processable, rejected instead of holding a prefetch slot
+            logging.exception("Unable to process message %s", delivery_tag)
+            settle = self._reject_message
+
+        try:
+            connection.add_callback_threadsafe(
+                functools.partial(settle, channel, delivery_tag)
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            # The connection is gone, the message will be redelivered
+            logging.error("Unable to acknowledge message %s: %s", delivery_tag, e)
+
+        logging.info("%s", f"Message (delivery_tag={delivery_tag}) processed")
+
+    async def _data_handler_async(self, json_data) -> None:
+        work_id = json_data["internal"]["work_id"]
+        applicant_id = json_data["internal"]["applicant_id"]
+        context = MessageContext(work_id, applicant_id)
+        # The task runs in its own context, nothing to reset
+        message_context.set(context)
+        work = self.helper.async_api.work
+        with self.helper.api.request_headers_context(context.headers):
+            try:
+                await work.to_received(
+                    work_id, "Connector ready to process the operation"
+                )
+                message = await self.helper.call(self.callback, json_data["event"])
+                await work.to_processed(work_id, message)
+            except Exception as e:  # pylint: disable=broad-except
+                context.logger.exception(
+                    "Error in message processing, reporting error to API"
+                )
+                try:
+                    await work.to_processed(work_id, str(e), True)
+                except:  # pylint: disable=bare-except
+                    context.logger.error("Failing reporting the processing")
+
+    def _register(self, work_id: str) -> None:
+        if work_id in self.works:
+            self.works[work_id][0] += 1
+        else:
+            task = asyncio.ensure_future(self._keep_alive(work_id))
+            self.works[work_id] = [1, task]
+
+    def _unregister(self, work_id: str) -> None:
+        entry = self.works[work_id]
+        entry[0] -= 1
+        if entry[0] == 0:
+            entry[1].cancel()
+            del self.works[work_id]
+
+    async def _keep_alive(self, work_id: str) -> None:
+        interval = self.keep_alive_min_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.helper.async_api.work.ping(work_id)
+                interval = min(interval * 2, self.keep_alive_max_interval)
+            except Exception as e:  # pylint: disable=broad-except
+                logging.error("Unable to ping work %s: %s", work_id, e)
+                interval = self.keep_alive_min_interval
+
+    def run(self) -> None:
+        try:
+            self.consume()
+        finally:
+            self.drain()
+
+    def drain(self) -> None:
+        """wait for the messages being processed, acknowledge them and close
+        the connection"""
+
+        # The tasks only complete while the loop is running
+        if self.loop.is_running():
+            concurrent.futures.wait(list(self.tasks))
+        self.close_connection()
+
+    def stop(self) -> None:
+        self.exit_event.set()
+        if self.pika_connection is not None and self.channel is not None:
+            try:
+                self.pika_connection.add_callback_threadsafe(
+                    self.channel.stop_consuming
+                )
+            except Exception:  # pylint: disable=broad-except
+                pass
+
+    async def stop_async(self) -> None:
+        """stop consuming, awaiting the messages being processed"""
+
+        self.stop()
+        tasks = list(self.tasks)
+        if len(tasks) > 0:
+            await asyncio.wait([asyncio.wrap_future(task) for task in tasks])
+        if self.is_alive():
+            await self.helper.run_in_executor(self.join)
+
+
+class AsyncOpenCTIConnectorHelper(OpenCTIConnectorHelper):
+    """Python API for OpenCTI connector running on an asyncio event loop
+
+    Works like `OpenCTIConnectorHelper` but the callbacks given to
+    `listen_async` and `listen_stream_async` may be coroutine functions,
+    messages are processed concurrently on the event loop and the connector
+    is kept alive by a task instead of a thread. API calls are awaitable
+    through `async_api`, which runs the (blocking) client in a thread pool.
+
+    :param config: Dict standard config
+    :type config: Dict
+    """
+
+    def __init__(self, config: Dict) -> None:
+        self.connect_async_concurrency = get_config_variable(
+            "CONNECTOR_ASYNC_CONCURRENCY",
+            ["connector", "async_concurrency"],
+            config,
+            True,
+            100,
+        )
+        self.connect_async_api_workers = get_config_variable(
+            "CONNECTOR_ASYNC_API_WORKERS",
+            ["connector", "async_api_workers"],
+            config,
+            True,
+            16,
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(self.connect_async_api_workers, 1),
+            thread_name_prefix="AsyncHelper",
+        )
+        self.ping_task = None
+        self.stopped = None
+        super().__init__(config)
+        self.async_api = AsyncApiProxy(self.api, self.run_in_executor)
+
+    def start_ping(self) -> None:
+        # Pinged by a task of the event loop, see `start`
+        self.ping = PingAlive(
+            self.connector.id, self.api, self.get_state, self.set_state
+        )
+
+    async def run_in_executor(self, func: Callable, *args, **kwargs):
+        """run a blocking function in the executor of the helper
+
+        The function runs in a copy of the current context, so the message
+        context and the request headers are kept.
+
+        :param func: the function to run
+        :type func: Callable
+        :return: the result of the function
+        """
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def call(self, callback: Callable, *args):
+        """call a coroutine function, or a blocking function in the executor
+
+        :param callback: the function to call
+        :type callback: Callable
+        :return: the result of the function
+        """
+
+        if asyncio.iscoroutinefunction(callback):
+            return await callback(*args)
+        return await self.run_in_executor(callback, *args)
+
+    async def start(self) -> None:
+        """start the keep alive task of the connector on the running loop"""
+
+        if self.stopped is None:
+            self.stopped = asyncio.Event()
+        self.ensure_ping()
+        if self.ping is not None and self.ping_task is None:
+            self.ping_task = asyncio.ensure_future(self._ping())
+
+    async def _ping(self) -> None:
+        logging.info("Starting ping alive task")
+        while True:
+            await self.run_in_executor(self.ping.ping_once)
+            await asyncio.sleep(40)
+
+    async def listen_async(self, message_callback: Callable[[Dict], str]) -> None:
+        """listen for messages until the helper is stopped
+
+        :param message_callback: function or coroutine function to process
+                                 messages
+        :type message_callback: Callable[[Dict], str]
+        """
+
+        await self.start()
+        self.listen_queue = AsyncListenQueue(
+            self, self.config, message_callback, asyncio.get_running_loop()
+        )
+        self.listen_queue.start()
+        await self.stopped.wait()
+
+    async def listen_stream_async(
+        self,
+        message_callback,
+        url=None,
+        token=None,
+        verify_ssl=None,
+        start_timestamp=None,
+        live_stream_id=None,
+        listen_delete=True,
+        no_dependencies=False,
+        recover_iso_date=None,
+        with_inferences=False,
+        queue_size=100,
+    ) -> None:
+        """listen for events of a live stream until the helper is stopped
+
+        Events are read in a thread and handed over to the event loop through
+        a bounded queue, they are processed in order.
+
+        :param message_callback: function or coroutine function to process
+                                 events
+        :param queue_size: number of events read ahead of the callback
+        :type queue_size: int
+        """
+
+        await self.start()
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue(maxsize=queue_size)
+        stream = ListenStream(
+            self,
+            message_callback,
+            url,
+            token,
+            verify_ssl,
+            start_timestamp,
+            live_stream_id,
+            listen_delete,
+            no_dependencies,
+            recover_iso_date,
+            with_inferences,
+        )
+        checkpointer = StreamCheckpointer(
+            self,
+            self.connect_live_stream_checkpoint_interval,
+            self.connect_live_stream_checkpoint_events,
+        )
+        stream.reader = stream.create_reader(stream.init_state())
+        exit_event = threading.Event()
+
+        def read() -> None:
+            try:
+                for msg in stream.reader:
+                    if exit_event.is_set():
+                        return
+                    asyncio.run_coroutine_threadsafe(events.put(msg), loop).result()
+            finally:
+                if not exit_event.is_set():
+                    asyncio.run_coroutine_threadsafe(events.put(None), loop).result()
+
+        reader = loop.run_in_executor(None, read)
+        stopped = asyncio.ensure_future(self.stopped.wait())
+        try:
+            # Events read ahead are left to the next run once stopped
+            while not self.stopped.is_set():
+                get = asyncio.ensure_future(events.get())
+                await asyncio.wait([get, stopped], return_when=asyncio.FIRST_COMPLETED)
+                if not get.done():
+                    get.cancel()
+                    break
+                msg = get.result()
+                if msg is None:
+                    break
+                if msg.event == "heartbeat" or msg.event == "connected":
+                    checkpointer.tick()
+                    continue
+                if msg.event != "sync":
+                    await self.call(message_callback, msg)
+                if msg.id is not None:
+                    checkpointer.update(str(msg.id))
+        finally:
+            exit_event.set()
+            stream.reader.close()
+            stopped.cancel()
+            # Unblock the reader while waiting for room in the queue
+            while not reader.done():
+                while not events.empty():
+                    events.get_nowait()
+                await asyncio.wait([reader], timeout=0.1)
+            checkpointer.flush()
+            await self.run_in_executor(self.force_ping)
+
+    async def send_stix2_bundle_async(self, bundle, **kwargs) -> list:
+        """send a stix2 bundle to the API, see `send_stix2_bundle`"""
+
+        return await self.run_in_executor(self.send_stix2_bundle, bundle, **kwargs)
+
+    async def stop_async(self) -> None:
+        """stop listening and unregister the connector"""
+
+        if self.stopped is not None:
+            self.stopped.set()
+        if self.ping_task is not None:
+            self.ping_task.cancel()
+            self.ping_task = None
+        if isinstance(self.listen_queue, AsyncListenQueue):
+            await self.listen_queue.stop_async()
+        elif self.listen_queue:
+            self.listen_queue.stop()
+        await self.run_in_executor(self.api.connector.unregister, self.connector_id)
+        self.executor.shutdown(wait=False)
+
+
+def run_connector(
+    helper: AsyncOpenCTIConnectorHelper, coroutine, debug: Optional[bool] = None
+) -> None:
+    """run the main coroutine of a connector, stopping the helper on exit
+
+    :param helper: the connector helper
+    :type helper: AsyncOpenCTIConnectorHelper
+    :param coroutine: the coroutine of the connector
+    :param debug: run the event loop in debug mode
+    :type debug: bool
+    """
+
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await helper.stop_async()
+
+    return asyncio.run(main(), debug=debug)
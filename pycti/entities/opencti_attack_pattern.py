@@ -162,6 +162,7 @@ class AttackPattern:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Attack-Pattern objects
     """
 
@@ -173,6 +174,7 @@ class AttackPattern:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -181,15 +183,16 @@ class AttackPattern:
         self.opencti.log(
             "info", "Listing Attack-Patterns with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query AttackPatterns($filters: [AttackPatternsFiltering], $search: String, $first: Int, $after: ID, $orderBy: AttackPatternsOrdering, $orderMode: OrderingMode) {
                 attackPatterns(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -201,7 +204,7 @@ class AttackPattern:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -216,7 +219,9 @@ class AttackPattern:
         )
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["attackPatterns"])
+            data = self.opencti.process_multiple(
+                result["data"]["attackPatterns"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["attackPatterns"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["attackPatterns"]["pageInfo"]["endCursor"]
@@ -232,12 +237,14 @@ class AttackPattern:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["attackPatterns"])
+                data = self.opencti.process_multiple(
+                    result["data"]["attackPatterns"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["attackPatterns"], with_pagination
+                result["data"]["attackPatterns"], with_pagination, selection=selection
             )
 
     """
@@ -245,6 +252,7 @@ class AttackPattern:
 
         :param id: the id of the Attack-Pattern
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Attack-Pattern object
     """
 
@@ -252,27 +260,29 @@ class AttackPattern:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Attack-Pattern {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query AttackPattern($id: String!) {
                     attackPattern(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["attackPattern"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["attackPattern"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -283,6 +293,22 @@ class AttackPattern:
             )
             return None
 
+    """
+        Read many Attack-Pattern objects
+
+        :param ids: the ids of the Attack-Pattern objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Attack-Pattern objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "attackPattern", "Attack-Pattern", self.properties, **kwargs
+        )
+
     """
         Create a Attack-Pattern object
 
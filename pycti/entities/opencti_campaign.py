@@ -144,6 +144,7 @@ class Campaign:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Campaign objects
     """
 
@@ -155,6 +156,7 @@ class Campaign:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -163,15 +165,16 @@ class Campaign:
         self.opencti.log(
             "info", "Listing Campaigns with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Campaigns($filters: [CampaignsFiltering], $search: String, $first: Int, $after: ID, $orderBy: CampaignsOrdering, $orderMode: OrderingMode) {
                 campaigns(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -183,7 +186,7 @@ class Campaign:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -197,7 +200,7 @@ class Campaign:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["campaigns"], with_pagination
+            result["data"]["campaigns"], with_pagination, selection=selection
         )
 
     """
@@ -205,6 +208,7 @@ class Campaign:
 
         :param id: the id of the Campaign
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Campaign object
     """
 
@@ -212,27 +216,29 @@ class Campaign:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Campaign {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Campaign($id: String!) {
                     campaign(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["campaign"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["campaign"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -243,6 +249,22 @@ class Campaign:
             )
             return None
 
+    """
+        Read many Campaign objects
+
+        :param ids: the ids of the Campaign objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Campaign objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "campaign", "Campaign", self.properties, **kwargs
+        )
+
     """
         Create a Campaign object
 
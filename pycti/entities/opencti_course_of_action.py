@@ -145,6 +145,7 @@ class CourseOfAction:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Course-Of-Action objects
     """
 
@@ -156,6 +157,7 @@ class CourseOfAction:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -165,15 +167,16 @@ class CourseOfAction:
             "info",
             "Listing Course-Of-Actions with filters " + json.dumps(filters) + ".",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query CoursesOfAction($filters: [CoursesOfActionFiltering], $search: String, $first: Int, $after: ID, $orderBy: CoursesOfActionOrdering, $orderMode: OrderingMode) {
                 coursesOfAction(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -185,7 +188,7 @@ class CourseOfAction:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -199,7 +202,7 @@ class CourseOfAction:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["coursesOfAction"], with_pagination
+            result["data"]["coursesOfAction"], with_pagination, selection=selection
         )
 
     """
@@ -207,6 +210,7 @@ class CourseOfAction:
 
         :param id: the id of the Course-Of-Action
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Course-Of-Action object
     """
 
@@ -214,29 +218,29 @@ class CourseOfAction:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Course-Of-Action {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query CourseOfAction($id: String!) {
                     courseOfAction(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["courseOfAction"]
+                result["data"]["courseOfAction"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -247,6 +251,22 @@ class CourseOfAction:
             )
             return None
 
+    """
+        Read many Course-Of-Action objects
+
+        :param ids: the ids of the Course-Of-Action objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Course-Of-Action objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "courseOfAction", "Course-Of-Action", self.properties, **kwargs
+        )
+
     """
         Create a Course Of Action object
 
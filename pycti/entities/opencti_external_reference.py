@@ -59,6 +59,7 @@ class ExternalReference:
         :param filters: the filters to apply
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of External-Reference objects
     """
 
@@ -69,6 +70,7 @@ class ExternalReference:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -78,15 +80,16 @@ class ExternalReference:
             "info",
             "Listing External-Reference with filters " + json.dumps(filters) + ".",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query ExternalReferences($filters: [ExternalReferencesFiltering], $first: Int, $after: ID, $orderBy: ExternalReferencesOrdering, $orderMode: OrderingMode) {
                 externalReferences(filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -98,7 +101,7 @@ class ExternalReference:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -111,7 +114,7 @@ class ExternalReference:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["externalReferences"], with_pagination
+            result["data"]["externalReferences"], with_pagination, selection=selection
         )
 
     """
@@ -119,31 +122,34 @@ class ExternalReference:
 
         :param id: the id of the External-Reference
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return External-Reference object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading External-Reference {" + id + "}.")
-            query = (
+            selection = self.opencti.select(self.properties, projection=projection)
+            query = self.opencti.compile_query(
                 """
                 query ExternalReference($id: String!) {
                     externalReference(id: $id) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["externalReference"]
+                result["data"]["externalReference"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -155,6 +161,21 @@ class ExternalReference:
             )
             return None
 
+    """
+        Read many External-Reference objects
+
+        :param ids: the ids of the External-Reference objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of External-Reference objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "externalReference", "External-Reference", self.properties, **kwargs
+        )
+
     """
         Create a External Reference object
 
@@ -163,49 +184,31 @@ class ExternalReference:
     """
 
     def create(self, **kwargs):
-        stix_id = kwargs.get("stix_id", None)
-        created = kwargs.get("created", None)
-        modified = kwargs.get("modified", None)
         source_name = kwargs.get("source_name", None)
         url = kwargs.get("url", None)
-        external_id = kwargs.get("external_id", None)
-        description = kwargs.get("description", None)
-        x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
-        update = kwargs.get("update", False)
 
         if source_name is not None and url is not None:
             self.opencti.log(
                 "info", "Creating External Reference {" + source_name + "}."
             )
-            query = (
+            selection = self.properties
+            query = self.opencti.compile_query(
                 """
                 mutation ExternalReferenceAdd($input: ExternalReferenceAddInput) {
                     externalReferenceAdd(input: $input) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(
                 query,
-                {
-                    "input": {
-                        "stix_id": stix_id,
-                        "created": created,
-                        "modified": modified,
-                        "source_name": source_name,
-                        "external_id": external_id,
-                        "description": description,
-                        "url": url,
-                        "x_opencti_stix_ids": x_opencti_stix_ids,
-                        "update": update,
-                    }
-                },
+                {"input": self.generate_input(**kwargs)},
             )
             return self.opencti.process_multiple_fields(
-                result["data"]["externalReferenceAdd"]
+                result["data"]["externalReferenceAdd"], selection=selection
             )
         else:
             self.opencti.log(
@@ -213,6 +216,63 @@ class ExternalReference:
                 "[opencti_external_reference] Missing parameters: source_name and url",
             )
 
+    """
+        Create many External Reference objects
+
+        :param external_references: list of dict of the `create` arguments of each External Reference
+        :param batch_size: number of External Reference objects created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": External Reference object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        items = kwargs.get("external_references", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        self.opencti.log(
+            "info",
+            "Creating " + str(len(items)) + " External Reference objects in bulk.",
+        )
+        selection = self.properties
+        results = self.opencti.query_batch(
+            "mutation",
+            "externalReferenceAdd",
+            {"input": "ExternalReferenceAddInput"},
+            [{"input": self.generate_input(**item)} for item in items],
+            selection,
+            batch_size,
+            max_workers,
+        )
+        return [
+            {
+                "result": self.opencti.process_multiple_fields(
+                    data, selection=selection
+                ),
+                "error": error,
+            }
+            for data, error in results
+        ]
+
+    """
+        Generate the input of a External Reference creation
+
+        :return ExternalReferenceAddInput dict
+    """
+
+    def generate_input(self, **kwargs):
+        return {
+            "stix_id": kwargs.get("stix_id", None),
+            "created": kwargs.get("created", None),
+            "modified": kwargs.get("modified", None),
+            "source_name": kwargs.get("source_name", None),
+            "external_id": kwargs.get("external_id", None),
+            "description": kwargs.get("description", None),
+            "url": kwargs.get("url", None),
+            "x_opencti_stix_ids": kwargs.get("x_opencti_stix_ids", None),
+            "update": kwargs.get("update", False),
+        }
+
     """
         Upload a file in this External-Reference
 
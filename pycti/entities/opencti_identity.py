@@ -154,6 +154,7 @@ class Identity:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Identity objects
     """
 
@@ -166,6 +167,7 @@ class Identity:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -174,15 +176,16 @@ class Identity:
         self.opencti.log(
             "info", "Listing Identities with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Identities($types: [String], $filters: [IdentitiesFiltering], $search: String, $first: Int, $after: ID, $orderBy: IdentitiesOrdering, $orderMode: OrderingMode) {
                 identities(types: $types, filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -194,7 +197,7 @@ class Identity:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -209,7 +212,7 @@ class Identity:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["identities"], with_pagination
+            result["data"]["identities"], with_pagination, selection=selection
         )
 
     """
@@ -217,6 +220,7 @@ class Identity:
 
         :param id: the id of the Identity
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Identity object
     """
 
@@ -224,27 +228,29 @@ class Identity:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Identity {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Identity($id: String!) {
                     identity(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["identity"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["identity"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -255,6 +261,22 @@ class Identity:
             )
             return None
 
+    """
+        Read many Identity objects
+
+        :param ids: the ids of the Identity objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Identity objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "identity", "Identity", self.properties, **kwargs
+        )
+
     """
         Create a Identity object
 
@@ -185,6 +185,7 @@ class Indicator:
         :param list customAttributes: (optional) list of attributes keys to return
         :param bool getAll: (optional) switch to return all entries (be careful to use this without any other filters)
         :param bool withPagination: (optional) switch to use pagination
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
 
         :return: List of Indicators
         :rtype: list
@@ -197,6 +198,7 @@ class Indicator:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -205,15 +207,16 @@ class Indicator:
         self.opencti.log(
             "info", "Listing Indicators with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
                 query Indicators($filters: [IndicatorsFiltering], $search: String, $first: Int, $after: ID, $orderBy: IndicatorsOrdering, $orderMode: OrderingMode) {
                     indicators(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                         edges {
                             node {
-                                """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                                """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -225,7 +228,7 @@ class Indicator:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -240,7 +243,9 @@ class Indicator:
         )
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["indicators"])
+            data = self.opencti.process_multiple(
+                result["data"]["indicators"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["indicators"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["indicators"]["pageInfo"]["endCursor"]
@@ -256,12 +261,14 @@ class Indicator:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["indicators"])
+                data = self.opencti.process_multiple(
+                    result["data"]["indicators"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["indicators"], with_pagination
+                result["data"]["indicators"], with_pagination, selection=selection
             )
 
     def read(self, **kwargs):
@@ -276,6 +283,7 @@ class Indicator:
 
         :param str id: the id of the Threat-Actor
         :param list filters: the filters to apply if no id provided
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
 
         :return: Indicator object
         :rtype: Indicator
@@ -284,27 +292,33 @@ class Indicator:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Indicator {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                     query Indicator($id: String!) {
                         indicator(id: $id) {
-                            """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                            """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["indicator"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["indicator"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters,
+                customAttributes=custom_attributes,
+                projection=projection,
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -315,6 +329,22 @@ class Indicator:
             )
             return None
 
+    """
+        Read many Indicator objects
+
+        :param ids: the ids of the Indicator objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Indicator objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "indicator", "Indicator", self.properties, **kwargs
+        )
+
     def create(self, **kwargs):
         """
         Create an Indicator object
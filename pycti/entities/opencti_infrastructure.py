@@ -170,6 +170,7 @@ class Infrastructure:
         :param list customAttributes: (optional) list of attributes keys to return
         :param bool getAll: (optional) switch to return all entries (be careful to use this without any other filters)
         :param bool withPagination: (optional) switch to use pagination
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         """
 
         filters = kwargs.get("filters", None)
@@ -179,6 +180,7 @@ class Infrastructure:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -187,15 +189,16 @@ class Infrastructure:
         self.opencti.log(
             "info", "Listing Infrastructures with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Infrastructures($filters: [InfrastructuresFiltering], $search: String, $first: Int, $after: ID, $orderBy: InfrastructuresOrdering, $orderMode: OrderingMode) {
                 infrastructures(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -207,7 +210,7 @@ class Infrastructure:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -223,7 +226,9 @@ class Infrastructure:
 
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["infrastructures"])
+            data = self.opencti.process_multiple(
+                result["data"]["infrastructures"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["infrastructures"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["infrastructures"]["pageInfo"]["endCursor"]
@@ -239,12 +244,14 @@ class Infrastructure:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["infrastructures"])
+                data = self.opencti.process_multiple(
+                    result["data"]["infrastructures"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["infrastructures"], with_pagination
+                result["data"]["infrastructures"], with_pagination, selection=selection
             )
 
     def read(self, **kwargs):
@@ -259,34 +266,39 @@ class Infrastructure:
 
         :param str id: the id of the Threat-Actor
         :param list filters: the filters to apply if no id provided
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         """
 
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Infrastructure {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Infrastructure($id: String!) {
                     infrastructure(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["infrastructure"]
+                result["data"]["infrastructure"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters,
+                customAttributes=custom_attributes,
+                projection=projection,
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -297,6 +309,22 @@ class Infrastructure:
             )
             return None
 
+    """
+        Read many Infrastructure objects
+
+        :param ids: the ids of the Infrastructure objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Infrastructure objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "infrastructure", "Infrastructure", self.properties, **kwargs
+        )
+
     """
         Create a Infrastructure object
 
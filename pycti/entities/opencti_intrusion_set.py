@@ -147,6 +147,7 @@ class IntrusionSet:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Intrusion-Set objects
     """
 
@@ -158,6 +159,7 @@ class IntrusionSet:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -166,15 +168,16 @@ class IntrusionSet:
         self.opencti.log(
             "info", "Listing Intrusion-Sets with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query IntrusionSets($filters: [IntrusionSetsFiltering], $search: String, $first: Int, $after: ID, $orderBy: IntrusionSetsOrdering, $orderMode: OrderingMode) {
                 intrusionSets(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -186,7 +189,7 @@ class IntrusionSet:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -200,7 +203,7 @@ class IntrusionSet:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["intrusionSets"], with_pagination
+            result["data"]["intrusionSets"], with_pagination, selection=selection
         )
 
     """
@@ -208,6 +211,7 @@ class IntrusionSet:
 
         :param id: the id of the Intrusion-Set
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Intrusion-Set object
     """
 
@@ -215,27 +219,29 @@ class IntrusionSet:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Intrusion-Set {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query IntrusionSet($id: String!) {
                     intrusionSet(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["intrusionSet"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["intrusionSet"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -246,6 +252,22 @@ class IntrusionSet:
             )
             return None
 
+    """
+        Read many Intrusion-Set objects
+
+        :param ids: the ids of the Intrusion-Set objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Intrusion-Set objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "intrusionSet", "Intrusion-Set", self.properties, **kwargs
+        )
+
     """
         Create a Intrusion-Set object
 
@@ -36,6 +36,7 @@ class KillChainPhase:
         :param filters: the filters to apply
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Kill-Chain-Phase objects
     """
 
@@ -46,6 +47,7 @@ class KillChainPhase:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -54,15 +56,16 @@ class KillChainPhase:
         self.opencti.log(
             "info", "Listing Kill-Chain-Phase with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query KillChainPhases($filters: [KillChainPhasesFiltering], $first: Int, $after: ID, $orderBy: KillChainPhasesOrdering, $orderMode: OrderingMode) {
                 killChainPhases(filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -74,7 +77,7 @@ class KillChainPhase:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -87,7 +90,7 @@ class KillChainPhase:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["killChainPhases"], with_pagination
+            result["data"]["killChainPhases"], with_pagination, selection=selection
         )
 
     """
@@ -95,31 +98,34 @@ class KillChainPhase:
 
         :param id: the id of the Kill-Chain-Phase
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Kill-Chain-Phase object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Kill-Chain-Phase {" + id + "}.")
-            query = (
+            selection = self.opencti.select(self.properties, projection=projection)
+            query = self.opencti.compile_query(
                 """
                 query KillChainPhase($id: String!) {
                     killChainPhase(id: $id) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["killChainPhase"]
+                result["data"]["killChainPhase"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -130,6 +136,21 @@ class KillChainPhase:
             )
             return None
 
+    """
+        Read many Kill-Chain-Phase objects
+
+        :param ids: the ids of the Kill-Chain-Phase objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Kill-Chain-Phase objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "killChainPhase", "Kill-Chain-Phase", self.properties, **kwargs
+        )
+
     """
         Create a Kill-Chain-Phase object
 
@@ -138,43 +159,29 @@ class KillChainPhase:
     """
 
     def create(self, **kwargs):
-        stix_id = kwargs.get("stix_id", None)
-        created = kwargs.get("created", None)
-        modified = kwargs.get("modified", None)
         kill_chain_name = kwargs.get("kill_chain_name", None)
         phase_name = kwargs.get("phase_name", None)
-        x_opencti_order = kwargs.get("x_opencti_order", 0)
-        update = kwargs.get("update", False)
 
         if kill_chain_name is not None and phase_name is not None:
             self.opencti.log("info", "Creating Kill-Chain-Phase {" + phase_name + "}.")
-            query = (
+            selection = self.properties
+            query = self.opencti.compile_query(
                 """
                 mutation KillChainPhaseAdd($input: KillChainPhaseAddInput) {
                     killChainPhaseAdd(input: $input) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(
                 query,
-                {
-                    "input": {
-                        "stix_id": stix_id,
-                        "created": created,
-                        "modified": modified,
-                        "kill_chain_name": kill_chain_name,
-                        "phase_name": phase_name,
-                        "x_opencti_order": x_opencti_order,
-                        "update": update,
-                    }
-                },
+                {"input": self.generate_input(**kwargs)},
             )
             return self.opencti.process_multiple_fields(
-                result["data"]["killChainPhaseAdd"]
+                result["data"]["killChainPhaseAdd"], selection=selection
             )
         else:
             self.opencti.log(
@@ -182,6 +189,60 @@ class KillChainPhase:
                 "[opencti_kill_chain_phase] Missing parameters: kill_chain_name and phase_name",
             )
 
+    """
+        Create many Kill-Chain-Phase objects
+
+        :param kill_chain_phases: list of dict of the `create` arguments of each Kill-Chain-Phase
+        :param batch_size: number of Kill-Chain-Phase objects created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": Kill-Chain-Phase object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        items = kwargs.get("kill_chain_phases", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        self.opencti.log(
+            "info", "Creating " + str(len(items)) + " Kill-Chain-Phase objects in bulk."
+        )
+        selection = self.properties
+        results = self.opencti.query_batch(
+            "mutation",
+            "killChainPhaseAdd",
+            {"input": "KillChainPhaseAddInput"},
+            [{"input": self.generate_input(**item)} for item in items],
+            selection,
+            batch_size,
+            max_workers,
+        )
+        return [
+            {
+                "result": self.opencti.process_multiple_fields(
+                    data, selection=selection
+                ),
+                "error": error,
+            }
+            for data, error in results
+        ]
+
+    """
+        Generate the input of a Kill-Chain-Phase creation
+
+        :return KillChainPhaseAddInput dict
+    """
+
+    def generate_input(self, **kwargs):
+        return {
+            "stix_id": kwargs.get("stix_id", None),
+            "created": kwargs.get("created", None),
+            "modified": kwargs.get("modified", None),
+            "kill_chain_name": kwargs.get("kill_chain_name", None),
+            "phase_name": kwargs.get("phase_name", None),
+            "x_opencti_order": kwargs.get("x_opencti_order", 0),
+            "update": kwargs.get("update", False),
+        }
+
     """
         Update a Kill chain object field
 
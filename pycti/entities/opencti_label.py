@@ -31,6 +31,7 @@ class Label:
         :param filters: the filters to apply
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Label objects
     """
 
@@ -41,6 +42,7 @@ class Label:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -49,15 +51,16 @@ class Label:
         self.opencti.log(
             "info", "Listing Labels with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Labels($filters: [LabelsFiltering], $first: Int, $after: ID, $orderBy: LabelsOrdering, $orderMode: OrderingMode) {
                 labels(filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -69,7 +72,7 @@ class Label:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -81,36 +84,43 @@ class Label:
                 "orderMode": order_mode,
             },
         )
-        return self.opencti.process_multiple(result["data"]["labels"], with_pagination)
+        return self.opencti.process_multiple(
+            result["data"]["labels"], with_pagination, selection=selection
+        )
 
     """
         Read a Label object
 
         :param id: the id of the Label
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Label object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading label {" + id + "}.")
-            query = (
+            selection = self.opencti.select(self.properties, projection=projection)
+            query = self.opencti.compile_query(
                 """
                 query Label($id: String!) {
                     label(id: $id) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["label"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["label"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -121,6 +131,21 @@ class Label:
             )
             return None
 
+    """
+        Read many Label objects
+
+        :param ids: the ids of the Label objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Label objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "label", "label", self.properties, **kwargs
+        )
+
     """
         Create a Label object
 
@@ -130,44 +155,87 @@ class Label:
     """
 
     def create(self, **kwargs):
-        stix_id = kwargs.get("stix_id", None)
         value = kwargs.get("value", None)
-        color = kwargs.get("color", None)
-        x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
-        update = kwargs.get("update", False)
 
         if value is not None:
             self.opencti.log("info", "Creating Label {" + value + "}.")
-            query = (
+            selection = self.properties
+            query = self.opencti.compile_query(
                 """
                 mutation LabelAdd($input: LabelAddInput) {
                     labelAdd(input: $input) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(
                 query,
-                {
-                    "input": {
-                        "stix_id": stix_id,
-                        "value": value,
-                        "color": color,
-                        "x_opencti_stix_ids": x_opencti_stix_ids,
-                        "update": update,
-                    }
-                },
+                {"input": self.generate_input(**kwargs)},
+            )
+            return self.opencti.process_multiple_fields(
+                result["data"]["labelAdd"], selection=selection
             )
-            return self.opencti.process_multiple_fields(result["data"]["labelAdd"])
         else:
             self.opencti.log(
                 "error",
                 "[opencti_label] Missing parameters: value",
             )
 
+    """
+        Create many Label objects
+
+        :param labels: list of dict of the `create` arguments of each Label
+        :param batch_size: number of Label objects created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": Label object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        items = kwargs.get("labels", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        self.opencti.log(
+            "info", "Creating " + str(len(items)) + " Label objects in bulk."
+        )
+        selection = self.properties
+        results = self.opencti.query_batch(
+            "mutation",
+            "labelAdd",
+            {"input": "LabelAddInput"},
+            [{"input": self.generate_input(**item)} for item in items],
+            selection,
+            batch_size,
+            max_workers,
+        )
+        return [
+            {
+                "result": self.opencti.process_multiple_fields(
+                    data, selection=selection
+                ),
+                "error": error,
+            }
+            for data, error in results
+        ]
+
+    """
+        Generate the input of a Label creation
+
+        :return LabelAddInput dict
+    """
+
+    def generate_input(self, **kwargs):
+        return {
+            "stix_id": kwargs.get("stix_id", None),
+            "value": kwargs.get("value", None),
+            "color": kwargs.get("color", None),
+            "x_opencti_stix_ids": kwargs.get("x_opencti_stix_ids", None),
+            "update": kwargs.get("update", False),
+        }
+
     """
         Update a Label object field
 
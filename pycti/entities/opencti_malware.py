@@ -162,6 +162,7 @@ class Malware:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Malware objects
     """
 
@@ -173,6 +174,7 @@ class Malware:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -181,15 +183,16 @@ class Malware:
         self.opencti.log(
             "info", "Listing Malwares with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Malwares($filters: [MalwaresFiltering], $search: String, $first: Int, $after: ID, $orderBy: MalwaresOrdering, $orderMode: OrderingMode) {
                 malwares(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -201,7 +204,7 @@ class Malware:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -217,7 +220,9 @@ class Malware:
 
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["malwares"])
+            data = self.opencti.process_multiple(
+                result["data"]["malwares"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["malwares"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["malwares"]["pageInfo"]["endCursor"]
@@ -233,12 +238,14 @@ class Malware:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["malwares"])
+                data = self.opencti.process_multiple(
+                    result["data"]["malwares"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["malwares"], with_pagination
+                result["data"]["malwares"], with_pagination, selection=selection
             )
 
     """
@@ -246,6 +253,7 @@ class Malware:
 
         :param id: the id of the Malware
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Malware object
     """
 
@@ -253,27 +261,29 @@ class Malware:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Malware {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Malware($id: String!) {
                     malware(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["malware"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["malware"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -284,6 +294,22 @@ class Malware:
             )
             return None
 
+    """
+        Read many Malware objects
+
+        :param ids: the ids of the Malware objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Malware objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "malware", "Malware", self.properties, **kwargs
+        )
+
     """
         Create a Malware object
 
@@ -1,6 +1,7 @@
 # coding: utf-8
 
 import json
+import threading
 import uuid
 
 from stix2.canonicalization.Canonicalize import canonicalize
@@ -23,6 +24,10 @@ class MarkingDefinition:
             created_at
             updated_at
         """
+        # The index is copied on write, readers iterate it without lock
+        self.index = None
+        self.allowed_sets = {}
+        self.lock = threading.Lock()
 
     @staticmethod
     def generate_id(definition, definition_type):
@@ -37,6 +42,7 @@ class MarkingDefinition:
         :param filters: the filters to apply
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Marking-Definition objects
     """
 
@@ -47,6 +53,7 @@ class MarkingDefinition:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -56,15 +63,16 @@ class MarkingDefinition:
             "info",
             "Listing Marking-Definitions with filters " + json.dumps(filters) + ".",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query MarkingDefinitions($filters: [MarkingDefinitionsFiltering], $first: Int, $after: ID, $orderBy: MarkingDefinitionsOrdering, $orderMode: OrderingMode) {
                 markingDefinitions(filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -76,7 +84,7 @@ class MarkingDefinition:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -89,7 +97,7 @@ class MarkingDefinition:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["markingDefinitions"], with_pagination
+            result["data"]["markingDefinitions"], with_pagination, selection=selection
         )
 
     """
@@ -97,31 +105,34 @@ class MarkingDefinition:
 
         :param id: the id of the Marking-Definition
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Marking-Definition object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Marking-Definition {" + id + "}.")
-            query = (
+            selection = self.opencti.select(self.properties, projection=projection)
+            query = self.opencti.compile_query(
                 """
                 query MarkingDefinition($id: String!) {
                     markingDefinition(id: $id) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["markingDefinition"]
+                result["data"]["markingDefinition"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -133,6 +144,124 @@ class MarkingDefinition:
             )
             return None
 
+    """
+        Get the index of the Marking-Definition objects, loaded once per client
+
+        :param refresh: (optional) reload the Marking-Definition objects
+        :return dict of Marking-Definition objects by id and standard id
+    """
+
+    def get_index(self, **kwargs):
+        refresh = kwargs.get("refresh", False)
+        index = self.index
+        if index is None or refresh:
+            index = {}
+            after = None
+            while True:
+                result = self.list(first=500, after=after, withPagination=True)
+                for marking_definition in result["entities"]:
+                    index[marking_definition["id"]] = marking_definition
+                    index[marking_definition["standard_id"]] = marking_definition
+                if not result["pagination"]["hasNextPage"]:
+                    break
+                after = result["pagination"]["endCursor"]
+            with self.lock:
+                self.index = index
+                self.allowed_sets = {}
+        return index
+
+    """
+        Read a Marking-Definition object from the index, or from the API if not indexed
+
+        :param id: the id or standard id of the Marking-Definition
+        :return Marking-Definition object
+    """
+
+    def read_indexed(self, **kwargs):
+        id = kwargs.get("id", None)
+        marking_definition = self.get_index().get(id)
+        if marking_definition is None:
+            marking_definition = self.read(id=id)
+            if marking_definition is not None:
+                with self.lock:
+                    index = dict(self.index)
+                    index[marking_definition["id"]] = marking_definition
+                    index[marking_definition["standard_id"]] = marking_definition
+                    self.index = index
+                    self.allowed_sets = {}
+        return marking_definition
+
+    """
+        Find a Marking-Definition object by definition type and definition in the index
+
+        :param definition_type: the definition type (e.g. TLP)
+        :param definition: the definition (e.g. TLP:WHITE)
+        :return Marking-Definition object
+    """
+
+    def find_indexed(self, **kwargs):
+        definition_type = kwargs.get("definition_type", None)
+        definition = kwargs.get("definition", None)
+        for marking_definition in self.get_index().values():
+            if (
+                marking_definition["definition_type"] == definition_type
+                and marking_definition["definition"] == definition
+            ):
+                return marking_definition
+        return self.read(
+            filters=[
+                {"key": "definition_type", "values": [definition_type]},
+                {"key": "definition", "values": [definition]},
+            ]
+        )
+
+    """
+        Get the ids allowed by a max Marking-Definition, computed once per max marking
+
+        :param max_marking_definition: the max Marking-Definition object
+        :return tuple of (ids of the same definition type, ids allowed) as sets of ids and standard ids
+    """
+
+    def get_allowed_sets(self, **kwargs):
+        max_marking_definition = kwargs.get("max_marking_definition", None)
+        index = self.get_index()
+        allowed_sets = self.allowed_sets.get(max_marking_definition["id"])
+        if allowed_sets is None:
+            typed_ids = set()
+            allowed_ids = set()
+            for key, marking_definition in index.items():
+                if (
+                    marking_definition["definition_type"]
+                    == max_marking_definition["definition_type"]
+                ):
+                    typed_ids.add(key)
+                    if (
+                        marking_definition["x_opencti_order"]
+                        <= max_marking_definition["x_opencti_order"]
+                    ):
+                        allowed_ids.add(key)
+            allowed_sets = (frozenset(typed_ids), frozenset(allowed_ids))
+            with self.lock:
+                # Not cached if computed from a replaced index
+                if self.index is index:
+                    self.allowed_sets[max_marking_definition["id"]] = allowed_sets
+        return allowed_sets
+
+    """
+        Read many Marking-Definition objects
+
+        :param ids: the ids of the Marking-Definition objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Marking-Definition objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "markingDefinition", "Marking-Definition", self.properties, **kwargs
+        )
+
     """
         Create a Marking-Definition object
 
@@ -153,16 +282,17 @@ class MarkingDefinition:
         update = kwargs.get("update", False)
 
         if definition is not None and definition_type is not None:
-            query = (
+            selection = self.properties
+            query = self.opencti.compile_query(
                 """
                 mutation MarkingDefinitionAdd($input: MarkingDefinitionAddInput) {
                     markingDefinitionAdd(input: $input) {
-                        """
-                + self.properties
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(
                 query,
@@ -181,7 +311,7 @@ class MarkingDefinition:
                 },
             )
             return self.opencti.process_multiple_fields(
-                result["data"]["markingDefinitionAdd"]
+                result["data"]["markingDefinitionAdd"], selection=selection
             )
         else:
             self.opencti.log(
@@ -238,6 +238,7 @@ class Report:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Report objects
     """
 
@@ -249,6 +250,7 @@ class Report:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -257,15 +259,16 @@ class Report:
         self.opencti.log(
             "info", "Listing Reports with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Reports($filters: [ReportsFiltering], $search: String, $first: Int, $after: ID, $orderBy: ReportsOrdering, $orderMode: OrderingMode) {
                 reports(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -277,7 +280,7 @@ class Report:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -292,7 +295,9 @@ class Report:
         )
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["reports"])
+            data = self.opencti.process_multiple(
+                result["data"]["reports"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["reports"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["reports"]["pageInfo"]["endCursor"]
@@ -308,12 +313,14 @@ class Report:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["reports"])
+                data = self.opencti.process_multiple(
+                    result["data"]["reports"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["reports"], with_pagination
+                result["data"]["reports"], with_pagination, selection=selection
             )
 
     """
@@ -321,6 +328,7 @@ class Report:
 
         :param id: the id of the Report
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Report object
     """
 
@@ -328,32 +336,50 @@ class Report:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Report {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Report($id: String!) {
                     report(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["report"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["report"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
                 return None
 
+    """
+        Read many Report objects
+
+        :param ids: the ids of the Report objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Report objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "report", "Report", self.properties, **kwargs
+        )
+
     """
         Read a Report object by stix_id or name
 
@@ -368,19 +394,48 @@ class Report:
         name = kwargs.get("name", None)
         published = kwargs.get("published", None)
         custom_attributes = kwargs.get("customAttributes", None)
-        object_result = None
+        declarations = []
+        calls = []
+        variables = {}
+        selection = self.opencti.select(self.properties, custom_attributes)
         if stix_id is not None:
-            object_result = self.read(id=stix_id, customAttributes=custom_attributes)
-        if object_result is None and name is not None and published is not None:
-            published_final = parse(published).strftime("%Y-%m-%d")
-            object_result = self.read(
-                filters=[
-                    {"key": "name", "values": [name]},
-                    {"key": "published_day", "values": [published_final]},
-                ],
-                customAttributes=custom_attributes,
+            declarations.append("$id: String!")
+            calls.append("byId: report(id: $id) { " + selection + " }")
+            variables["id"] = stix_id
+        if name is not None and published is not None:
+            declarations.append("$filters: [ReportsFiltering]")
+            calls.append(
+                "byName: reports(filters: $filters, first: 1) { edges { node { "
+                + selection
+                + " } } }"
+            )
+            variables["filters"] = [
+                {"key": "name", "values": [name]},
+                {
+                    "key": "published_day",
+                    "values": [parse(published).strftime("%Y-%m-%d")],
+                },
+            ]
+        if len(calls) == 0:
+            return None
+        # Both lookups are sent in a single request
+        query = self.opencti.compile_query(
+            "query ReportResolve(" + ", ".join(declarations) + ") { ",
+            " ".join(calls),
+            " }",
+        )
+        result = self.opencti.query(query, variables)["data"]
+        if result.get("byId") is not None:
+            return self.opencti.process_multiple_fields(
+                result["byId"], selection=selection
+            )
+        if result.get("byName") is not None:
+            reports = self.opencti.process_multiple(
+                result["byName"], selection=selection
             )
-        return object_result
+            if len(reports) > 0:
+                return reports[0]
+        return None
 
     """
         Check if a report already contains a thing (Stix Object or Stix Relationship)
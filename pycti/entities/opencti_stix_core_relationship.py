@@ -321,6 +321,7 @@ class StixCoreRelationship:
         :param stopTimeStop: the stop_time date stop filter
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of stix_core_relationship objects
     """
 
@@ -341,6 +342,7 @@ class StixCoreRelationship:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -356,15 +358,16 @@ class StixCoreRelationship:
             + str(to_id)
             + "}",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
                 query StixCoreRelationships($elementId: [String], $fromId: [String], $fromTypes: [String], $toId: [String], $toTypes: [String], $relationship_type: [String], $startTimeStart: DateTime, $startTimeStop: DateTime, $stopTimeStart: DateTime, $stopTimeStop: DateTime, $filters: [StixCoreRelationshipsFiltering], $first: Int, $after: ID, $orderBy: StixCoreRelationshipsOrdering, $orderMode: OrderingMode) {
                     stixCoreRelationships(elementId: $elementId, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, relationship_type: $relationship_type, startTimeStart: $startTimeStart, startTimeStop: $startTimeStop, stopTimeStart: $stopTimeStart, stopTimeStop: $stopTimeStop, filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                         edges {
                             node {
-                                """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                                """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -376,7 +379,7 @@ class StixCoreRelationship:
                     }
                 }
             }
-         """
+         """,
         )
         result = self.opencti.query(
             query,
@@ -401,7 +404,7 @@ class StixCoreRelationship:
         if get_all:
             final_data = []
             data = self.opencti.process_multiple(
-                result["data"]["stixCoreRelationships"]
+                result["data"]["stixCoreRelationships"], selection=selection
             )
             final_data = final_data + data
             while result["data"]["stixCoreRelationships"]["pageInfo"]["hasNextPage"]:
@@ -428,13 +431,15 @@ class StixCoreRelationship:
                     },
                 )
                 data = self.opencti.process_multiple(
-                    result["data"]["stixCoreRelationships"]
+                    result["data"]["stixCoreRelationships"], selection=selection
                 )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["stixCoreRelationships"], with_pagination
+                result["data"]["stixCoreRelationships"],
+                with_pagination,
+                selection=selection,
             )
 
     """
@@ -449,6 +454,7 @@ class StixCoreRelationship:
         :param startTimeStop: the start_time date stop filter
         :param stopTimeStart: the stop_time date start filter
         :param stopTimeStop: the stop_time date stop filter
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return stix_core_relationship object
     """
 
@@ -463,26 +469,26 @@ class StixCoreRelationship:
         stop_time_start = kwargs.get("stopTimeStart", None)
         stop_time_stop = kwargs.get("stopTimeStop", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading stix_core_relationship {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                     query StixCoreRelationship($id: String!) {
                         stixCoreRelationship(id: $id) {
-                            """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                            """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixCoreRelationship"]
+                result["data"]["stixCoreRelationship"], selection=selection
             )
         elif from_id is not None and to_id is not None:
             result = self.list(
@@ -494,6 +500,7 @@ class StixCoreRelationship:
                 startTimeStop=start_time_stop,
                 stopTimeStart=stop_time_start,
                 stopTimeStop=stop_time_stop,
+                projection=projection,
             )
             if len(result) > 0:
                 return result[0]
@@ -503,6 +510,22 @@ class StixCoreRelationship:
             self.opencti.log("error", "Missing parameters: id or from_id and to_id")
             return None
 
+    """
+        Read many stix_core_relationship objects
+
+        :param ids: the ids of the stix_core_relationship objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of stix_core_relationship objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixCoreRelationship", "stix_core_relationship", self.properties, **kwargs
+        )
+
     """
         Create a stix_core_relationship object
 
@@ -511,33 +534,15 @@ class StixCoreRelationship:
     """
 
     def create(self, **kwargs):
-        from_id = kwargs.get("fromId", None)
-        to_id = kwargs.get("toId", None)
-        stix_id = kwargs.get("stix_id", None)
-        relationship_type = kwargs.get("relationship_type", None)
-        description = kwargs.get("description", None)
-        start_time = kwargs.get("start_time", None)
-        stop_time = kwargs.get("stop_time", None)
-        revoked = kwargs.get("revoked", None)
-        confidence = kwargs.get("confidence", None)
-        lang = kwargs.get("lang", None)
-        created = kwargs.get("created", None)
-        modified = kwargs.get("modified", None)
-        created_by = kwargs.get("createdBy", None)
-        object_marking = kwargs.get("objectMarking", None)
-        object_label = kwargs.get("objectLabel", None)
-        external_references = kwargs.get("externalReferences", None)
-        kill_chain_phases = kwargs.get("killChainPhases", None)
-        update = kwargs.get("update", False)
-
+        relationship_input = self.generate_input(**kwargs)
         self.opencti.log(
             "info",
             "Creating stix_core_relationship '"
-            + relationship_type
+            + relationship_input["relationship_type"]
             + "' {"
-            + from_id
+            + relationship_input["fromId"]
             + ", "
-            + to_id
+            + relationship_input["toId"]
             + "}.",
         )
         query = """
@@ -550,35 +555,92 @@ class StixCoreRelationship:
                     }
                 }
             """
-        result = self.opencti.query(
-            query,
-            {
-                "input": {
-                    "fromId": from_id,
-                    "toId": to_id,
-                    "stix_id": stix_id,
-                    "relationship_type": relationship_type,
-                    "description": description,
-                    "start_time": start_time,
-                    "stop_time": stop_time,
-                    "revoked": revoked,
-                    "confidence": confidence,
-                    "lang": lang,
-                    "created": created,
-                    "modified": modified,
-                    "createdBy": created_by,
-                    "objectMarking": object_marking,
-                    "objectLabel": object_label,
-                    "externalReferences": external_references,
-                    "killChainPhases": kill_chain_phases,
-                    "update": update,
-                }
-            },
-        )
+        result = self.opencti.query(query, {"input": relationship_input})
         return self.opencti.process_multiple_fields(
             result["data"]["stixCoreRelationshipAdd"]
         )
 
+    """
+        Create many stix_core_relationship objects
+
+        :param relationships: list of (fromId, toId, relationship_type, attributes) tuples,
+            attributes being a dict of the other `create` arguments
+        :param batch_size: number of relationships created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": stix_core_relationship object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        relationships = kwargs.get("relationships", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        inputs = []
+        for from_id, to_id, relationship_type, attributes in relationships:
+            inputs.append(
+                {
+                    "input": self.generate_input(
+                        fromId=from_id,
+                        toId=to_id,
+                        relationship_type=relationship_type,
+                        **(attributes if attributes is not None else {}),
+                    )
+                }
+            )
+        self.opencti.log(
+            "info",
+            "Creating " + str(len(inputs)) + " stix_core_relationships in bulk.",
+        )
+        results = self.opencti.query_batch(
+            "mutation",
+            "stixCoreRelationshipAdd",
+            {"input": "StixCoreRelationshipAddInput!"},
+            inputs,
+            """
+                id
+                standard_id
+                entity_type
+                parent_types
+            """,
+            batch_size,
+            max_workers,
+        )
+        return [
+            {"result": self.opencti.process_multiple_fields(data), "error": error}
+            for data, error in results
+        ]
+
+    """
+        Generate the input of a stix_core_relationship creation
+
+        :param fromId: the id of the source entity of the relation
+        :param toId: the id of the target entity of the relation
+        :param relationship_type: the relation type
+        :return StixCoreRelationshipAddInput dict
+    """
+
+    def generate_input(self, **kwargs):
+        return {
+            "fromId": kwargs.get("fromId", None),
+            "toId": kwargs.get("toId", None),
+            "stix_id": kwargs.get("stix_id", None),
+            "relationship_type": kwargs.get("relationship_type", None),
+            "description": kwargs.get("description", None),
+            "start_time": kwargs.get("start_time", None),
+            "stop_time": kwargs.get("stop_time", None),
+            "revoked": kwargs.get("revoked", None),
+            "confidence": kwargs.get("confidence", None),
+            "lang": kwargs.get("lang", None),
+            "created": kwargs.get("created", None),
+            "modified": kwargs.get("modified", None),
+            "createdBy": kwargs.get("createdBy", None),
+            "objectMarking": kwargs.get("objectMarking", None),
+            "objectLabel": kwargs.get("objectLabel", None),
+            "externalReferences": kwargs.get("externalReferences", None),
+            "killChainPhases": kwargs.get("killChainPhases", None),
+            "update": kwargs.get("update", False),
+        }
+
     """
         Update a stix_core_relationship object field
 
@@ -1093,6 +1155,19 @@ class StixCoreRelationship:
     """
 
     def import_from_stix2(self, **kwargs):
+        arguments = self.prepare_import_from_stix2(**kwargs)
+        if arguments is not None:
+            return self.create(**arguments)
+        return None
+
+    """
+        Prepare the creation arguments of a stix_core_relationship from a STIX2 relationship
+
+        :param stixRelation: the Stix-Relation object
+        :return dict of `create` arguments
+    """
+
+    def prepare_import_from_stix2(self, **kwargs):
         stix_relation = kwargs.get("stixRelation", None)
         extras = kwargs.get("extras", {})
         update = kwargs.get("update", False)
@@ -1100,7 +1175,7 @@ class StixCoreRelationship:
         if stix_relation is not None:
             source_ref = stix_relation["source_ref"]
             target_ref = stix_relation["target_ref"]
-            return self.create(
+            return dict(
                 fromId=source_ref,
                 toId=target_ref,
                 stix_id=stix_relation["id"],
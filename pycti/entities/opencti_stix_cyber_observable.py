@@ -308,6 +308,7 @@ class StixCyberObservable:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of StixCyberObservable objects
     """
 
@@ -320,6 +321,7 @@ class StixCyberObservable:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
 
@@ -330,15 +332,16 @@ class StixCyberObservable:
             "info",
             "Listing StixCyberObservables with filters " + json.dumps(filters) + ".",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
                 query StixCyberObservables($types: [String], $filters: [StixCyberObservablesFiltering], $search: String, $first: Int, $after: ID, $orderBy: StixCyberObservablesOrdering, $orderMode: OrderingMode) {
                     stixCyberObservables(types: $types, filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                         edges {
                             node {
-                                """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                                """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -350,7 +353,7 @@ class StixCyberObservable:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -367,7 +370,9 @@ class StixCyberObservable:
 
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["stixCyberObservables"])
+            data = self.opencti.process_multiple(
+                result["data"]["stixCyberObservables"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["stixCyberObservables"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["stixCyberObservables"]["pageInfo"]["endCursor"]
@@ -385,13 +390,15 @@ class StixCyberObservable:
                     },
                 )
                 data = self.opencti.process_multiple(
-                    result["data"]["stixCyberObservables"]
+                    result["data"]["stixCyberObservables"], selection=selection
                 )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["stixCyberObservables"], with_pagination
+                result["data"]["stixCyberObservables"],
+                with_pagination,
+                selection=selection,
             )
 
     """
@@ -399,6 +406,7 @@ class StixCyberObservable:
 
         :param id: the id of the StixCyberObservable
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return StixCyberObservable object
     """
 
@@ -406,29 +414,33 @@ class StixCyberObservable:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading StixCyberObservable {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                     query StixCyberObservable($id: String!) {
                         stixCyberObservable(id: $id) {
-                            """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                            """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservable"]
+                result["data"]["stixCyberObservable"], selection=selection
             )
         elif filters is not None:
-            result = self.list(filters=filters, customAttributes=custom_attributes)
+            result = self.list(
+                filters=filters,
+                customAttributes=custom_attributes,
+                projection=projection,
+            )
             if len(result) > 0:
                 return result[0]
             else:
@@ -440,6 +452,22 @@ class StixCyberObservable:
             )
             return None
 
+    """
+        Read many StixCyberObservable objects
+
+        :param ids: the ids of the StixCyberObservable objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of StixCyberObservable objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixCyberObservable", "StixCyberObservable", self.properties, **kwargs
+        )
+
     """
         Upload a file in this Observable
 
@@ -499,6 +527,222 @@ class StixCyberObservable:
     """
 
     def create(self, **kwargs):
+        input_variables = self.generate_input(**kwargs)
+        if input_variables is None:
+            return None
+        query = """
+            mutation StixCyberObservableAdd(
+                $type: String!,
+                $stix_id: String,
+                $x_opencti_score: Int,
+                $x_opencti_description: String,
+                $createIndicator: Boolean,
+                $createdBy: String,
+                $objectMarking: [String],
+                $objectLabel: [String],
+                $externalReferences: [String],
+                $AutonomousSystem: AutonomousSystemAddInput,
+                $Directory: DirectoryAddInput,
+                $DomainName: DomainNameAddInput,
+                $EmailAddr: EmailAddrAddInput,
+                $EmailMessage: EmailMessageAddInput,
+                $EmailMimePartType: EmailMimePartTypeAddInput,
+                $Artifact: ArtifactAddInput,
+                $StixFile: StixFileAddInput,
+                $X509Certificate: X509CertificateAddInput,
+                $IPv4Addr: IPv4AddrAddInput,
+                $IPv6Addr: IPv6AddrAddInput,
+                $MacAddr: MacAddrAddInput,
+                $Mutex: MutexAddInput,
+                $NetworkTraffic: NetworkTrafficAddInput,
+                $Process: ProcessAddInput,
+                $Software: SoftwareAddInput,
+                $Url: UrlAddInput,
+                $UserAccount: UserAccountAddInput,
+                $WindowsRegistryKey: WindowsRegistryKeyAddInput,
+                $WindowsRegistryValueType: WindowsRegistryValueTypeAddInput,
+                $CryptographicKey: CryptographicKeyAddInput,
+                $CryptocurrencyWallet: CryptocurrencyWalletAddInput,
+                $Hostname: HostnameAddInput
+                $Text: TextAddInput,
+                $UserAgent: UserAgentAddInput
+            ) {
+                stixCyberObservableAdd(
+                    type: $type,
+                    stix_id: $stix_id,
+                    x_opencti_score: $x_opencti_score,
+                    x_opencti_description: $x_opencti_description,
+                    createIndicator: $createIndicator,
+                    createdBy: $createdBy,
+                    objectMarking: $objectMarking,
+                    objectLabel: $objectLabel,
+                    externalReferences: $externalReferences,
+                    AutonomousSystem: $AutonomousSystem,
+                    Directory: $Directory,
+                    DomainName: $DomainName,
+                    EmailAddr: $EmailAddr,
+                    EmailMessage: $EmailMessage,
+                    EmailMimePartType: $EmailMimePartType,
+                    Artifact: $Artifact,
+                    StixFile: $StixFile,
+                    X509Certificate: $X509Certificate,
+                    IPv4Addr: $IPv4Addr,
+                    IPv6Addr: $IPv6Addr,
+                    MacAddr: $MacAddr,
+                    Mutex: $Mutex,
+                    NetworkTraffic: $NetworkTraffic,
+                    Process: $Process,
+                    Software: $Software,
+                    Url: $Url,
+                    UserAccount: $UserAccount,
+                    WindowsRegistryKey: $WindowsRegistryKey,
+                    WindowsRegistryValueType: $WindowsRegistryValueType,
+                    CryptographicKey: $CryptographicKey,
+                    CryptocurrencyWallet: $CryptocurrencyWallet,
+                    Hostname: $Hostname,
+                    Text: $Text,
+                    UserAgent: $UserAgent
+                ) {
+                    id
+                    standard_id
+                    entity_type
+                    parent_types
+                    indicators {
+                        edges {
+                            node {
+                                id
+                                pattern
+                                pattern_type
+                            }
+                        }
+                    }
+                }
+            }
+        """
+        result = self.opencti.query(query, input_variables)
+        return self.opencti.process_multiple_fields(
+            result["data"]["stixCyberObservableAdd"]
+        )
+
+    """
+        Create many Stix-Observable objects
+
+        :param observables: list of observables, each one being a dict of `create` arguments
+        :param batch_size: number of observables created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": Stix-Observable object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        observables = kwargs.get("observables", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        inputs = [
+            self.generate_input(**observable)
+            for observable in (
+                observables if isinstance(observables, list) else list(observables)
+            )
+        ]
+        self.opencti.log(
+            "info",
+            "Creating " + str(len(inputs)) + " Stix-Cyber-Observables in bulk.",
+        )
+        argument_types = {
+            "type": "String!",
+            "stix_id": "String",
+            "x_opencti_score": "Int",
+            "x_opencti_description": "String",
+            "createIndicator": "Boolean",
+            "createdBy": "String",
+            "objectMarking": "[String]",
+            "objectLabel": "[String]",
+            "externalReferences": "[String]",
+        }
+        for observable_type in [
+            "AutonomousSystem",
+            "Directory",
+            "DomainName",
+            "EmailAddr",
+            "EmailMessage",
+            "EmailMimePartType",
+            "Artifact",
+            "StixFile",
+            "X509Certificate",
+            "IPv4Addr",
+            "IPv6Addr",
+            "MacAddr",
+            "Mutex",
+            "NetworkTraffic",
+            "Process",
+            "Software",
+            "Url",
+            "UserAccount",
+            "WindowsRegistryKey",
+            "WindowsRegistryValueType",
+            "CryptographicKey",
+            "CryptocurrencyWallet",
+            "Hostname",
+            "Text",
+            "UserAgent",
+        ]:
+            argument_types[observable_type] = observable_type + "AddInput"
+        selection = """
+            id
+            standard_id
+            entity_type
+            parent_types
+            indicators {
+                edges {
+                    node {
+                        id
+                        pattern
+                        pattern_type
+                    }
+                }
+            }
+        """
+        results = iter(
+            self.opencti.query_batch(
+                "mutation",
+                "stixCyberObservableAdd",
+                argument_types,
+                [input_variables for input_variables in inputs if input_variables],
+                selection,
+                batch_size,
+                max_workers,
+            )
+        )
+        final_results = []
+        for input_variables in inputs:
+            if input_variables is None:
+                final_results.append(
+                    {
+                        "result": None,
+                        "error": {
+                            "name": "MissingType",
+                            "message": "Missing parameters: type",
+                        },
+                    }
+                )
+            else:
+                data, error = next(results)
+                final_results.append(
+                    {
+                        "result": self.opencti.process_multiple_fields(data),
+                        "error": error,
+                    }
+                )
+        return final_results
+
+    """
+        Generate the input variables of a Stix-Observable creation
+
+        :param observableData: the data of the observable (STIX2 structure)
+        :return dict of input variables or None if the type is missing
+    """
+
+    def generate_input(self, **kwargs):
         observable_data = kwargs.get("observableData", {})
         simple_observable_id = kwargs.get("simple_observable_id", None)
         simple_observable_key = kwargs.get("simple_observable_key", None)
@@ -619,95 +863,6 @@ class StixCyberObservable:
                 "externalReferences": external_references,
                 "update": update,
             }
-            query = """
-                mutation StixCyberObservableAdd(
-                    $type: String!,
-                    $stix_id: String,
-                    $x_opencti_score: Int,
-                    $x_opencti_description: String,
-                    $createIndicator: Boolean,
-                    $createdBy: String,
-                    $objectMarking: [String],
-                    $objectLabel: [String],
-                    $externalReferences: [String],
-                    $AutonomousSystem: AutonomousSystemAddInput,
-                    $Directory: DirectoryAddInput,
-                    $DomainName: DomainNameAddInput,
-                    $EmailAddr: EmailAddrAddInput,
-                    $EmailMessage: EmailMessageAddInput,
-                    $EmailMimePartType: EmailMimePartTypeAddInput,
-                    $Artifact: ArtifactAddInput,
-                    $StixFile: StixFileAddInput,
-                    $X509Certificate: X509CertificateAddInput,
-                    $IPv4Addr: IPv4AddrAddInput,
-                    $IPv6Addr: IPv6AddrAddInput,
-                    $MacAddr: MacAddrAddInput,
-                    $Mutex: MutexAddInput,
-                    $NetworkTraffic: NetworkTrafficAddInput,
-                    $Process: ProcessAddInput,
-                    $Software: SoftwareAddInput,
-                    $Url: UrlAddInput,
-                    $UserAccount: UserAccountAddInput,
-                    $WindowsRegistryKey: WindowsRegistryKeyAddInput,
-                    $WindowsRegistryValueType: WindowsRegistryValueTypeAddInput,
-                    $CryptographicKey: CryptographicKeyAddInput,
-                    $CryptocurrencyWallet: CryptocurrencyWalletAddInput,
-                    $Hostname: HostnameAddInput
-                    $Text: TextAddInput,
-                    $UserAgent: UserAgentAddInput
-                ) {
-                    stixCyberObservableAdd(
-                        type: $type,
-                        stix_id: $stix_id,
-                        x_opencti_score: $x_opencti_score,
-                        x_opencti_description: $x_opencti_description,
-                        createIndicator: $createIndicator,
-                        createdBy: $createdBy,
-                        objectMarking: $objectMarking,
-                        objectLabel: $objectLabel,
-                        externalReferences: $externalReferences,
-                        AutonomousSystem: $AutonomousSystem,
-                        Directory: $Directory,
-                        DomainName: $DomainName,
-                        EmailAddr: $EmailAddr,
-                        EmailMessage: $EmailMessage,
-                        EmailMimePartType: $EmailMimePartType,
-                        Artifact: $Artifact,
-                        StixFile: $StixFile,
-                        X509Certificate: $X509Certificate,
-                        IPv4Addr: $IPv4Addr,
-                        IPv6Addr: $IPv6Addr,
-                        MacAddr: $MacAddr,
-                        Mutex: $Mutex,
-                        NetworkTraffic: $NetworkTraffic,
-                        Process: $Process,
-                        Software: $Software,
-                        Url: $Url,
-                        UserAccount: $UserAccount,
-                        WindowsRegistryKey: $WindowsRegistryKey,
-                        WindowsRegistryValueType: $WindowsRegistryValueType,
-                        CryptographicKey: $CryptographicKey,
-                        CryptocurrencyWallet: $CryptocurrencyWallet,
-                        Hostname: $Hostname,
-                        Text: $Text,
-                        UserAgent: $UserAgent
-                    ) {
-                        id
-                        standard_id
-                        entity_type
-                        parent_types
-                        indicators {
-                            edges {
-                                node {
-                                    id
-                                    pattern
-                                    pattern_type
-                                }
-                            }
-                        }
-                    }
-                }
-            """
             if type == "Autonomous-System":
                 input_variables["AutonomousSystem"] = {
                     "number": observable_data["number"],
@@ -1070,12 +1225,10 @@ class StixCyberObservable:
                     if "value" in observable_data
                     else None,
                 }
-            result = self.opencti.query(query, input_variables)
-            return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableAdd"]
-            )
+            return input_variables
         else:
             self.opencti.log("error", "Missing parameters: type")
+            return None
 
     """
         Upload an artifact
@@ -1294,26 +1447,26 @@ class StixCyberObservable:
         custom_attributes = kwargs.get("customAttributes", None)
         if id is not None:
             self.opencti.log("info", "Promoting Stix-Observable {" + id + "}.")
-            query = (
+            selection = (
+                custom_attributes if custom_attributes is not None else self.properties
+            )
+            query = self.opencti.compile_query(
                 """
                     mutation StixCyberObservableEdit($id: ID!) {
                         stixCyberObservableEdit(id: $id) {
                             promote {
-                                """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """    
+                                """,
+                selection,
+                """    
                             }                               
                         }
                     }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableEdit"]["promote"]
+                result["data"]["stixCyberObservableEdit"]["promote"],
+                selection=selection,
             )
         else:
             self.opencti.log(
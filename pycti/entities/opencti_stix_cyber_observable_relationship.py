@@ -47,6 +47,7 @@ class StixCyberObservableRelationship:
         :param stopTimeStop: the last_seen date stop filter
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of stix_observable_relationship objects
     """
 
@@ -67,6 +68,7 @@ class StixCyberObservableRelationship:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -82,15 +84,16 @@ class StixCyberObservableRelationship:
             + str(to_id)
             + "}",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query StixCyberObservableRelationships($elementId: String, $fromId: String, $fromTypes: [String], $toId: String, $toTypes: [String], $relationship_type: [String], $startTimeStart: DateTime, $startTimeStop: DateTime, $stopTimeStart: DateTime, $stopTimeStop: DateTime, $filters: [StixCyberObservableRelationshipsFiltering], $first: Int, $after: ID, $orderBy: StixCyberObservableRelationshipsOrdering, $orderMode: OrderingMode) {
                 stixCyberObservableRelationships(elementId: $elementId, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, relationship_type: $relationship_type, startTimeStart: $startTimeStart, startTimeStop: $startTimeStop, stopTimeStart: $stopTimeStart, stopTimeStop: $stopTimeStop, filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -102,7 +105,7 @@ class StixCyberObservableRelationship:
                     }
                 }
             }
-         """
+         """,
         )
 
         result = self.opencti.query(
@@ -126,7 +129,9 @@ class StixCyberObservableRelationship:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["stixCyberObservableRelationships"], with_pagination
+            result["data"]["stixCyberObservableRelationships"],
+            with_pagination,
+            selection=selection,
         )
 
     """
@@ -141,6 +146,7 @@ class StixCyberObservableRelationship:
         :param startTimeStop: the first_seen date stop filter
         :param stopTimeStart: the last_seen date start filter
         :param stopTimeStop: the last_seen date stop filter
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return stix_observable_relationship object
     """
 
@@ -155,28 +161,28 @@ class StixCyberObservableRelationship:
         stop_time_start = kwargs.get("stopTimeStart", None)
         stop_time_stop = kwargs.get("stopTimeStop", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log(
                 "info", "Reading stix_observable_relationship {" + id + "}."
             )
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query StixCyberObservableRelationship($id: String!) {
                     stixCyberObservableRelationship(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableRelationship"]
+                result["data"]["stixCyberObservableRelationship"], selection=selection
             )
         else:
             result = self.list(
@@ -188,12 +194,82 @@ class StixCyberObservableRelationship:
                 startTimeStop=start_time_stop,
                 stopTimeStart=stop_time_start,
                 stopTimeStop=stop_time_stop,
+                projection=projection,
             )
             if len(result) > 0:
                 return result[0]
             else:
                 return None
 
+    """
+        Read many stix_observable_relationship objects
+
+        :param ids: the ids of the stix_observable_relationship objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of stix_observable_relationship objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixCyberObservableRelationship",
+            "stix_observable_relationship",
+            self.properties,
+            **kwargs,
+        )
+
+    """
+        List the stix_observable_relationship objects of many source entities
+
+        :param fromIds: the ids of the source entities of the relations
+        :param first: return the first n rows for every source entity
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batch_size: (optional) number of source entities per request (default 50)
+        :return dict of lists of stix_observable_relationship objects by source entity id
+    """
+
+    def list_many(self, **kwargs):
+        from_ids = kwargs.get("fromIds", None)
+        first = kwargs.get("first", 500)
+        custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+        if from_ids is not None:
+            from_ids = list(dict.fromkeys(from_ids))
+            self.opencti.log(
+                "info",
+                "Listing stix_observable_relationships of "
+                + str(len(from_ids))
+                + " entities.",
+            )
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            results = self.opencti.query_batch(
+                "query",
+                "stixCyberObservableRelationships",
+                {"fromId": "String", "first": "Int"},
+                [{"fromId": from_id, "first": first} for from_id in from_ids],
+                "edges { node { " + selection + " } }",
+                batch_size,
+                max_workers,
+            )
+            relationships = {}
+            for from_id, (data, error) in zip(from_ids, results):
+                if error is not None:
+                    raise ValueError(error)
+                relationships[from_id] = self.opencti.process_multiple(
+                    data, selection=selection
+                )
+            return relationships
+        else:
+            self.opencti.log("error", "Missing parameters: fromIds")
+            return None
+
     """
         Create a stix_observable_relationship object
 
@@ -202,34 +278,15 @@ class StixCyberObservableRelationship:
     """
 
     def create(self, **kwargs):
-        from_id = kwargs.get("fromId", None)
-        to_id = kwargs.get("toId", None)
-        relationship_type = kwargs.get("relationship_type", None)
-        start_time = kwargs.get("start_time", None)
-        stop_time = kwargs.get("stop_time", None)
-        stix_id = kwargs.get("stix_id", None)
-        created = kwargs.get("created", None)
-        modified = kwargs.get("modified", None)
-        created_by = kwargs.get("createdBy", None)
-        object_marking = kwargs.get("objectMarking", None)
-        x_opencti_stix_ids = kwargs.get("x_opencti_stix_ids", None)
-        update = kwargs.get("update", False)
-
-        if relationship_type == "resolves-to":
-            relationship_type = "obs_resolves-to"
-        elif relationship_type == "belongs-to":
-            relationship_type = "obs_belongs-to"
-        elif relationship_type == "content":
-            relationship_type = "obs_content"
-
+        relationship_input = self.generate_input(**kwargs)
         self.opencti.log(
             "info",
             "Creating stix_observable_relationship '"
-            + relationship_type
+            + relationship_input["relationship_type"]
             + "' {"
-            + from_id
+            + relationship_input["fromId"]
             + ", "
-            + to_id
+            + relationship_input["toId"]
             + "}.",
         )
         query = """
@@ -242,29 +299,94 @@ class StixCyberObservableRelationship:
                     }
                 }
                 """
-        result = self.opencti.query(
-            query,
-            {
-                "input": {
-                    "fromId": from_id,
-                    "toId": to_id,
-                    "relationship_type": relationship_type,
-                    "start_time": start_time,
-                    "stop_time": stop_time,
-                    "stix_id": stix_id,
-                    "created": created,
-                    "modified": modified,
-                    "createdBy": created_by,
-                    "objectMarking": object_marking,
-                    "x_opencti_stix_ids": x_opencti_stix_ids,
-                    "update": update,
-                }
-            },
-        )
+        result = self.opencti.query(query, {"input": relationship_input})
         return self.opencti.process_multiple_fields(
             result["data"]["stixCyberObservableRelationshipAdd"]
         )
 
+    """
+        Create many stix_observable_relationship objects
+
+        :param relationships: list of (fromId, toId, relationship_type, attributes) tuples,
+            attributes being a dict of the other `create` arguments
+        :param batch_size: number of relationships created per request
+        :param max_workers: number of concurrent requests
+        :return list of {"result": stix_observable_relationship object, "error": error} in input order
+    """
+
+    def create_bulk(self, **kwargs):
+        relationships = kwargs.get("relationships", [])
+        batch_size = kwargs.get("batch_size", 50)
+        max_workers = kwargs.get("max_workers", 1)
+
+        inputs = []
+        for from_id, to_id, relationship_type, attributes in relationships:
+            inputs.append(
+                {
+                    "input": self.generate_input(
+                        fromId=from_id,
+                        toId=to_id,
+                        relationship_type=relationship_type,
+                        **(attributes if attributes is not None else {}),
+                    )
+                }
+            )
+        self.opencti.log(
+            "info",
+            "Creating " + str(len(inputs)) + " stix_observable_relationships in bulk.",
+        )
+        results = self.opencti.query_batch(
+            "mutation",
+            "stixCyberObservableRelationshipAdd",
+            {"input": "StixCyberObservableRelationshipAddInput!"},
+            inputs,
+            """
+                id
+                standard_id
+                entity_type
+                parent_types
+            """,
+            batch_size,
+            max_workers,
+        )
+        return [
+            {"result": self.opencti.process_multiple_fields(data), "error": error}
+            for data, error in results
+        ]
+
+    """
+        Generate the input of a stix_observable_relationship creation
+
+        :param fromId: the id of the source entity of the relation
+        :param toId: the id of the target entity of the relation
+        :param relationship_type: the relation type
+        :return StixCyberObservableRelationshipAddInput dict
+    """
+
+    def generate_input(self, **kwargs):
+        relationship_type = kwargs.get("relationship_type", None)
+        if relationship_type == "resolves-to":
+            relationship_type = "obs_resolves-to"
+        elif relationship_type == "belongs-to":
+            relationship_type = "obs_belongs-to"
+        elif relationship_type == "content":
+            relationship_type = "obs_content"
+
+        return {
+            "fromId": kwargs.get("fromId", None),
+            "toId": kwargs.get("toId", None),
+            "relationship_type": relationship_type,
+            "start_time": kwargs.get("start_time", None),
+            "stop_time": kwargs.get("stop_time", None),
+            "stix_id": kwargs.get("stix_id", None),
+            "created": kwargs.get("created", None),
+            "modified": kwargs.get("modified", None),
+            "createdBy": kwargs.get("createdBy", None),
+            "objectMarking": kwargs.get("objectMarking", None),
+            "x_opencti_stix_ids": kwargs.get("x_opencti_stix_ids", None),
+            "update": kwargs.get("update", False),
+        }
+
     """
         Update a stix_observable_relationship object field
 
@@ -281,22 +403,24 @@ class StixCyberObservableRelationship:
                 "info",
                 "Updating stix_observable_relationship {" + id + "}.",
             )
-            query = (
+            selection = self.properties
+            query = self.opencti.compile_query(
                 """
                 mutation StixCyberObservableRelationshipEdit($id: ID!, $input: [EditInput]!) {
                     stixCyberObservableRelationshipEdit(id: $id) {
                         fieldPatch(input: $input) {
-                            """
-                + self.properties
-                + """
+                            """,
+                selection,
+                """
                         }
                     }
                 }
-            """
+            """,
             )
             result = self.opencti.query(query, {"id": id, "input": input})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixCyberObservableRelationshipEdit"]["fieldPatch"]
+                result["data"]["stixCyberObservableRelationshipEdit"]["fieldPatch"],
+                selection=selection,
             )
         else:
             self.opencti.log("error", "Missing parameters: id and key and value")
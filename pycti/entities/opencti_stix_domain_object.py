@@ -10,6 +10,7 @@ class StixDomainObject:
     def __init__(self, opencti, file):
         self.opencti = opencti
         self.file = file
+        self.negative_cache = set()
         self.properties = """
             id
             standard_id
@@ -425,6 +426,7 @@ class StixDomainObject:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Stix-Domain-Object objects
     """
 
@@ -437,6 +439,7 @@ class StixDomainObject:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -446,15 +449,16 @@ class StixDomainObject:
             "info",
             "Listing Stix-Domain-Objects with filters " + json.dumps(filters) + ".",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
                 query StixDomainObjects($types: [String], $filters: [StixDomainObjectsFiltering], $search: String, $first: Int, $after: ID, $orderBy: StixDomainObjectsOrdering, $orderMode: OrderingMode) {
                     stixDomainObjects(types: $types, filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                         edges {
                             node {
-                                """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                                """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -466,7 +470,7 @@ class StixDomainObject:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -483,7 +487,9 @@ class StixDomainObject:
 
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["stixDomainObjects"])
+            data = self.opencti.process_multiple(
+                result["data"]["stixDomainObjects"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["stixDomainObjects"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["stixDomainObjects"]["pageInfo"]["endCursor"]
@@ -501,13 +507,15 @@ class StixDomainObject:
                     },
                 )
                 data = self.opencti.process_multiple(
-                    result["data"]["stixDomainObjects"]
+                    result["data"]["stixDomainObjects"], selection=selection
                 )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["stixDomainObjects"], with_pagination
+                result["data"]["stixDomainObjects"],
+                with_pagination,
+                selection=selection,
             )
 
     """
@@ -516,6 +524,7 @@ class StixDomainObject:
         :param id: the id of the Stix-Domain-Object
         :param types: list of Stix Domain Entity types
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Stix-Domain-Object object
     """
 
@@ -524,30 +533,33 @@ class StixDomainObject:
         types = kwargs.get("types", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Stix-Domain-Object {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                     query StixDomainObject($id: String!) {
                         stixDomainObject(id: $id) {
-                            """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                            """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixDomainObject"]
+                result["data"]["stixDomainObject"], selection=selection
             )
         elif filters is not None:
             result = self.list(
-                types=types, filters=filters, customAttributes=custom_attributes
+                types=types,
+                filters=filters,
+                customAttributes=custom_attributes,
+                projection=projection,
             )
             if len(result) > 0:
                 return result[0]
@@ -560,46 +572,265 @@ class StixDomainObject:
             )
             return None
 
+    """
+        Read many Stix-Domain-Object objects
+
+        :param ids: the ids of the Stix-Domain-Object objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Stix-Domain-Object objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixDomainObject", "Stix-Domain-Object", self.properties, **kwargs
+        )
+
     """
         Get a Stix-Domain-Object object by stix_id or name
 
+        The id, the name and the aliases are all looked up in a single request.
+
         :param types: a list of Stix-Domain-Object types
         :param stix_id: the STIX ID of the Stix-Domain-Object
         :param name: the name of the Stix-Domain-Object
+        :param aliases: (optional) the aliases of the Stix-Domain-Object
+        :param fieldName: (optional) the aliases field to search in (default "aliases")
+        :param negativeCache: (optional) remember the names not found (default False)
         :return Stix-Domain-Object object
     """
 
     def get_by_stix_id_or_name(self, **kwargs):
+        candidate = {
+            "stix_id": kwargs.get("stix_id", None),
+            "name": kwargs.get("name", None),
+            "aliases": kwargs.get("aliases", []),
+        }
+        return self.get_many_by_stix_id_or_name(
+            candidates=[candidate],
+            types=kwargs.get("types", None),
+            fieldName=kwargs.get("fieldName", "aliases"),
+            customAttributes=kwargs.get("customAttributes", None),
+            negativeCache=kwargs.get("negativeCache", False),
+        )[0]
+
+    """
+        Get many Stix-Domain-Object objects by stix_id or name
+
+        Candidates are resolved by batches, each batch in a single request
+        looking up all the ids, names and aliases of its candidates at once.
+        A candidate is resolved by id first, then by name, then by its name
+        in the aliases field, then by its aliases in order. The candidates
+        not resolved by their batch are resolved with one request each when
+        the batch lookup is truncated or the aliases field is not selected.
+
+        :param candidates: list of dict with the `stix_id`, `name` and `aliases` to resolve
+        :param types: a list of Stix-Domain-Object types
+        :param fieldName: (optional) the aliases field to search in (default "aliases")
+        :param batch_size: (optional) number of candidates per request (default 50)
+        :param negativeCache: (optional) remember the names not found (default False)
+        :return list of Stix-Domain-Object objects (or None) in the order of the candidates
+    """
+
+    def get_many_by_stix_id_or_name(self, **kwargs):
+        candidates = kwargs.get("candidates", [])
         types = kwargs.get("types", None)
-        stix_id = kwargs.get("stix_id", None)
-        name = kwargs.get("name", None)
-        aliases = kwargs.get("aliases", [])
         field_name = kwargs.get("fieldName", "aliases")
         custom_attributes = kwargs.get("customAttributes", None)
-        object_result = None
-        if stix_id is not None:
-            object_result = self.read(id=stix_id, customAttributes=custom_attributes)
-        if object_result is None and name is not None:
-            # TODO: Change this logic and move it to the API.
-            object_result = self.read(
-                types=types,
-                filters=[{"key": "name", "values": [name]}],
-                customAttributes=custom_attributes,
+        batch_size = max(kwargs.get("batch_size", 50), 1)
+        negative_cache = kwargs.get("negativeCache", False)
+        selection = self.opencti.select(self.properties, custom_attributes)
+        results = []
+        for start in range(0, len(candidates), batch_size):
+            chunk = candidates[start : start + batch_size]
+            keys = [
+                (
+                    tuple(types or []),
+                    field_name,
+                    candidate.get("stix_id"),
+                    self._normalize_name(candidate.get("name")),
+                    tuple(
+                        self._normalize_name(alias)
+                        for alias in candidate.get("aliases") or []
+                    ),
+                )
+                for candidate in chunk
+            ]
+            pending = [
+                index
+                for index, key in enumerate(keys)
+                if not (negative_cache and key in self.negative_cache)
+            ]
+            chunk_results = [None] * len(chunk)
+            if len(pending) > 0:
+                resolved = self._resolve_candidates(
+                    [chunk[index] for index in pending], types, field_name, selection
+                )
+                for index, result in zip(pending, resolved):
+                    chunk_results[index] = result
+                    if result is None and negative_cache:
+                        self.negative_cache.add(keys[index])
+            results.extend(chunk_results)
+        return results
+
+    """
+        Forget the Stix-Domain-Object names remembered as not found
+    """
+
+    def clear_negative_cache(self):
+        self.negative_cache = set()
+
+    @staticmethod
+    def _normalize_name(name):
+        return name.lower().strip() if name is not None else None
+
+    def _resolve_candidates(self, candidates, types, field_name, selection):
+        declarations = []
+        calls = []
+        variables = {}
+        names = []
+        for index, candidate in enumerate(candidates):
+            if candidate.get("stix_id") is not None:
+                declarations.append("$id" + str(index) + ": String!")
+                calls.append(
+                    "id"
+                    + str(index)
+                    + ": stixDomainObject(id: $id"
+                    + str(index)
+                    + ") { "
+                    + selection
+                    + " }"
+                )
+                variables["id" + str(index)] = candidate["stix_id"]
+            if candidate.get("name") is not None:
+                names.append(candidate["name"])
+        searched = list(
+            dict.fromkeys(
+                names
+                + [
+                    alias
+                    for candidate in candidates
+                    if candidate.get("name") is not None
+                    for alias in candidate.get("aliases") or []
+                ]
+            )
+        )
+        if len(names) > 0:
+            declarations.append("$types: [String]")
+            declarations.append("$nameFilters: [StixDomainObjectsFiltering]")
+            declarations.append("$aliasFilters: [StixDomainObjectsFiltering]")
+            declarations.append("$first: Int")
+            for alias, filters in [
+                ("byName", "$nameFilters"),
+                ("byAlias", "$aliasFilters"),
+            ]:
+                calls.append(
+                    alias
+                    + ": stixDomainObjects(types: $types, filters: "
+                    + filters
+                    + ", first: $first) { edges { node { "
+                    + selection
+                    + " } } pageInfo { hasNextPage } }"
+                )
+            variables["types"] = types
+            variables["nameFilters"] = [
+                {"key": "name", "values": list(dict.fromkeys(names))}
+            ]
+            variables["aliasFilters"] = [{"key": field_name, "values": searched}]
+            variables["first"] = max(500, 2 * len(searched))
+        if len(calls) == 0:
+            return [None] * len(candidates)
+        query = (
+            "query StixDomainObjectsResolve("
+            + ", ".join(declarations)
+            + ") { "
+            + " ".join(calls)
+            + " }"
+        )
+        self.opencti.log(
+            "info", "Resolving " + str(len(candidates)) + " Stix-Domain-Objects."
+        )
+        data = self.opencti.query(query, variables)["data"]
+        by_name = {}
+        by_alias = {}
+        partial = False
+        if len(names) > 0:
+            for entity in self.opencti.process_multiple(
+                data["byName"], selection=selection
+            ):
+                by_name.setdefault(self._normalize_name(entity.get("name")), entity)
+            alias_entities = self.opencti.process_multiple(
+                data["byAlias"], selection=selection
             )
-            if object_result is None:
-                object_result = self.read(
-                    types=types,
-                    filters=[{"key": field_name, "values": [name]}],
-                    customAttributes=custom_attributes,
+            for entity in alias_entities:
+                for alias in entity.get(field_name) or []:
+                    by_alias.setdefault(self._normalize_name(alias), entity)
+            # A name or an alias missing from a truncated lookup, or matched
+            # by an entity without the aliases field, is not a miss
+            partial = any(
+                ((data[field] or {}).get("pageInfo") or {}).get("hasNextPage", False)
+                for field in ("byName", "byAlias")
+            ) or any(field_name not in entity for entity in alias_entities)
+        results = []
+        for index, candidate in enumerate(candidates):
+            result = data.get("id" + str(index))
+            if result is not None:
+                results.append(
+                    self.opencti.process_multiple_fields(result, selection=selection)
                 )
-                if object_result is None:
-                    for alias in aliases:
-                        object_result = self.read(
-                            types=types,
-                            filters=[{"key": field_name, "values": [alias]}],
-                            customAttributes=custom_attributes,
-                        )
-        return object_result
+                continue
+            if candidate.get("name") is not None:
+                name = self._normalize_name(candidate["name"])
+                result = by_name.get(name, by_alias.get(name))
+                for alias in candidate.get("aliases") or []:
+                    if result is not None:
+                        break
+                    result = by_alias.get(self._normalize_name(alias))
+                if result is None and partial:
+                    result = self._resolve_candidate(
+                        candidate, types, field_name, selection
+                    )
+            results.append(result)
+        return results
+
+    def _resolve_candidate(self, candidate, types, field_name, selection):
+        lookups = [("name", candidate["name"]), (field_name, candidate["name"])] + [
+            (field_name, alias) for alias in candidate.get("aliases") or []
+        ]
+        declarations = ["$types: [String]"]
+        calls = []
+        variables = {"types": types}
+        for index, (key, value) in enumerate(lookups):
+            declarations.append(
+                "$filters" + str(index) + ": [StixDomainObjectsFiltering]"
+            )
+            calls.append(
+                "match"
+                + str(index)
+                + ": stixDomainObjects(types: $types, filters: $filters"
+                + str(index)
+                + ", first: 1) { edges { node { "
+                + selection
+                + " } } }"
+            )
+            variables["filters" + str(index)] = [{"key": key, "values": [value]}]
+        query = (
+            "query StixDomainObjectResolve("
+            + ", ".join(declarations)
+            + ") { "
+            + " ".join(calls)
+            + " }"
+        )
+        data = self.opencti.query(query, variables)["data"]
+        for index in range(len(lookups)):
+            entities = self.opencti.process_multiple(
+                data["match" + str(index)], selection=selection
+            )
+            if len(entities) > 0:
+                return entities[0]
+        return None
 
     """
         Update a Stix-Domain-Object object field
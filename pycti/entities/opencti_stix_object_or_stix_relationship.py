@@ -471,35 +471,55 @@ class StixObjectOrStixRelationship:
         Read a StixObjectOrStixRelationship object
 
         :param id: the id of the StixObjectOrStixRelationship
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return StixObjectOrStixRelationship object
     """
 
     def read(self, **kwargs):
         id = kwargs.get("id", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log(
                 "info", "Reading StixObjectOrStixRelationship {" + id + "}."
             )
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query StixObjectOrStixRelationship($id: String!) {
                     stixObjectOrStixRelationship(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixObjectOrStixRelationship"]
+                result["data"]["stixObjectOrStixRelationship"], selection=selection
             )
         else:
             self.opencti.log("error", "Missing parameters: id")
             return None
+
+    """
+        Read many StixObjectOrStixRelationship objects
+
+        :param ids: the ids of the StixObjectOrStixRelationship objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of StixObjectOrStixRelationship objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixObjectOrStixRelationship",
+            "StixObjectOrStixRelationship",
+            self.properties,
+            **kwargs,
+        )
@@ -302,6 +302,7 @@ class StixSightingRelationship:
         :param lastSeenStop: the last_seen date stop filter
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of stix_sighting objects
     """
 
@@ -321,6 +322,7 @@ class StixSightingRelationship:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -334,15 +336,16 @@ class StixSightingRelationship:
             + str(to_id)
             + "}",
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
                 query StixSightingRelationships($elementId: String, $fromId: String, $fromTypes: [String], $toId: String, $toTypes: [String], $firstSeenStart: DateTime, $firstSeenStop: DateTime, $lastSeenStart: DateTime, $lastSeenStop: DateTime, $filters: [StixSightingRelationshipsFiltering], $first: Int, $after: ID, $orderBy: StixSightingRelationshipsOrdering, $orderMode: OrderingMode) {
                     stixSightingRelationships(elementId: $elementId, fromId: $fromId, fromTypes: $fromTypes, toId: $toId, toTypes: $toTypes, firstSeenStart: $firstSeenStart, firstSeenStop: $firstSeenStop, lastSeenStart: $lastSeenStart, lastSeenStop: $lastSeenStop, filters: $filters, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                         edges {
                             node {
-                                """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                                """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -354,7 +357,7 @@ class StixSightingRelationship:
                     }
                 }
             }
-         """
+         """,
         )
         result = self.opencti.query(
             query,
@@ -378,7 +381,7 @@ class StixSightingRelationship:
         if get_all:
             final_data = []
             data = self.opencti.process_multiple(
-                result["data"]["stixSightingRelationships"]
+                result["data"]["stixSightingRelationships"], selection=selection
             )
             final_data = final_data + data
             while result["data"]["stixSightingRelationships"]["pageInfo"][
@@ -410,13 +413,15 @@ class StixSightingRelationship:
                     },
                 )
                 data = self.opencti.process_multiple(
-                    result["data"]["stixSightingRelationships"]
+                    result["data"]["stixSightingRelationships"], selection=selection
                 )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["stixSightingRelationships"], with_pagination
+                result["data"]["stixSightingRelationships"],
+                with_pagination,
+                selection=selection,
             )
 
     """
@@ -429,6 +434,7 @@ class StixSightingRelationship:
         :param firstSeenStop: the first_seen date stop filter
         :param lastSeenStart: the last_seen date start filter
         :param lastSeenStop: the last_seen date stop filter
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return stix_sighting object
     """
 
@@ -442,26 +448,26 @@ class StixSightingRelationship:
         last_seen_start = kwargs.get("lastSeenStart", None)
         last_seen_stop = kwargs.get("lastSeenStop", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading stix_sighting {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                     query StixSightingRelationship($id: String!) {
                         stixSightingRelationship(id: $id) {
-                            """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                            """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
             return self.opencti.process_multiple_fields(
-                result["data"]["stixSightingRelationship"]
+                result["data"]["stixSightingRelationship"], selection=selection
             )
         elif from_id is not None and to_id is not None:
             result = self.list(
@@ -472,6 +478,7 @@ class StixSightingRelationship:
                 firstSeenStop=first_seen_stop,
                 lastSeenStart=last_seen_start,
                 lastSeenStop=last_seen_stop,
+                projection=projection,
             )
             if len(result) > 0:
                 return result[0]
@@ -481,6 +488,22 @@ class StixSightingRelationship:
             self.opencti.log("error", "Missing parameters: id or from_id and to_id")
             return None
 
+    """
+        Read many stix_sighting objects
+
+        :param ids: the ids of the stix_sighting objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of stix_sighting objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "stixSightingRelationship", "stix_sighting", self.properties, **kwargs
+        )
+
     """
         Create a stix_sighting object
 
@@ -166,6 +166,7 @@ class ThreatActor:
         :param bool orderMode: (optional) either "`asc`" or "`desc`"
         :param bool getAll: (optional) switch to return all entries (be careful to use this without any other filters)
         :param bool withPagination: (optional) switch to use pagination
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         """
 
         filters = kwargs.get("filters", None)
@@ -175,6 +176,7 @@ class ThreatActor:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -183,15 +185,16 @@ class ThreatActor:
         self.opencti.log(
             "info", "Listing Threat-Actors with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query ThreatActors($filters: [ThreatActorsFiltering], $search: String, $first: Int, $after: ID, $orderBy: ThreatActorsOrdering, $orderMode: OrderingMode) {
                 threatActors(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -203,7 +206,7 @@ class ThreatActor:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -217,7 +220,7 @@ class ThreatActor:
             },
         )
         return self.opencti.process_multiple(
-            result["data"]["threatActors"], with_pagination
+            result["data"]["threatActors"], with_pagination, selection=selection
         )
 
     def read(self, **kwargs) -> Union[dict, None]:
@@ -232,32 +235,35 @@ class ThreatActor:
 
         :param str id: the id of the Threat-Actor
         :param list filters: the filters to apply if no id provided
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         """
 
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Threat-Actor {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query ThreatActor($id: String!) {
                     threatActor(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["threatActor"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["threatActor"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -268,6 +274,23 @@ class ThreatActor:
             )
             return None
 
+    def read_many(self, **kwargs) -> Union[dict, None]:
+        """Read many Threat-Actor objects
+
+        The Threat-Actor entities are read in a few aliased requests.
+
+        :param list ids: the ids of the Threat-Actor entities
+        :param str customAttributes: (optional) the GraphQL selection of the entities
+        :param str projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param int batchSize: (optional) number of entities per request (default 50)
+        :param int maxWorkers: (optional) number of concurrent requests (default 1)
+        :return: dict of Threat-Actor objects by requested id, None for the missing ones
+        """
+
+        return self.opencti.read_many_entities(
+            "threatActor", "Threat-Actor", self.properties, **kwargs
+        )
+
     def create(self, **kwargs):
         """Create a Threat-Actor object
 
@@ -147,6 +147,7 @@ class Vulnerability:
         :param search: the search keyword
         :param first: return the first n rows from the after ID (or the beginning if not set)
         :param after: ID of the first row for pagination
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return List of Vulnerability objects
     """
 
@@ -158,6 +159,7 @@ class Vulnerability:
         order_by = kwargs.get("orderBy", None)
         order_mode = kwargs.get("orderMode", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         get_all = kwargs.get("getAll", False)
         with_pagination = kwargs.get("withPagination", False)
         if get_all:
@@ -166,15 +168,16 @@ class Vulnerability:
         self.opencti.log(
             "info", "Listing Vulnerabilities with filters " + json.dumps(filters) + "."
         )
-        query = (
+        selection = self.opencti.select(self.properties, custom_attributes, projection)
+        query = self.opencti.compile_query(
             """
             query Vulnerabilities($filters: [VulnerabilitiesFiltering], $search: String, $first: Int, $after: ID, $orderBy: VulnerabilitiesOrdering, $orderMode: OrderingMode) {
                 vulnerabilities(filters: $filters, search: $search, first: $first, after: $after, orderBy: $orderBy, orderMode: $orderMode) {
                     edges {
                         node {
-                            """
-            + (custom_attributes if custom_attributes is not None else self.properties)
-            + """
+                            """,
+            selection,
+            """
                         }
                     }
                     pageInfo {
@@ -186,7 +189,7 @@ class Vulnerability:
                     }
                 }
             }
-        """
+        """,
         )
         result = self.opencti.query(
             query,
@@ -202,7 +205,9 @@ class Vulnerability:
 
         if get_all:
             final_data = []
-            data = self.opencti.process_multiple(result["data"]["vulnerabilities"])
+            data = self.opencti.process_multiple(
+                result["data"]["vulnerabilities"], selection=selection
+            )
             final_data = final_data + data
             while result["data"]["vulnerabilities"]["pageInfo"]["hasNextPage"]:
                 after = result["data"]["vulnerabilities"]["pageInfo"]["endCursor"]
@@ -218,12 +223,14 @@ class Vulnerability:
                         "orderMode": order_mode,
                     },
                 )
-                data = self.opencti.process_multiple(result["data"]["vulnerabilities"])
+                data = self.opencti.process_multiple(
+                    result["data"]["vulnerabilities"], selection=selection
+                )
                 final_data = final_data + data
             return final_data
         else:
             return self.opencti.process_multiple(
-                result["data"]["vulnerabilities"], with_pagination
+                result["data"]["vulnerabilities"], with_pagination, selection=selection
             )
 
     """
@@ -231,6 +238,7 @@ class Vulnerability:
 
         :param id: the id of the Vulnerability
         :param filters: the filters to apply if no id provided
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
         :return Vulnerability object
     """
 
@@ -238,27 +246,29 @@ class Vulnerability:
         id = kwargs.get("id", None)
         filters = kwargs.get("filters", None)
         custom_attributes = kwargs.get("customAttributes", None)
+        projection = kwargs.get("projection", None)
         if id is not None:
             self.opencti.log("info", "Reading Vulnerability {" + id + "}.")
-            query = (
+            selection = self.opencti.select(
+                self.properties, custom_attributes, projection
+            )
+            query = self.opencti.compile_query(
                 """
                 query Vulnerability($id: String!) {
                     vulnerability(id: $id) {
-                        """
-                + (
-                    custom_attributes
-                    if custom_attributes is not None
-                    else self.properties
-                )
-                + """
+                        """,
+                selection,
+                """
                     }
                 }
-             """
+             """,
             )
             result = self.opencti.query(query, {"id": id})
-            return self.opencti.process_multiple_fields(result["data"]["vulnerability"])
+            return self.opencti.process_multiple_fields(
+                result["data"]["vulnerability"], selection=selection
+            )
         elif filters is not None:
-            result = self.list(filters=filters)
+            result = self.list(filters=filters, projection=projection)
             if len(result) > 0:
                 return result[0]
             else:
@@ -269,6 +279,22 @@ class Vulnerability:
             )
             return None
 
+    """
+        Read many Vulnerability objects
+
+        :param ids: the ids of the Vulnerability objects
+        :param customAttributes: (optional) the GraphQL selection of the objects
+        :param projection: (optional) projection preset, one of "ids", "core" or "full" (default)
+        :param batchSize: (optional) number of objects per request (default 50)
+        :param maxWorkers: (optional) number of concurrent requests (default 1)
+        :return dict of Vulnerability objects by requested id, None for the missing ones
+    """
+
+    def read_many(self, **kwargs):
+        return self.opencti.read_many_entities(
+            "vulnerability", "Vulnerability", self.properties, **kwargs
+        )
+
     """
         Create a Vulnerability object
 
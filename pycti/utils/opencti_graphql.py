@@ -0,0 +1,332 @@
+import re
+
+# Connection fields flattened by the API client post-processing, in the order
+# they have always been processed.
+MULTIPLE_FIELDS = [
+    "objectMarking",
+    "objectLabel",
+    "reports",
+    "notes",
+    "opinions",
+    "killChainPhases",
+    "externalReferences",
+    "objects",
+    "observables",
+    "stixCoreRelationships",
+    "indicators",
+    "importFiles",
+]
+
+# Connection fields of the author which are flattened as well.
+CREATED_BY_MULTIPLE_FIELDS = ["objectMarking", "objectLabel"]
+
+# Projection presets accepted by the entities list and read methods.
+PROJECTIONS = ["ids", "core", "full"]
+
+# Fields kept by the `ids` projection.
+IDENTIFIER_FIELDS = ["id", "standard_id", "entity_type", "parent_types"]
+
+TOKEN_REGEX = re.compile(
+    r'"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\]|\\.)*"|\.\.\.|[A-Za-z_][A-Za-z0-9_]*|\S'
+)
+COMPACT_REGEX = re.compile(r'"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\]|\\.)*"|\s+')
+
+
+class SelectionPlan:
+    """Post-processing plan of a GraphQL selection
+
+    Lists the connection fields which have to be flattened for a given
+    selection, each of them with the plan of its own nodes, so results are
+    processed without probing for fields that were never requested.
+
+    :param created_by: plans of the author connection fields or None
+    :type created_by: list
+    :param fields: plans of the connection fields
+    :type fields: list
+    """
+
+    def __init__(self, created_by=None, fields=None):
+        self.created_by = created_by
+        self.fields = fields if fields is not None else []
+
+
+def full_plan():
+    """Build the plan processing every known connection field
+
+    :return: the plan used when the selection is unknown
+    :rtype: SelectionPlan
+    """
+
+    plan = SelectionPlan()
+    plan.created_by = [(key, plan) for key in CREATED_BY_MULTIPLE_FIELDS]
+    plan.fields = [(key, plan) for key in MULTIPLE_FIELDS]
+    return plan
+
+
+FULL_PLAN = full_plan()
+
+
+def compact_query(query):
+    """Collapse the whitespaces of a GraphQL document outside of strings
+
+    :param query: the GraphQL document
+    :type query: str
+    :return: the compacted document
+    :rtype: str
+    """
+
+    return COMPACT_REGEX.sub(
+        lambda match: match.group(0) if match.group(0).startswith('"') else " ",
+        query,
+    ).strip()
+
+
+def parse_selection(selection):
+    """Parse the top level fields of a GraphQL selection
+
+    Inline fragments are merged into the selection they belong to and the
+    response key (alias or field name) is used for each field.
+
+    :param selection: the GraphQL selection set content
+    :type selection: str
+    :return: dict of response keys with the parsed sub selection (or None for
+             leaves), None if the selection contains named fragment spreads
+    :rtype: dict
+    """
+
+    nodes = parse_nodes(selection)
+    if nodes is None:
+        return None
+    return _fields_of(nodes)
+
+
+def parse_nodes(selection):
+    """Parse a GraphQL selection into a tree of nodes
+
+    Each node is a `(key, head, children)` tuple where `key` is the response
+    key of a field (None for an inline fragment), `head` the tokens preceding
+    its selection set and `children` the nodes of this selection set (None for
+    leaves).
+
+    :param selection: the GraphQL selection set content
+    :type selection: str
+    :return: list of nodes, None if the selection contains named fragment
+             spreads or cannot be parsed
+    :rtype: list
+    """
+
+    tokens = TOKEN_REGEX.findall(selection)
+    nodes, position = _parse_nodes(tokens, 0)
+    if nodes is None or position < len(tokens):
+        return None
+    return nodes
+
+
+def _parse_nodes(tokens, position):
+    nodes = []
+    length = len(tokens)
+    while position < length:
+        start = position
+        token = tokens[position]
+        if token == "}":
+            return nodes, position
+        if token == "{":
+            # Selection without any field
+            return None, position
+        key = None
+        if token == "...":
+            if position + 1 < length and tokens[position + 1] == "on":
+                position += 3
+            else:
+                # Named fragment spreads cannot be resolved locally
+                return None, position
+        else:
+            key = token
+            position += 1
+            if position < length and tokens[position] == ":":
+                position += 2
+            if position < length and tokens[position] == "(":
+                depth = 0
+                while position < length:
+                    if tokens[position] == "(":
+                        depth += 1
+                    elif tokens[position] == ")":
+                        depth -= 1
+                        if depth == 0:
+                            break
+                    position += 1
+                position += 1
+        position = _skip_directives(tokens, position)
+        head = tokens[start:position]
+        children = None
+        if position < length and tokens[position] == "{":
+            children, position = _parse_nodes(tokens, position + 1)
+            if children is None:
+                return None, position
+            position += 1
+        elif key is None:
+            return None, position
+        nodes.append((key, head, children))
+    return nodes, position
+
+
+def _skip_directives(tokens, position):
+    length = len(tokens)
+    while position < length and tokens[position] == "@":
+        position += 2
+        if position < length and tokens[position] == "(":
+            while position < length and tokens[position] != ")":
+                position += 1
+            position += 1
+    return position
+
+
+def _fields_of(nodes):
+    fields = {}
+    for key, _, children in nodes:
+        if key is None:
+            _merge_fields(fields, _fields_of(children))
+        else:
+            _merge_fields(
+                fields, {key: None if children is None else _fields_of(children)}
+            )
+    return fields
+
+
+def _merge_fields(fields, other):
+    for key, sub_fields in other.items():
+        if isinstance(fields.get(key), dict) and isinstance(sub_fields, dict):
+            _merge_fields(fields[key], sub_fields)
+        elif key not in fields or sub_fields is not None:
+            fields[key] = sub_fields
+
+
+def check_projection(projection):
+    """Check a projection preset is known
+
+    :param projection: the projection preset
+    :type projection: str
+    :raises ValueError: if the projection is not one of `PROJECTIONS`
+    """
+
+    if projection not in PROJECTIONS:
+        raise ValueError(
+            "Unknown projection "
+            + str(projection)
+            + ", expected one of "
+            + ", ".join(PROJECTIONS)
+        )
+
+
+def project_selection(selection, projection):
+    """Reduce a GraphQL selection to a projection preset
+
+    - `ids`: identifier fields of the entity only
+    - `core`: scalar fields of the entity, small embedded objects and the
+      identifiers of the referenced entities (such as the author or the
+      relationship ends), without any connection
+    - `full`: the selection itself
+
+    :param selection: the full GraphQL selection of the entity
+    :type selection: str
+    :param projection: one of `PROJECTIONS`
+    :type projection: str
+    :return: the projected selection
+    :rtype: str
+    """
+
+    check_projection(projection)
+    if projection == "full":
+        return selection
+    nodes = parse_nodes(selection)
+    if nodes is None:
+        return selection
+    if projection == "ids":
+        projected = _project_ids(nodes)
+    else:
+        projected = _project_core(nodes)
+    return _serialize_nodes(projected)
+
+
+def _project_ids(nodes):
+    projected = []
+    for key, head, children in nodes:
+        if key is None:
+            sub_nodes = _project_ids(children)
+            if len(sub_nodes) > 0:
+                projected.append((key, head, sub_nodes))
+        elif children is None and key in IDENTIFIER_FIELDS:
+            projected.append((key, head, children))
+    return projected
+
+
+def _project_core(nodes):
+    projected = []
+    for key, head, children in nodes:
+        if children is None:
+            projected.append((key, head, children))
+            continue
+        if key is None:
+            sub_nodes = _project_core(children)
+        elif any(child_key == "edges" for child_key, _, _ in children):
+            # Connections are never part of the core projection
+            continue
+        elif all(
+            child_key is not None and grand_children is None
+            for child_key, _, grand_children in children
+        ):
+            sub_nodes = children
+        else:
+            sub_nodes = _project_ids(children)
+        if len(sub_nodes) > 0:
+            projected.append((key, head, sub_nodes))
+    return projected
+
+
+def _serialize_nodes(nodes):
+    parts = []
+    for _, head, children in nodes:
+        parts.append(" ".join(head))
+        if children is not None:
+            parts.append("{ " + _serialize_nodes(children) + " }")
+    return " ".join(parts)
+
+
+def compile_plan(fields):
+    """Compile the post-processing plan of parsed selection fields
+
+    :param fields: the fields returned by `parse_selection`
+    :type fields: dict
+    :return: the plan of the selection
+    :rtype: SelectionPlan
+    """
+
+    if fields is None:
+        return FULL_PLAN
+    plan = SelectionPlan()
+    if "createdBy" in fields:
+        created_by = fields["createdBy"]
+        plan.created_by = (
+            FULL_PLAN.created_by
+            if created_by is None
+            else [
+                (key, _compile_node_plan(created_by[key]))
+                for key in CREATED_BY_MULTIPLE_FIELDS
+                if key in created_by
+            ]
+        )
+    plan.fields = [
+        (key, _compile_node_plan(fields[key]))
+        for key in MULTIPLE_FIELDS
+        if key in fields
+    ]
+    return plan
+
+
+def _compile_node_plan(connection):
+    if not isinstance(connection, dict):
+        return FULL_PLAN
+    edges = connection.get("edges")
+    if not isinstance(edges, dict) or not isinstance(edges.get("node"), dict):
+        return FULL_PLAN
+    return compile_plan(edges["node"])
@@ -0,0 +1,108 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonCodec:
+    """JSON codec based on the standard library
+
+    Codecs work on bytes: `dumps` returns UTF-8 encoded bytes and `loads`
+    accepts bytes (or str) so payloads received from or sent to the network do
+    not need an intermediate str copy.
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    def dumps_str(self, data: Any) -> str:
+        return json.dumps(data)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec based on orjson
+
+    Values orjson cannot serialize (such as integers over 64 bits) are
+    delegated to the standard library.
+    """
+
+    name = "orjson"
+
+    def dumps(self, data: Any) -> bytes:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            return super().dumps(data)
+
+    def dumps_str(self, data: Any) -> str:
+        return self.dumps(data).decode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return orjson.loads(data)
+
+
+CODECS = {"json": JsonCodec}
+if orjson is not None:
+    CODECS["orjson"] = OrjsonCodec
+
+codec = CODECS["orjson"]() if orjson is not None else JsonCodec()
+
+
+def set_codec(name: str) -> JsonCodec:
+    """Select the JSON codec used by the client and the connector helper
+
+    :param name: name of the codec, `json` or `orjson` (if installed)
+    :type name: str
+    :raises ValueError: if the codec is not available
+    :return: the selected codec
+    :rtype: JsonCodec
+    """
+
+    global codec
+    if name not in CODECS:
+        raise ValueError(
+            "JSON codec "
+            + name
+            + " is not available, use one of "
+            + ", ".join(CODECS.keys())
+        )
+    codec = CODECS[name]()
+    return codec
+
+
+def get_codec() -> JsonCodec:
+    """Get the JSON codec in use
+
+    :return: the current codec
+    :rtype: JsonCodec
+    """
+
+    return codec
+
+
+def dumps(data: Any) -> bytes:
+    """Serialize data to JSON bytes with the current codec"""
+
+    return codec.dumps(data)
+
+
+def dumps_str(data: Any) -> str:
+    """Serialize data to a JSON string with the current codec"""
+
+    return codec.dumps_str(data)
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Deserialize JSON bytes or string with the current codec"""
+
+    return codec.loads(data)
@@ -1,17 +1,22 @@
 # coding: utf-8
 
 import base64
+import contextvars
 import datetime
 import json
 import os
 import uuid
-from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import datefinder
 import dateutil.parser
 import pytz
 
+from pycti.entities.opencti_external_reference import ExternalReference
 from pycti.entities.opencti_identity import Identity
+from pycti.entities.opencti_kill_chain_phase import KillChainPhase
+from pycti.utils import opencti_json
 from pycti.utils.constants import (
     IdentityTypes,
     LocationTypes,
@@ -31,6 +36,11 @@ utc = pytz.UTC
 # Spec version
 SPEC_VERSION = "2.1"
 
+# Minimum number of consecutive observables to use bulk creation
+OBSERVABLES_BULK_THRESHOLD = 10
+# Minimum number of relationships of a bundle level to use bulk creation
+RELATIONSHIPS_BULK_THRESHOLD = 10
+
 
 class OpenCTIStix2:
     """Python API for Stix2 in OpenCTI
@@ -42,6 +52,8 @@ class OpenCTIStix2:
         self.opencti = opencti
         self.stix2_update = OpenCTIStix2Update(opencti)
         self.mapping_cache = {}
+        # Standard ids of the vocabulary known to exist in the platform
+        self.known_ids = set()
 
     ######### UTILS
     # region utils
@@ -142,26 +154,32 @@ class OpenCTIStix2:
         # Max is not set, return True
         if max_marking_definition_entity is None:
             return True
-        # Filter entity markings definition to the max_marking_definition type
-        typed_entity_marking_definitions = []
+        typed_ids, allowed_ids = self.opencti.marking_definition.get_allowed_sets(
+            max_marking_definition=max_marking_definition_entity
+        )
+        index = self.opencti.marking_definition.get_index()
+        has_typed_marking_definitions = False
         for entity_marking_definition in entity_marking_definitions:
-            if (
-                entity_marking_definition["definition_type"]
+            entity_marking_definition_id = entity_marking_definition["id"]
+            if entity_marking_definition_id in typed_ids:
+                # Check if level is less or equal to max
+                if entity_marking_definition_id in allowed_ids:
+                    return True
+                has_typed_marking_definitions = True
+            elif (
+                entity_marking_definition_id not in index
+                and entity_marking_definition["definition_type"]
                 == max_marking_definition_entity["definition_type"]
             ):
-                typed_entity_marking_definitions.append(entity_marking_definition)
+                # Marking definition created after the index was loaded
+                if (
+                    entity_marking_definition["x_opencti_order"]
+                    <= max_marking_definition_entity["x_opencti_order"]
+                ):
+                    return True
+                has_typed_marking_definitions = True
         # No entity marking defintions of the max_marking_definition type
-        if len(typed_entity_marking_definitions) == 0:
-            return True
-
-        # Check if level is less or equal to max
-        for typed_entity_marking_definition in typed_entity_marking_definitions:
-            if (
-                typed_entity_marking_definition["x_opencti_order"]
-                <= max_marking_definition_entity["x_opencti_order"]
-            ):
-                return True
-        return False
+        return not has_typed_marking_definitions
 
     def import_bundle_from_file(
         self, file_path: str, update: bool = False, types: List = None
@@ -263,6 +281,242 @@ class OpenCTIStix2:
             self.mapping_cache[name] = author
             return author
 
+    def resolve_id(self, stix_id: str) -> str:
+        """resolve a stix2 id to the OpenCTI id of an already imported object
+
+        :param stix_id: stix2 id
+        :type stix_id: str
+        :return: the cached OpenCTI id if known, the stix2 id otherwise
+        :rtype: str
+        """
+
+        cached = self.mapping_cache.get(stix_id)
+        if isinstance(cached, dict) and "id" in cached:
+            return cached["id"]
+        return stix_id
+
+    def get_embedded_labels(self, stix_object: Dict) -> List:
+        """get the labels of a stix2 object, with their color if known
+
+        :param stix_object: valid stix2 object
+        :type stix_object: dict
+        :return: list of (label, color) tuples
+        :rtype: list
+        """
+
+        if "labels" in stix_object:
+            return [(label, None) for label in stix_object["labels"]]
+        if "x_opencti_labels" in stix_object:
+            return [(label, None) for label in stix_object["x_opencti_labels"]]
+        labels = self.opencti.get_attribute_in_extension("labels", stix_object)
+        if labels is not None:
+            return [(label, None) for label in labels]
+        if "x_opencti_tags" in stix_object:
+            return [
+                (tag["value"], tag["color"] if "color" in tag else None)
+                for tag in stix_object["x_opencti_tags"]
+            ]
+        return []
+
+    def get_embedded_kill_chain_phases(self, stix_object: Dict) -> List:
+        """get the kill chain phases of a stix2 object
+
+        :param stix_object: valid stix2 object
+        :type stix_object: dict
+        :return: list of stix2 kill chain phases
+        :rtype: list
+        """
+
+        if "kill_chain_phases" in stix_object:
+            return stix_object["kill_chain_phases"]
+        kill_chain_phases = self.opencti.get_attribute_in_extension(
+            "kill_chain_phases", stix_object
+        )
+        return kill_chain_phases if kill_chain_phases is not None else []
+
+    def generate_kill_chain_phase_input(self, kill_chain_phase: Dict) -> Dict:
+        if (
+            "x_opencti_order" not in kill_chain_phase
+            and self.opencti.get_attribute_in_extension("order", kill_chain_phase)
+            is not None
+        ):
+            kill_chain_phase[
+                "x_opencti_order"
+            ] = self.opencti.get_attribute_in_extension("order", kill_chain_phase)
+        return {
+            "kill_chain_name": kill_chain_phase["kill_chain_name"],
+            "phase_name": kill_chain_phase["phase_name"],
+            "x_opencti_order": kill_chain_phase["x_opencti_order"]
+            if "x_opencti_order" in kill_chain_phase
+            else 0,
+            "stix_id": kill_chain_phase["id"] if "id" in kill_chain_phase else None,
+        }
+
+    @staticmethod
+    def generate_external_reference_input(external_reference: Dict) -> Dict:
+        return {
+            "source_name": external_reference["source_name"],
+            "url": external_reference["url"],
+            "external_id": external_reference["external_id"]
+            if "external_id" in external_reference
+            else None,
+            "description": external_reference["description"]
+            if "description" in external_reference
+            else None,
+        }
+
+    @staticmethod
+    def kill_chain_phase_key(kill_chain_phase: Dict) -> str:
+        """get the mapping cache key of a stix2 kill chain phase, its standard id"""
+
+        return KillChainPhase.generate_id(
+            kill_chain_phase["phase_name"], kill_chain_phase["kill_chain_name"]
+        )
+
+    @staticmethod
+    def external_reference_key(external_reference: Dict) -> str:
+        """get the mapping cache key of a stix2 external reference, its standard id"""
+
+        return ExternalReference.generate_id(
+            external_reference.get("url"),
+            external_reference.get("source_name"),
+            external_reference.get("external_id"),
+        )
+
+    def get_cached_vocabulary(self, key: str) -> Optional[Dict]:
+        """get a cached kill chain phase or external reference by standard id
+
+        :param key: the standard id of the kill chain phase or external reference
+        :type key: str
+        :return: the cached entry, None if neither cached nor known to exist
+        :rtype: dict
+        """
+
+        if key in self.mapping_cache:
+            return self.mapping_cache[key]
+        if key in self.known_ids:
+            return {"id": key}
+        return None
+
+    def preload_known_ids(self, page_size: int = 500) -> int:
+        """load the standard ids of the kill chain phases and external references
+        existing in the platform
+
+        Embedded kill chain phases and external references already known are
+        referenced by standard id without being created again.
+
+        :param page_size: number of entities fetched per request, defaults to 500
+        :type page_size: int, optional
+        :return: the number of known standard ids
+        :rtype: int
+        """
+
+        for entity in [self.opencti.kill_chain_phase, self.opencti.external_reference]:
+            after = None
+            while True:
+                result = entity.list(
+                    first=page_size,
+                    after=after,
+                    withPagination=True,
+                    projection="ids",
+                )
+                self.known_ids.update(
+                    item["standard_id"] for item in result["entities"]
+                )
+                if not result["pagination"].get("hasNextPage"):
+                    break
+                after = result["pagination"]["endCursor"]
+        return len(self.known_ids)
+
+    def resolve_vocabulary(self, stix_objects: List, max_workers: int = 3) -> None:
+        """create the labels, kill chain phases and external references of many
+        stix2 objects in bulk
+
+        The distinct values which are not cached yet are created with aliased
+        mutations, the three kinds concurrently, and put in the mapping cache
+        so the import of the objects only has to look them up.
+
+        :param stix_objects: valid stix2 objects
+        :type stix_objects: list
+        :param max_workers: number of concurrent requests, defaults to 3
+        :type max_workers: int, optional
+        """
+
+        labels = {}
+        kill_chain_phases = {}
+        external_references = {}
+        for stix_object in stix_objects:
+            for label, color in self.get_embedded_labels(stix_object):
+                if "label_" + label not in self.mapping_cache and label not in labels:
+                    labels[label] = {"value": label, "color": color}
+            for kill_chain_phase in self.get_embedded_kill_chain_phases(stix_object):
+                key = self.kill_chain_phase_key(kill_chain_phase)
+                if (
+                    self.get_cached_vocabulary(key) is None
+                    and key not in kill_chain_phases
+                ):
+                    kill_chain_phases[key] = self.generate_kill_chain_phase_input(
+                        kill_chain_phase
+                    )
+            for external_reference in stix_object.get("external_references", []):
+                if "url" not in external_reference or (
+                    "source_name" not in external_reference
+                ):
+                    continue
+                key = self.external_reference_key(external_reference)
+                if (
+                    self.get_cached_vocabulary(key) is None
+                    and key not in external_references
+                ):
+                    external_references[key] = self.generate_external_reference_input(
+                        external_reference
+                    )
+
+        def create_labels():
+            results = self.opencti.label.create_bulk(labels=list(labels.values()))
+            for label, result in zip(labels.keys(), results):
+                if result["result"] is not None and "id" in result["result"]:
+                    self.mapping_cache["label_" + label] = result["result"]
+
+        def create_kill_chain_phases():
+            results = self.opencti.kill_chain_phase.create_bulk(
+                kill_chain_phases=list(kill_chain_phases.values())
+            )
+            for key, result in zip(kill_chain_phases.keys(), results):
+                if result["result"] is not None:
+                    self.mapping_cache[key] = {
+                        "id": result["result"]["id"],
+                        "type": result["result"]["entity_type"],
+                    }
+
+        def create_external_references():
+            results = self.opencti.external_reference.create_bulk(
+                external_references=list(external_references.values())
+            )
+            for key, result in zip(external_references.keys(), results):
+                if result["result"] is not None:
+                    self.mapping_cache[key] = {"id": result["result"]["id"]}
+
+        stages = []
+        if len(labels) > 0:
+            stages.append(create_labels)
+        if len(kill_chain_phases) > 0:
+            stages.append(create_kill_chain_phases)
+        if len(external_references) > 0:
+            stages.append(create_external_references)
+        if len(stages) > 1 and max_workers > 1:
+            # Stages are run with the request headers of the caller context
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(contextvars.copy_context().run, stage)
+                    for stage in stages
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for stage in stages:
+                stage()
+
     def extract_embedded_relationships(
         self, stix_object: Dict, types: List = None
     ) -> Dict:
@@ -297,133 +551,28 @@ class OpenCTIStix2:
         )
         # Object Tags
         object_label_ids = []
-        if "labels" in stix_object:
-            for label in stix_object["labels"]:
-                if "label_" + label in self.mapping_cache:
-                    label_data = self.mapping_cache["label_" + label]
-                else:
-                    label_data = self.opencti.label.create(value=label)
-                if label_data is not None and "id" in label_data:
-                    self.mapping_cache["label_" + label] = label_data
-                    object_label_ids.append(label_data["id"])
-        elif "x_opencti_labels" in stix_object:
-            for label in stix_object["x_opencti_labels"]:
-                if "label_" + label in self.mapping_cache:
-                    label_data = self.mapping_cache["label_" + label]
-                else:
-                    label_data = self.opencti.label.create(value=label)
-                if label_data is not None and "id" in label_data:
-                    self.mapping_cache["label_" + label] = label_data
-                    object_label_ids.append(label_data["id"])
-        elif self.opencti.get_attribute_in_extension("labels", stix_object) is not None:
-            for label in self.opencti.get_attribute_in_extension("labels", stix_object):
-                if "label_" + label in self.mapping_cache:
-                    label_data = self.mapping_cache["label_" + label]
-                else:
-                    label_data = self.opencti.label.create(value=label)
-                if label_data is not None and "id" in label_data:
-                    self.mapping_cache["label_" + label] = label_data
-                    object_label_ids.append(label_data["id"])
-        elif "x_opencti_tags" in stix_object:
-            for tag in stix_object["x_opencti_tags"]:
-                label = tag["value"]
-                color = tag["color"] if "color" in tag else None
-                if "label_" + label in self.mapping_cache:
-                    label_data = self.mapping_cache["label_" + label]
-                else:
-                    label_data = self.opencti.label.create(value=label, color=color)
-                if label_data is not None and "id" in label_data:
-                    self.mapping_cache["label_" + label] = label_data
-                    object_label_ids.append(label_data["id"])
+        for label, color in self.get_embedded_labels(stix_object):
+            if "label_" + label in self.mapping_cache:
+                label_data = self.mapping_cache["label_" + label]
+            else:
+                label_data = self.opencti.label.create(value=label, color=color)
+            if label_data is not None and "id" in label_data:
+                self.mapping_cache["label_" + label] = label_data
+                object_label_ids.append(label_data["id"])
         # Kill Chain Phases
         kill_chain_phases_ids = []
-        if "kill_chain_phases" in stix_object:
-            for kill_chain_phase in stix_object["kill_chain_phases"]:
-                if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
-                    in self.mapping_cache
-                ):
-                    kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ]
-                else:
-                    if (
-                        "x_opencti_order" not in kill_chain_phase
-                        and self.opencti.get_attribute_in_extension(
-                            "order", kill_chain_phase
-                        )
-                        is not None
-                    ):
-                        kill_chain_phase[
-                            "x_opencti_order"
-                        ] = self.opencti.get_attribute_in_extension(
-                            "order", kill_chain_phase
-                        )
-                    kill_chain_phase = self.opencti.kill_chain_phase.create(
-                        kill_chain_name=kill_chain_phase["kill_chain_name"],
-                        phase_name=kill_chain_phase["phase_name"],
-                        x_opencti_order=kill_chain_phase["x_opencti_order"]
-                        if "x_opencti_order" in kill_chain_phase
-                        else 0,
-                        stix_id=kill_chain_phase["id"]
-                        if "id" in kill_chain_phase
-                        else None,
-                    )
-                    self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ] = {
-                        "id": kill_chain_phase["id"],
-                        "type": kill_chain_phase["entity_type"],
-                    }
-                kill_chain_phases_ids.append(kill_chain_phase["id"])
-        elif (
-            self.opencti.get_attribute_in_extension("kill_chain_phases", stix_object)
-            is not None
-        ):
-            for kill_chain_phase in self.opencti.get_attribute_in_extension(
-                "kill_chain_phases", stix_object
-            ):
-                if (
-                    kill_chain_phase["kill_chain_name"] + kill_chain_phase["phase_name"]
-                    in self.mapping_cache
-                ):
-                    kill_chain_phase = self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ]
-                else:
-                    if (
-                        "x_opencti_order" not in kill_chain_phase
-                        and self.opencti.get_attribute_in_extension(
-                            "order", kill_chain_phase
-                        )
-                        is not None
-                    ):
-                        kill_chain_phase[
-                            "x_opencti_order"
-                        ] = self.opencti.get_attribute_in_extension(
-                            "order", kill_chain_phase
-                        )
-                    kill_chain_phase = self.opencti.kill_chain_phase.create(
-                        kill_chain_name=kill_chain_phase["kill_chain_name"],
-                        phase_name=kill_chain_phase["phase_name"],
-                        x_opencti_order=kill_chain_phase["x_opencti_order"]
-                        if "x_opencti_order" in kill_chain_phase
-                        else 0,
-                        stix_id=kill_chain_phase["id"]
-                        if "id" in kill_chain_phase
-                        else None,
-                    )
-                    self.mapping_cache[
-                        kill_chain_phase["kill_chain_name"]
-                        + kill_chain_phase["phase_name"]
-                    ] = {
-                        "id": kill_chain_phase["id"],
-                        "type": kill_chain_phase["entity_type"],
-                    }
-                kill_chain_phases_ids.append(kill_chain_phase["id"])
+        for kill_chain_phase in self.get_embedded_kill_chain_phases(stix_object):
+            key = self.kill_chain_phase_key(kill_chain_phase)
+            kill_chain_phase_data = self.get_cached_vocabulary(key)
+            if kill_chain_phase_data is None:
+                kill_chain_phase_data = self.opencti.kill_chain_phase.create(
+                    **self.generate_kill_chain_phase_input(kill_chain_phase)
+                )
+                self.mapping_cache[key] = {
+                    "id": kill_chain_phase_data["id"],
+                    "type": kill_chain_phase_data["entity_type"],
+                }
+            kill_chain_phases_ids.append(kill_chain_phase_data["id"])
         # Object refs
         object_refs_ids = (
             stix_object["object_refs"] if "object_refs" in stix_object else []
@@ -434,22 +583,16 @@ class OpenCTIStix2:
         if "external_references" in stix_object:
             for external_reference in stix_object["external_references"]:
                 if "url" in external_reference and "source_name" in external_reference:
-                    url = external_reference["url"]
                     source_name = external_reference["source_name"]
                 else:
                     continue
-                if url in self.mapping_cache:
-                    external_reference_id = self.mapping_cache[url]["id"]
+                key = self.external_reference_key(external_reference)
+                external_reference_data = self.get_cached_vocabulary(key)
+                if external_reference_data is not None:
+                    external_reference_id = external_reference_data["id"]
                 else:
                     external_reference_id = self.opencti.external_reference.create(
-                        source_name=source_name,
-                        url=url,
-                        external_id=external_reference["external_id"]
-                        if "external_id" in external_reference
-                        else None,
-                        description=external_reference["description"]
-                        if "description" in external_reference
-                        else None,
+                        **self.generate_external_reference_input(external_reference)
                     )["id"]
                 if "x_opencti_files" in external_reference:
                     for file in external_reference["x_opencti_files"]:
@@ -472,7 +615,7 @@ class OpenCTIStix2:
                             data=base64.b64decode(file["data"]),
                             mime_type=file["mime_type"],
                         )
-                self.mapping_cache[url] = {"id": external_reference_id}
+                self.mapping_cache[key] = {"id": external_reference_id}
                 external_references_ids.append(external_reference_id)
                 if stix_object["type"] in [
                     "threat-actor",
@@ -530,22 +673,11 @@ class OpenCTIStix2:
                             title + " (" + str(external_reference["external_id"]) + ")"
                         )
 
-                    if "marking_tlpwhite" in self.mapping_cache:
-                        object_marking_ref_result = self.mapping_cache[
-                            "marking_tlpwhite"
-                        ]
-                    else:
-                        object_marking_ref_result = (
-                            self.opencti.marking_definition.read(
-                                filters=[
-                                    {"key": "definition_type", "values": ["TLP"]},
-                                    {"key": "definition", "values": ["TLP:WHITE"]},
-                                ]
-                            )
+                    object_marking_ref_result = (
+                        self.opencti.marking_definition.find_indexed(
+                            definition_type="TLP", definition="TLP:WHITE"
                         )
-                        self.mapping_cache["marking_tlpwhite"] = {
-                            "id": object_marking_ref_result["id"]
-                        }
+                    )
 
                     author = self.resolve_author(title)
                     report = self.opencti.report.create(
@@ -700,6 +832,84 @@ class OpenCTIStix2:
     def import_observable(
         self, stix_object: Dict, update: bool = False, types: List = None
     ) -> None:
+        stix_observable_result = self.opencti.stix_cyber_observable.create(
+            **self.prepare_observable(stix_object, update, types)
+        )
+        if stix_observable_result is not None:
+            self.import_observable_relationships(
+                self.process_observable_result(stix_object, stix_observable_result)
+            )
+        else:
+            return None
+
+    def import_observables(
+        self, stix_objects: List, update: bool = False, types: List = None
+    ) -> None:
+        """import many stix2 observables, using bulk creation if there are enough
+
+        :param stix_objects: list of valid stix2 observables
+        :type stix_objects: list
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        """
+
+        if len(stix_objects) < OBSERVABLES_BULK_THRESHOLD:
+            for stix_object in stix_objects:
+                self.import_observable(stix_object, update, types)
+            return None
+        observables = [
+            self.prepare_observable(stix_object, update, types)
+            for stix_object in stix_objects
+        ]
+        results = self.opencti.stix_cyber_observable.create_bulk(
+            observables=observables
+        )
+        relationships = []
+        errors = []
+        for stix_object, result in zip(stix_objects, results):
+            if result["result"] is not None:
+                relationships.extend(
+                    self.process_observable_result(stix_object, result["result"])
+                )
+            elif result["error"] is not None:
+                errors.append(result["error"])
+        self.import_observable_relationships(relationships)
+        if len(errors) > 0:
+            raise ValueError(errors[0])
+
+    def import_observable_relationships(self, relationships: List) -> None:
+        """create the refs relationships of imported observables in bulk
+
+        :param relationships: list of (fromId, toId, relationship_type, attributes) tuples
+        :type relationships: list
+        """
+
+        if len(relationships) == 0:
+            return None
+        results = self.opencti.stix_cyber_observable_relationship.create_bulk(
+            relationships=relationships
+        )
+        for result in results:
+            if result["error"] is not None:
+                raise ValueError(result["error"])
+
+    def prepare_observable(
+        self, stix_object: Dict, update: bool = False, types: List = None
+    ) -> Dict:
+        """prepare the creation arguments of a stix2 observable
+
+        :param stix_object: valid stix2 observable
+        :type stix_object: dict
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        :return: arguments of `stix_cyber_observable.create`
+        :rtype: dict
+        """
+
         # Extract
         embedded_relationships = self.extract_embedded_relationships(stix_object, types)
         created_by_id = embedded_relationships["created_by"]
@@ -721,7 +931,7 @@ class OpenCTIStix2:
             "reports": reports,
         }
         if stix_object["type"] == "simple-observable":
-            stix_observable_result = self.opencti.stix_cyber_observable.create(
+            return dict(
                 simple_observable_id=stix_object["id"],
                 simple_observable_key=stix_object["key"],
                 simple_observable_value=stix_object["value"]
@@ -751,7 +961,7 @@ class OpenCTIStix2:
                 update=update,
             )
         else:
-            stix_observable_result = self.opencti.stix_cyber_observable.create(
+            return dict(
                 observableData=stix_object,
                 createdBy=extras["created_by_id"]
                 if "created_by_id" in extras
@@ -767,66 +977,156 @@ class OpenCTIStix2:
                 else [],
                 update=update,
             )
-        if stix_observable_result is not None:
-            # Add files
-            if "x_opencti_files" in stix_object:
-                for file in stix_object["x_opencti_files"]:
-                    self.opencti.stix_cyber_observable.add_file(
-                        id=stix_observable_result["id"],
-                        file_name=file["name"],
-                        data=base64.b64decode(file["data"]),
-                        mime_type=file["mime_type"],
-                    )
-            if (
-                self.opencti.get_attribute_in_extension("files", stix_object)
-                is not None
-            ):
-                for file in self.opencti.get_attribute_in_extension(
-                    "files", stix_object
-                ):
-                    self.opencti.stix_cyber_observable.add_file(
-                        id=stix_observable_result["id"],
-                        file_name=file["name"],
-                        data=base64.b64decode(file["data"]),
-                        mime_type=file["mime_type"],
-                    )
-            if "id" in stix_object:
-                self.mapping_cache[stix_object["id"]] = {
-                    "id": stix_observable_result["id"],
-                    "type": stix_observable_result["entity_type"],
-                }
-            self.mapping_cache[stix_observable_result["id"]] = {
+
+    def process_observable_result(
+        self, stix_object: Dict, stix_observable_result: Dict
+    ) -> List:
+        """attach files and cache an imported observable
+
+        :param stix_object: valid stix2 observable
+        :type stix_object: dict
+        :param stix_observable_result: the created observable
+        :type stix_observable_result: dict
+        :return: the refs relationships to create, as (fromId, toId, relationship_type, attributes) tuples
+        :rtype: list
+        """
+
+        # Add files
+        if "x_opencti_files" in stix_object:
+            for file in stix_object["x_opencti_files"]:
+                self.opencti.stix_cyber_observable.add_file(
+                    id=stix_observable_result["id"],
+                    file_name=file["name"],
+                    data=base64.b64decode(file["data"]),
+                    mime_type=file["mime_type"],
+                )
+        if self.opencti.get_attribute_in_extension("files", stix_object) is not None:
+            for file in self.opencti.get_attribute_in_extension("files", stix_object):
+                self.opencti.stix_cyber_observable.add_file(
+                    id=stix_observable_result["id"],
+                    file_name=file["name"],
+                    data=base64.b64decode(file["data"]),
+                    mime_type=file["mime_type"],
+                )
+        if "id" in stix_object:
+            self.mapping_cache[stix_object["id"]] = {
                 "id": stix_observable_result["id"],
                 "type": stix_observable_result["entity_type"],
             }
-            # Iterate over refs to create appropriate relationships
-            for key in stix_object.keys():
-                if key not in [
-                    "created_by_ref",
-                    "object_marking_refs",
-                    "x_opencti_created_by_ref",
-                ]:
-                    if key.endswith("_ref"):
-                        relationship_type = key.replace("_ref", "").replace("_", "-")
-                        self.opencti.stix_cyber_observable_relationship.create(
-                            fromId=stix_observable_result["id"],
-                            toId=stix_object[key],
-                            relationship_type=relationship_type,
+        self.mapping_cache[stix_observable_result["id"]] = {
+            "id": stix_observable_result["id"],
+            "type": stix_observable_result["entity_type"],
+        }
+        # Iterate over refs to list appropriate relationships
+        relationships = []
+        for key in stix_object.keys():
+            if key not in [
+                "created_by_ref",
+                "object_marking_refs",
+                "x_opencti_created_by_ref",
+            ]:
+                if key.endswith("_ref"):
+                    relationship_type = key.replace("_ref", "").replace("_", "-")
+                    relationships.append(
+                        (
+                            stix_observable_result["id"],
+                            self.resolve_id(stix_object[key]),
+                            relationship_type,
+                            None,
                         )
-                    elif key.endswith("_refs"):
-                        relationship_type = key.replace("_refs", "").replace("_", "-")
-                        for value in stix_object[key]:
-                            self.opencti.stix_cyber_observable_relationship.create(
-                                fromId=stix_observable_result["id"],
-                                toId=value,
-                                relationship_type=relationship_type,
+                    )
+                elif key.endswith("_refs"):
+                    relationship_type = key.replace("_refs", "").replace("_", "-")
+                    for value in stix_object[key]:
+                        relationships.append(
+                            (
+                                stix_observable_result["id"],
+                                self.resolve_id(value),
+                                relationship_type,
+                                None,
                             )
-        else:
-            return None
+                        )
+        return relationships
 
     def import_relationship(
         self, stix_relation: Dict, update: bool = False, types: List = None
     ) -> None:
+        arguments, extras = self.prepare_relationship(stix_relation, update, types)
+        if arguments is None:
+            return None
+        stix_relation_result = self.opencti.stix_core_relationship.create(**arguments)
+        if stix_relation_result is not None:
+            self.process_relationship_result(
+                stix_relation, stix_relation_result, extras
+            )
+        else:
+            return None
+
+    def import_relationships(
+        self, stix_relations: List, update: bool = False, types: List = None
+    ) -> None:
+        """import many stix2 relationships, using bulk creation if there are enough
+
+        :param stix_relations: list of valid stix2 relationships
+        :type stix_relations: list
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        """
+
+        if len(stix_relations) < RELATIONSHIPS_BULK_THRESHOLD:
+            for stix_relation in stix_relations:
+                self.import_relationship(stix_relation, update, types)
+            return None
+        prepared = []
+        relationships = []
+        for stix_relation in stix_relations:
+            arguments, extras = self.prepare_relationship(stix_relation, update, types)
+            if arguments is None:
+                continue
+            prepared.append((stix_relation, extras))
+            relationships.append(
+                (
+                    arguments["fromId"],
+                    arguments["toId"],
+                    arguments["relationship_type"],
+                    {
+                        key: value
+                        for key, value in arguments.items()
+                        if key not in ["fromId", "toId", "relationship_type"]
+                    },
+                )
+            )
+        results = self.opencti.stix_core_relationship.create_bulk(
+            relationships=relationships
+        )
+        errors = []
+        for (stix_relation, extras), result in zip(prepared, results):
+            if result["result"] is not None:
+                self.process_relationship_result(
+                    stix_relation, result["result"], extras
+                )
+            elif result["error"] is not None:
+                errors.append(result["error"])
+        if len(errors) > 0:
+            raise ValueError(errors[0])
+
+    def prepare_relationship(
+        self, stix_relation: Dict, update: bool = False, types: List = None
+    ) -> Tuple[Optional[Dict], Dict]:
+        """prepare the creation arguments of a stix2 relationship
+
+        :param stix_relation: valid stix2 relationship
+        :type stix_relation: dict
+        :param update: whether to updated data in the database, defaults to False
+        :type update: bool, optional
+        :param types: list of stix2 types, defaults to None
+        :type types: list, optional
+        :return: arguments of `stix_core_relationship.create` and the relationship extras
+        :rtype: tuple
+        """
+
         # Extract
         embedded_relationships = self.extract_embedded_relationships(
             stix_relation, types
@@ -883,19 +1183,35 @@ class OpenCTIStix2:
                     except:
                         date = None
 
-        stix_relation_result = self.opencti.stix_core_relationship.import_from_stix2(
+        arguments = self.opencti.stix_core_relationship.prepare_import_from_stix2(
             stixRelation=stix_relation, extras=extras, update=update, defaultDate=date
         )
-        if stix_relation_result is not None:
-            self.mapping_cache[stix_relation["id"]] = {
-                "id": stix_relation_result["id"],
-                "type": stix_relation_result["entity_type"],
-            }
-        else:
-            return None
+        if arguments is not None:
+            arguments["fromId"] = self.resolve_id(arguments["fromId"])
+            arguments["toId"] = self.resolve_id(arguments["toId"])
+        return arguments, extras
+
+    def process_relationship_result(
+        self, stix_relation: Dict, stix_relation_result: Dict, extras: Dict
+    ) -> None:
+        """cache an imported relationship and add it to its external reports
+
+        :param stix_relation: valid stix2 relationship
+        :type stix_relation: dict
+        :param stix_relation_result: the created relationship
+        :type stix_relation_result: dict
+        :param extras: the relationship extras returned by `prepare_relationship`
+        :type extras: dict
+        """
+
+        self.mapping_cache[stix_relation["id"]] = {
+            "id": stix_relation_result["id"],
+            "type": stix_relation_result["entity_type"],
+        }
 
         # Add external references
-        for external_reference_id in external_references_ids:
+        reports = extras["reports"]
+        for external_reference_id in extras["external_references_ids"]:
             if external_reference_id in reports:
                 self.opencti.report.add_stix_object_or_stix_relationship(
                     id=reports[external_reference_id]["id"],
@@ -1152,6 +1468,7 @@ class OpenCTIStix2:
         mode: str = "simple",
         max_marking_definition_entity: Dict = None,
         no_custom_attributes: bool = False,
+        observable_relationships: List = None,
     ) -> List:
         if (
             self.check_max_marking_definition(
@@ -1318,8 +1635,11 @@ class OpenCTIStix2:
 
         # StixCyberObservable
         if entity["type"] in STIX_CYBER_OBSERVABLE_MAPPING:
+            # Relationships may be prefetched with the ones of other entities
             stix_observable_relationships = (
-                self.opencti.stix_cyber_observable_relationship.list(
+                observable_relationships
+                if observable_relationships is not None
+                else self.opencti.stix_cyber_observable_relationship.list(
                     fromId=entity["x_opencti_id"]
                 )
             )
@@ -1457,26 +1777,26 @@ class OpenCTIStix2:
 
             # Export
             reader = {
-                "Attack-Pattern": self.opencti.attack_pattern.read,
-                "Campaign": self.opencti.campaign.read,
-                "Note": self.opencti.note.read,
-                "Observed-Data": self.opencti.observed_data.read,
-                "Opinion": self.opencti.opinion.read,
-                "Report": self.opencti.report.read,
-                "Course-Of-Action": self.opencti.course_of_action.read,
-                "Identity": self.opencti.identity.read,
-                "Indicator": self.opencti.indicator.read,
-                "Infrastructure": self.opencti.infrastructure.read,
-                "Intrusion-Set": self.opencti.intrusion_set.read,
-                "Location": self.opencti.location.read,
-                "Malware": self.opencti.malware.read,
-                "Threat-Actor": self.opencti.threat_actor.read,
-                "Tool": self.opencti.tool.read,
-                "Vulnerability": self.opencti.vulnerability.read,
-                "Incident": self.opencti.incident.read,
-                "Stix-Cyber-Observable": self.opencti.stix_cyber_observable.read,
-                "stix-core-relationship": self.opencti.stix_core_relationship.read,
-                "stix-sighting-relationship": self.opencti.stix_sighting_relationship.read,
+                "Attack-Pattern": self.opencti.attack_pattern.read_many,
+                "Campaign": self.opencti.campaign.read_many,
+                "Note": self.opencti.note.read_many,
+                "Observed-Data": self.opencti.observed_data.read_many,
+                "Opinion": self.opencti.opinion.read_many,
+                "Report": self.opencti.report.read_many,
+                "Course-Of-Action": self.opencti.course_of_action.read_many,
+                "Identity": self.opencti.identity.read_many,
+                "Indicator": self.opencti.indicator.read_many,
+                "Infrastructure": self.opencti.infrastructure.read_many,
+                "Intrusion-Set": self.opencti.intrusion_set.read_many,
+                "Location": self.opencti.location.read_many,
+                "Malware": self.opencti.malware.read_many,
+                "Threat-Actor": self.opencti.threat_actor.read_many,
+                "Tool": self.opencti.tool.read_many,
+                "Vulnerability": self.opencti.vulnerability.read_many,
+                "Incident": self.opencti.incident.read_many,
+                "Stix-Cyber-Observable": self.opencti.stix_cyber_observable.read_many,
+                "stix-core-relationship": self.opencti.stix_core_relationship.read_many,
+                "stix-sighting-relationship": self.opencti.stix_sighting_relationship.read_many,
             }
             # Get extra objects
             for entity_object in objects_to_get:
@@ -1498,13 +1818,22 @@ class OpenCTIStix2:
                 ):
                     entity_object["entity_type"] = "stix-cyber-observable-relationship"
 
-                do_read = reader.get(
-                    entity_object["entity_type"],
-                    lambda **kwargs: self.unknown_type(
-                        {"type": entity_object["entity_type"]}
-                    ),
+            # Read the extra objects of each type at once
+            ids_by_type = {}
+            for entity_object in objects_to_get:
+                ids_by_type.setdefault(entity_object["entity_type"], []).append(
+                    entity_object["id"]
                 )
-                entity_object_data = do_read(id=entity_object["id"])
+            entities_data = {}
+            for entity_type, ids in ids_by_type.items():
+                if entity_type in reader:
+                    entities_data[entity_type] = reader[entity_type](ids=ids)
+                else:
+                    self.unknown_type({"type": entity_type})
+            for entity_object in objects_to_get:
+                entity_object_data = entities_data.get(
+                    entity_object["entity_type"], {}
+                ).get(entity_object["id"])
                 stix_entity_object = self.prepare_export(
                     self.generate_export(entity_object_data),
                     "simple",
@@ -1514,9 +1843,12 @@ class OpenCTIStix2:
                 entity_object_bundle = self.filter_objects(uuids, stix_entity_object)
                 uuids = uuids + [x["id"] for x in entity_object_bundle]
                 result = result + entity_object_bundle
+            relations_data = self.opencti.stix_core_relationship.read_many(
+                ids=[relation_object["id"] for relation_object in relations_to_get]
+            )
             for relation_object in relations_to_get:
                 relation_object_data = self.prepare_export(
-                    self.opencti.stix_core_relationship.read(id=relation_object["id"])
+                    relations_data[relation_object["id"]]
                 )
                 relation_object_bundle = self.filter_objects(
                     uuids, relation_object_data
@@ -1584,7 +1916,7 @@ class OpenCTIStix2:
         no_custom_attributes: bool = False,
     ) -> Dict:
         max_marking_definition_entity = (
-            self.opencti.marking_definition.read(id=max_marking_definition)
+            self.opencti.marking_definition.read_indexed(id=max_marking_definition)
             if max_marking_definition is not None
             else None
         )
@@ -1640,30 +1972,30 @@ class OpenCTIStix2:
             bundle["objects"].extend(stix_objects)
         return bundle
 
-    def export_list(
+    def list_export_pages(
         self,
         entity_type: str,
         search: Dict = None,
         filters: List = None,
         order_by: str = None,
         order_mode: str = None,
-        max_marking_definition: Dict = None,
         types: List = None,
         fromId: str = None,
         toId: str = None,
         fromTypes: [str] = None,
         toTypes: [str] = None,
-    ) -> Dict:
-        max_marking_definition_entity = (
-            self.opencti.marking_definition.read(id=max_marking_definition)
-            if max_marking_definition is not None
-            else None
-        )
-        bundle = {
-            "type": "bundle",
-            "id": "bundle--" + str(uuid.uuid4()),
-            "objects": [],
-        }
+        page_size: int = 100,
+    ) -> Iterator[List]:
+        """list the entities to export, one page at a time
+
+        :param entity_type: the type of the entities to export
+        :type entity_type: str
+        :param page_size: number of entities per page
+        :type page_size: int
+        :return: iterator of the pages of entities
+        :rtype: Iterator[List]
+        """
+
         if entity_type == "StixFile":
             entity_type = "File"
 
@@ -1715,31 +2047,237 @@ class OpenCTIStix2:
         do_list = lister.get(
             entity_type, lambda **kwargs: self.unknown_type({"type": entity_type})
         )
-        entities_list = do_list(
-            search=search,
-            filters=filters,
-            orderBy=order_by,
-            orderMode=order_mode,
-            types=types,
-            getAll=True,
-            fromId=fromId,
-            toId=toId,
-            fromTypes=fromTypes,
-            toTypes=toTypes,
+        after = None
+        while True:
+            result = do_list(
+                search=search,
+                filters=filters,
+                orderBy=order_by,
+                orderMode=order_mode,
+                types=types,
+                first=page_size,
+                after=after,
+                withPagination=True,
+                fromId=fromId,
+                toId=toId,
+                fromTypes=fromTypes,
+                toTypes=toTypes,
+            )
+            if result is None:
+                return
+            yield result["entities"]
+            if not result["pagination"]["hasNextPage"]:
+                return
+            after = result["pagination"]["endCursor"]
+
+    def iter_export_list(
+        self,
+        entity_type: str,
+        search: Dict = None,
+        filters: List = None,
+        order_by: str = None,
+        order_mode: str = None,
+        max_marking_definition: Dict = None,
+        types: List = None,
+        fromId: str = None,
+        toId: str = None,
+        fromTypes: [str] = None,
+        toTypes: [str] = None,
+        page_size: int = 100,
+        max_workers: int = 4,
+    ) -> Iterator[Dict]:
+        """export the objects of a list of entities, without duplicates
+
+        Entities are listed and converted one page at a time, so the whole
+        list is never held in memory, only the ids already exported are kept.
+        The entities of a page are converted concurrently while the next page
+        is fetched, objects are produced in the order of the list.
+
+        :param entity_type: the type of the entities to export
+        :type entity_type: str
+        :param max_marking_definition: id of the max marking definition
+        :type max_marking_definition: str, optional
+        :param page_size: number of entities per page
+        :type page_size: int
+        :param max_workers: number of entities converted concurrently
+        :type max_workers: int
+        :return: iterator of the STIX objects
+        :rtype: Iterator[Dict]
+        """
+
+        max_marking_definition_entity = (
+            self.opencti.marking_definition.read_indexed(id=max_marking_definition)
+            if max_marking_definition is not None
+            else None
+        )
+        pages = self.list_export_pages(
+            entity_type,
+            search,
+            filters,
+            order_by,
+            order_mode,
+            types,
+            fromId,
+            toId,
+            fromTypes,
+            toTypes,
+            page_size,
         )
-        if entities_list is not None:
-            uuids = []
-            for entity in entities_list:
-                entity_bundle = self.prepare_export(
-                    self.generate_export(entity),
-                    "simple",
-                    max_marking_definition_entity,
+
+        def fetch_page() -> Optional[Tuple[List, Dict]]:
+            entities = next(pages, None)
+            if entities is None:
+                return None
+            entities = [self.generate_export(entity) for entity in entities]
+            # Prefetch the relationships of the observables of the page at once
+            observable_ids = [
+                entity["x_opencti_id"]
+                for entity in entities
+                if entity["type"] in STIX_CYBER_OBSERVABLE_MAPPING
+            ]
+            observable_relationships = (
+                self.opencti.stix_cyber_observable_relationship.list_many(
+                    fromIds=observable_ids
+                )
+                if len(observable_ids) > 0
+                else {}
+            )
+            return entities, observable_relationships
+
+        def export(entity: Dict, observable_relationships: Dict) -> Optional[List]:
+            return self.prepare_export(
+                entity,
+                "simple",
+                max_marking_definition_entity,
+                observable_relationships=observable_relationships.get(
+                    entity["x_opencti_id"]
+                ),
+            )
+
+        uuids = set()
+        if max_workers > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Tasks run in a copy of the context of the caller, to keep
+                # its request headers
+                next_page = executor.submit(contextvars.copy_context().run, fetch_page)
+                while True:
+                    page = next_page.result()
+                    if page is None:
+                        break
+                    next_page = executor.submit(
+                        contextvars.copy_context().run, fetch_page
+                    )
+                    entities, observable_relationships = page
+                    futures = [
+                        executor.submit(
+                            contextvars.copy_context().run,
+                            export,
+                            entity,
+                            observable_relationships,
+                        )
+                        for entity in entities
+                    ]
+                    for future in futures:
+                        yield from self.filter_export(uuids, future.result())
+        else:
+            while True:
+                page = fetch_page()
+                if page is None:
+                    break
+                entities, observable_relationships = page
+                for entity in entities:
+                    yield from self.filter_export(
+                        uuids, export(entity, observable_relationships)
+                    )
+
+    @staticmethod
+    def filter_export(uuids: Set, objects: Optional[List]) -> Iterator[Dict]:
+        """filters exported objects not already in a set of ids, adding their ids
+
+        :param uuids: set of the ids already exported
+        :type uuids: set
+        :param objects: list of objects to filter
+        :type objects: list
+        :return: iterator of the objects not exported yet
+        :rtype: Iterator[Dict]
+        """
+
+        if objects is not None:
+            for item in objects:
+                if "id" in item and item["id"] not in uuids:
+                    uuids.add(item["id"])
+                    yield item
+
+    def stream_export_list(self, entity_type: str, **kwargs) -> Iterator[str]:
+        """export a list of entities as chunks of a STIX2 bundle
+
+        The bundle header, each object and the footer are produced as they are
+        exported, see `iter_export_list` for the parameters.
+
+        :param entity_type: the type of the entities to export
+        :type entity_type: str
+        :return: iterator of the JSON chunks of the bundle
+        :rtype: Iterator[str]
+        """
+
+        yield '{"type": "bundle", "id": "bundle--' + str(
+            uuid.uuid4()
+        ) + '", "objects": ['
+        separator = ""
+        for item in self.iter_export_list(entity_type, **kwargs):
+            yield separator + opencti_json.dumps_str(item)
+            separator = ", "
+        yield "]}"
+
+    def write_export_list(self, output: IO, entity_type: str, **kwargs) -> None:
+        """export a list of entities as a STIX2 bundle written to a file
+
+        See `iter_export_list` for the parameters.
+
+        :param output: text file-like object to write the bundle to
+        :type output: IO
+        :param entity_type: the type of the entities to export
+        :type entity_type: str
+        """
+
+        for chunk in self.stream_export_list(entity_type, **kwargs):
+            output.write(chunk)
+
+    def export_list(
+        self,
+        entity_type: str,
+        search: Dict = None,
+        filters: List = None,
+        order_by: str = None,
+        order_mode: str = None,
+        max_marking_definition: Dict = None,
+        types: List = None,
+        fromId: str = None,
+        toId: str = None,
+        fromTypes: [str] = None,
+        toTypes: [str] = None,
+        max_workers: int = 4,
+    ) -> Dict:
+        bundle = {
+            "type": "bundle",
+            "id": "bundle--" + str(uuid.uuid4()),
+            "objects": list(
+                self.iter_export_list(
+                    entity_type,
+                    search,
+                    filters,
+                    order_by,
+                    order_mode,
+                    max_marking_definition,
+                    types,
+                    fromId,
+                    toId,
+                    fromTypes,
+                    toTypes,
+                    max_workers=max_workers,
                 )
-                if entity_bundle is not None:
-                    entity_bundle_filtered = self.filter_objects(uuids, entity_bundle)
-                    for x in entity_bundle_filtered:
-                        uuids.append(x["id"])
-                    bundle["objects"] = bundle["objects"] + entity_bundle_filtered
+            ),
+        }
         return bundle
 
     def import_bundle(
@@ -1766,19 +2304,52 @@ class OpenCTIStix2:
             bundles = stix2_splitter.split_bundle(stix_bundle, False, event_version)
         except RecursionError:
             bundles = [stix_bundle]
+        # Create the vocabulary of the whole bundle before the objects, when
+        # no scope restricts the imported objects
+        if types is None or len(types) == 0:
+            self.resolve_vocabulary(
+                [
+                    item
+                    for bundle in bundles
+                    for item in bundle["objects"]
+                    if "x_opencti_patch" not in item
+                ]
+            )
         # Import every elements in a specific order
         imported_elements = []
+        # Consecutive observables are imported together
+        pending_observables = []
+        # Relationships of the same bundle level are imported together
+        pending_relationships = []
+        pending_relationships_level = None
 
         # Marking definitions
         for bundle in bundles:
             for item in bundle["objects"]:
+                if len(pending_observables) > 0 and (
+                    not StixCyberObservableTypes.has_value(item["type"])
+                    or "x_opencti_patch" in item
+                ):
+                    self.import_observables(pending_observables, update, types)
+                    pending_observables = []
+                if len(pending_relationships) > 0 and (
+                    item["type"] != "relationship"
+                    or bundle.get("x_opencti_seq") != pending_relationships_level
+                    or "x_opencti_patch" in item
+                ):
+                    self.import_relationships(pending_relationships, update, types)
+                    pending_relationships = []
                 if "x_opencti_event_version" in bundle:
                     if bundle["x_opencti_event_version"] == "3":
                         if "x_opencti_patch" in item:
                             self.stix2_update.process_update(item)
                             continue
                 if item["type"] == "relationship":
-                    self.import_relationship(item, update, types)
+                    if "x_opencti_seq" in bundle:
+                        pending_relationships.append(item)
+                        pending_relationships_level = bundle["x_opencti_seq"]
+                    else:
+                        self.import_relationship(item, update, types)
                 elif item["type"] == "sighting":
                     # Resolve the to
                     to_ids = []
@@ -1834,9 +2405,9 @@ class OpenCTIStix2:
                     )
                 elif StixCyberObservableTypes.has_value(item["type"]):
                     if types is None or len(types) == 0:
-                        self.import_observable(item, update, types)
+                        pending_observables.append(item)
                     elif item["type"] in types or "observable" in types:
-                        self.import_observable(item, update, types)
+                        pending_observables.append(item)
                 else:
                     # Check the scope
                     if (
@@ -1876,5 +2447,9 @@ class OpenCTIStix2:
                                 ):
                                     self.import_object(item, update, types)
                 imported_elements.append({"id": item["id"], "type": item["type"]})
+        if len(pending_observables) > 0:
+            self.import_observables(pending_observables, update, types)
+        if len(pending_relationships) > 0:
+            self.import_relationships(pending_relationships, update, types)
 
         return imported_elements
@@ -1,6 +1,7 @@
-import json
 import uuid
 
+from pycti.utils import opencti_json
+
 
 class OpenCTIStix2Splitter:
     def __init__(self):
@@ -47,7 +48,7 @@ class OpenCTIStix2Splitter:
         """
         if use_json:
             try:
-                bundle_data = json.loads(bundle)
+                bundle_data = opencti_json.loads(bundle)
             except:
                 raise Exception("File data is not a valid JSON")
         else:
@@ -106,4 +107,4 @@ class OpenCTIStix2Splitter:
         }
         if event_version is not None:
             bundle["x_opencti_event_version"] = event_version
-        return json.dumps(bundle) if use_json else bundle
+        return opencti_json.dumps_str(bundle) if use_json else bundle
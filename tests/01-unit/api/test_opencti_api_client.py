@@ -0,0 +1,103 @@
+import pytest
+
+from pycti.api.opencti_api_client import OpenCTIApiClient
+
+
+def test_query_batch_request_headers(mock_client: OpenCTIApiClient, mock_server):
+    mock_server.resolve("indicator", lambda arguments: {"id": arguments["id"]})
+    items = [{"id": str(index)} for index in range(10)]
+    with mock_client.request_headers_context({"opencti-applicant-id": "applicant"}):
+        results = mock_client.query_batch(
+            "query", "indicator", {"id": "String!"}, items, "id", 2, max_workers=4
+        )
+    assert [data["id"] for data, _ in results] == [item["id"] for item in items]
+    assert mock_server.applicants == {"applicant": 5}
+
+
+def test_read_many(mock_client: OpenCTIApiClient, mock_server):
+    entities = {str(index): {"id": str(index), "name": "Entity"} for index in range(60)}
+    mock_server.resolve("indicator", lambda arguments: entities.get(arguments["id"]))
+    ids = list(entities.keys()) + ["missing", "0"]
+    result = mock_client.read_many("indicator", ids, "id name")
+    assert list(result.keys()) == list(entities.keys()) + ["missing"]
+    assert result["59"]["name"] == "Entity"
+    assert result["missing"] is None
+    assert mock_server.requests == 2
+
+
+def test_read_many_error(mock_client: OpenCTIApiClient, mock_server):
+    mock_server.resolve("indicator", lambda arguments: {"id": arguments["id"]})
+    mock_server.inject_error("indicator", message="Forbidden", name="ForbiddenAccess")
+    with pytest.raises(ValueError, match="Forbidden"):
+        mock_client.read_many("indicator", ["a", "b"], "id")
+
+
+def test_read_many_entities(mock_client: OpenCTIApiClient, mock_server):
+    entities = {str(index): {"id": str(index), "name": "Entity"} for index in range(5)}
+    mock_server.resolve("indicator", lambda arguments: entities.get(arguments["id"]))
+    result = mock_client.indicator.read_many(
+        ids=list(entities.keys()), customAttributes="id name", batchSize=2, maxWorkers=2
+    )
+    assert list(result.keys()) == list(entities.keys())
+    assert all(entity["name"] == "Entity" for entity in result.values())
+    assert mock_server.requests == 3
+    assert mock_client.indicator.read_many() is None
+
+
+def test_query_batch_order(mock_client: OpenCTIApiClient, mock_server):
+    mock_server.jitter = 0.02
+    mock_server.resolve("indicator", lambda arguments: {"id": arguments["id"]})
+    items = [{"id": str(index)} for index in range(25)]
+    results = mock_client.query_batch(
+        "query", "indicator", {"id": "String!"}, items, "id", 3, max_workers=4
+    )
+    # Chunks complete in any order, results keep the order of the items
+    assert [data["id"] for data, _ in results] == [item["id"] for item in items]
+    assert all(error is None for _, error in results)
+    assert mock_server.requests == 9
+
+
+def test_query_batch_errors(mock_client: OpenCTIApiClient, mock_server):
+    def resolve(arguments):
+        if arguments["id"] == "forbidden":
+            raise PermissionError("Forbidden")
+        return {"id": arguments["id"]}
+
+    mock_server.resolve("indicator", resolve)
+    items = [{"id": "a"}, {"id": "forbidden"}, {"id": "b"}]
+    results = mock_client.query_batch(
+        "query", "indicator", {"id": "String!"}, items, "id"
+    )
+    # An error on a path fails its own item only
+    assert results == [
+        ({"id": "a"}, None),
+        (None, {"name": "PermissionError", "message": "Forbidden"}),
+        ({"id": "b"}, None),
+    ]
+
+
+def test_query_batch_global_error(mock_client: OpenCTIApiClient, mock_server):
+    mock_server.execute = lambda payload, headers=None: {
+        "errors": [{"name": "AuthRequired", "message": "You must be logged in"}],
+        "data": None,
+    }
+    items = [{"id": "a"}, {"id": "b"}]
+    results = mock_client.query_batch(
+        "query", "indicator", {"id": "String!"}, items, "id"
+    )
+    # An error without path fails every item of the request
+    error = {"name": "AuthRequired", "message": "You must be logged in"}
+    assert results == [(None, error), (None, error)]
+
+
+def test_query_batch_request_error(mock_client: OpenCTIApiClient, mock_server):
+    mock_server.resolve("indicator", lambda arguments: {"id": arguments["id"]})
+    mock_server.http_error_rate = 1
+    items = [{"id": str(index)} for index in range(5)]
+    results = mock_client.query_batch(
+        "query", "indicator", {"id": "String!"}, items, "id", 2, max_workers=2
+    )
+    # A failed request fails the items of its chunk, not the whole batch call
+    assert [error["name"] for _, error in results] == ["RequestError"] * 5
+    assert all(data is None for data, _ in results)
+    assert mock_server.failed_requests == 3
@@ -0,0 +1,150 @@
+import time
+
+import pytest
+
+from pycti.api.opencti_api_work import OpenCTIApiWork, WorkTracker
+
+
+class FakeApi:
+    def __init__(self, works, errors=None):
+        self.works = works
+        self.errors = errors or {}
+        self.requests = 0
+
+    def query_batch(
+        self, operation, field, argument_types, items, selection, batch_size
+    ):
+        self.requests += 1
+        return [
+            (self.works.get(item["id"]), self.errors.get(item["id"])) for item in items
+        ]
+
+    def log(self, level, message):
+        pass
+
+
+def work(status, processed=0, errors=None):
+    return {
+        "id": "work",
+        "status": status,
+        "tracking": {"import_expected_number": 2, "import_processed_number": processed},
+        "errors": errors or [],
+    }
+
+
+def test_get_works_status():
+    api = FakeApi({"a": work("complete")})
+    works = OpenCTIApiWork(api).get_works_status(["a", "b"])
+    assert works == {"a": work("complete"), "b": None}
+    assert api.requests == 1
+
+
+def test_wait_for_work_to_finish_timeout():
+    api = FakeApi({"a": work("progress")})
+    with pytest.raises(TimeoutError):
+        OpenCTIApiWork(api).wait_for_work_to_finish("a", timeout=0.05, interval=0.01)
+
+
+def test_tracker_poll():
+    api = FakeApi({"a": work("progress"), "b": work("wait")})
+    tracker = WorkTracker(OpenCTIApiWork(api))
+    done = tracker.track("a")
+    error = tracker.track("b")
+    expired = tracker.track("b", timeout=0)
+    assert tracker.poll() is True
+    assert api.requests == 1
+    assert expired.exception() is not None
+    assert not done.done() and not error.done()
+    assert tracker.poll() is False
+    api.works["a"] = work("complete", 2)
+    api.works["b"] = work("progress", errors=[{"message": "failure"}])
+    assert tracker.poll() is True
+    assert done.result()["status"] == "complete"
+    assert error.result()["errors"] == [{"message": "failure"}]
+    assert tracker.tracked == {}
+
+
+def test_tracker_batches_tracked_works():
+    api = FakeApi({work_id: work("complete") for work_id in ("a", "b", "c")})
+    tracker = WorkTracker(OpenCTIApiWork(api), interval=0.5)
+    tracker.start()
+    try:
+        futures = []
+        for work_id in ("a", "b", "c"):
+            futures.append(tracker.track(work_id))
+            time.sleep(0.1)
+        # Works tracked one at a time wait for the same poll
+        assert api.requests == 0
+        for future in futures:
+            assert future.result(timeout=5)["status"] == "complete"
+        assert api.requests == 1
+    finally:
+        tracker.stop()
+
+
+def test_get_works_status_error():
+    forbidden = {"name": "ForbiddenAccess", "message": "Forbidden"}
+    not_found = {"name": "NOT_FOUND", "message": "Work not found"}
+    api = FakeApi({"a": work("complete")}, {"b": not_found})
+    assert OpenCTIApiWork(api).get_works_status(["a", "b"]) == {
+        "a": work("complete"),
+        "b": None,
+    }
+    api.errors["a"] = forbidden
+    with pytest.raises(ValueError):
+        OpenCTIApiWork(api).get_works_status(["a", "b"])
+
+
+def test_wait_for_work_to_finish_error():
+    api = FakeApi({}, {"a": {"name": "RequestError", "message": "Timeout"}})
+    with pytest.raises(ValueError, match="Timeout"):
+        OpenCTIApiWork(api).wait_for_work_to_finish("a", interval=0.01)
+    with pytest.raises(ValueError, match="not found"):
+        OpenCTIApiWork(api).wait_for_work_to_finish("b", interval=0.01)
+
+
+def test_tracker_poll_error():
+    api = FakeApi(
+        {"a": work("progress")},
+        {"b": {"name": "ForbiddenAccess", "message": "Forbidden"}},
+    )
+    tracker = WorkTracker(OpenCTIApiWork(api))
+    pending = tracker.track("a")
+    error = tracker.track("b")
+    missing = tracker.track("c")
+    assert tracker.poll() is True
+    assert not pending.done()
+    with pytest.raises(ValueError, match="Forbidden"):
+        error.result()
+    with pytest.raises(ValueError, match="not found"):
+        missing.result()
+    assert list(tracker.tracked.keys()) == ["a"]
+
+
+def test_tracker_timeout_before_poll():
+    api = FakeApi({"a": work("progress")})
+    tracker = WorkTracker(OpenCTIApiWork(api), interval=30)
+    tracker.start()
+    try:
+        start = time.monotonic()
+        future = tracker.track("a", timeout=0.1)
+        # The timeout does not wait for the next poll
+        assert isinstance(future.exception(timeout=5), TimeoutError)
+        assert time.monotonic() - start < 5
+        assert api.requests == 0
+    finally:
+        tracker.stop()
+
+
+def test_track_after_stop():
+    api = FakeApi({"a": work("progress")})
+    api_work = OpenCTIApiWork(api)
+    pending = api_work.track("a")
+    api_work.stop()
+    assert pending.cancelled()
+    api.works["a"] = work("complete", 2)
+    assert api_work.track("a").result(timeout=5)["status"] == "complete"
+    # A tracker stopped on its own is replaced as well
+    api_work.tracker.stop()
+    assert api_work.track("a").result(timeout=5)["status"] == "complete"
+    api_work.stop()
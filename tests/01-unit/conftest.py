@@ -0,0 +1,17 @@
+import pytest
+
+from pycti import OpenCTIApiClient
+from tests.mock.opencti_server import MockOpenCTIServer
+
+
+@pytest.fixture
+def mock_server():
+    with MockOpenCTIServer() as server:
+        yield server
+
+
+@pytest.fixture
+def mock_client(mock_server):
+    client = OpenCTIApiClient(mock_server.url, "token", log_level="error")
+    mock_server.reset()
+    return client
@@ -0,0 +1,20 @@
+import pytest
+
+from tests.mock.broker import InMemoryBroker
+from tests.mock.opencti_platform import MockOpenCTIPlatform
+
+
+@pytest.fixture
+def broker():
+    return InMemoryBroker()
+
+
+@pytest.fixture
+def platform(broker):
+    with MockOpenCTIPlatform(broker=broker) as platform, broker.patch():
+        yield platform
+
+
+@pytest.fixture
+def helper(create_helper):
+    return create_helper(listen_workers=4)
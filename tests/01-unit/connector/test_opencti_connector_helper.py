@@ -0,0 +1,573 @@
+import json
+import multiprocessing
+import threading
+import time
+import zlib
+
+import pytest
+from sseclient import Event
+
+from pycti import OpenCTIApiClient, OpenCTIConnectorHelper
+from pycti.connector.opencti_connector_helper import (
+    ListenProcesses,
+    ListenStream,
+    StreamBatcher,
+    StreamCheckpointer,
+    StreamPipeline,
+    StreamReader,
+    WorkKeepAlive,
+)
+from tests.generators import generate_bundle
+
+
+def test_register(platform, helper):
+    assert helper.connector_id in platform.connectors
+    assert helper.applicant_id == platform.user["id"]
+    assert platform.operations["RegisterConnector"] == 1
+
+
+def test_listen(platform, broker, helper):
+    bundle = json.dumps(generate_bundle(20))
+
+    def callback(event):
+        helper.send_stix2_bundle(bundle)
+        return "Processed " + event["entity_id"]
+
+    works = [
+        platform.send_message(helper.connector_id, {"entity_id": str(index)})
+        for index in range(10)
+    ]
+    helper.listen(callback)
+    assert broker.wait_empty(helper.config["listen"], timeout=10)
+    assert broker.acknowledged == 10
+    bundles = platform.process_bundles(helper.connector_id)
+    assert len(bundles) == 10 * 20
+    for index, work_id in enumerate(works):
+        work = platform.works[work_id]
+        assert work["status"] == "complete"
+        assert work["tracking"]["import_processed_number"] == 20
+        assert work["messages"][-1]["message"] == "Processed " + str(index)
+
+
+def test_listen_error(platform, broker, helper):
+    def callback(event):
+        raise ValueError("Enrichment failed")
+
+    work_id = platform.send_message(helper.connector_id, {"entity_id": "0"})
+    helper.listen(callback)
+    assert broker.wait_empty(helper.config["listen"], timeout=10)
+    work = platform.works[work_id]
+    assert work["status"] == "complete"
+    assert work["errors"][0]["message"] == "Enrichment failed"
+    assert broker.acknowledged == 1
+
+
+def test_listen_ack_after_processing(platform, broker, helper):
+    release = threading.Event()
+    processing = threading.Event()
+
+    def callback(event):
+        processing.set()
+        assert release.wait(10)
+        return "Processed"
+
+    platform.send_message(helper.connector_id, {"entity_id": "0"})
+    helper.listen(callback)
+    assert processing.wait(10)
+    assert broker.acknowledged == 0
+    release.set()
+    assert broker.wait_empty(helper.config["listen"], timeout=10)
+    assert broker.acknowledged == 1
+
+
+def test_listen_malformed(platform, broker, create_helper):
+    helper = create_helper(listen_workers=1)
+    processed = []
+
+    def callback(event):
+        processed.append(event["entity_id"])
+        return "Processed"
+
+    queue = helper.config["listen"]
+    broker.publish("", queue, json.dumps({"event": {"entity_id": "0"}}))
+    platform.send_message(helper.connector_id, {"entity_id": "1"})
+    helper.listen(callback)
+    # The message without internal data is rejected, not left unacknowledged
+    assert broker.wait_empty(queue, timeout=10)
+    assert broker.rejected == 1
+    assert broker.acknowledged == 1
+    assert processed == ["1"]
+
+
+def test_listen_workers(platform, broker, create_helper):
+    helper = create_helper(listen_workers=4)
+    # Only completes if the 4 messages are processed concurrently
+    barrier = threading.Barrier(4, timeout=10)
+    unacked = []
+
+    def callback(event):
+        barrier.wait()
+        channel = helper.listen_queue.channel
+        unacked.append(len(channel.unacked))
+        return "Processed"
+
+    for index in range(8):
+        platform.send_message(helper.connector_id, {"entity_id": str(index)})
+    helper.listen(callback)
+    assert broker.wait_empty(helper.config["listen"], timeout=10)
+    assert broker.acknowledged == 8
+    # The prefetch defaults to the number of workers
+    assert max(unacked) <= 4
+
+
+def test_api(platform):
+    client = OpenCTIApiClient(platform.url, "token", log_level="error")
+    observable = client.stix_cyber_observable.create(
+        observableData={"type": "ipv4-addr", "value": "10.0.0.1"}
+    )
+    upserted = client.stix_cyber_observable.create(
+        simple_observable_key="IPv4-Addr.value", simple_observable_value="10.0.0.1"
+    )
+    assert upserted["id"] == observable["id"]
+    malware = client.malware.create(name="Emotet")
+    relationship = client.stix_core_relationship.create(
+        fromId=malware["id"], toId=observable["id"], relationship_type="related-to"
+    )
+    assert client.malware.read(id=malware["standard_id"])["name"] == "Emotet"
+    assert client.stix_domain_object.list(types=["Malware"], search="emo")[0]["id"] == (
+        malware["id"]
+    )
+    relationships = client.stix_core_relationship.list(fromId=malware["id"])
+    assert [item["id"] for item in relationships] == [relationship["id"]]
+
+
+def test_inject_error(platform):
+    client = OpenCTIApiClient(platform.url, "token", log_level="error")
+    platform.inject_error("malwares", message="Unavailable")
+    with pytest.raises(ValueError):
+        client.malware.list()
+    assert client.malware.list() == []
+
+
+def test_listen_stop(platform, broker, create_helper):
+    helper = create_helper(listen_workers=1, listen_prefetch=4)
+    started = threading.Event()
+    release = threading.Event()
+
+    def callback(event):
+        started.set()
+        release.wait(10)
+        return "Processed"
+
+    for index in range(5):
+        platform.send_message(helper.connector_id, {"entity_id": str(index)})
+    helper.listen(callback)
+    assert started.wait(10)
+    with broker.condition:
+        assert broker.condition.wait_for(
+            lambda: len(broker.queues[helper.config["listen"]]) == 1, 10
+        )
+    stopping = threading.Thread(target=helper.listen_queue.stop)
+    stopping.start()
+    release.set()
+    stopping.join(10)
+    # Prefetched messages are processed and acknowledged, the others are left
+    assert not helper.listen_queue.is_alive()
+    assert broker.acknowledged == 4
+    assert len(broker.messages(helper.config["listen"])) == 1
+
+
+def test_listen_processes_restart(platform, helper, monkeypatch):
+    def run_process(helper, config, callback):
+        time.sleep(0.2)
+
+    monkeypatch.setattr(ListenProcesses, "_run_process", staticmethod(run_process))
+    processes = ListenProcesses(helper, helper.config, None, 2, check_interval=0.05)
+    processes.start()
+    try:
+        first = [process.pid for process in processes.processes]
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and any(
+            process.pid in first for process in processes.processes
+        ):
+            time.sleep(0.05)
+        # Both exited workers are replaced by new processes
+        assert all(process.pid not in first for process in processes.processes)
+    finally:
+        processes.stop()
+    assert not processes.is_alive()
+    assert not any(process.is_alive() for process in processes.processes)
+
+
+def test_listen_processes_ping(platform, create_helper, monkeypatch):
+    pings = multiprocessing.get_context("fork").Queue()
+
+    def run_process(helper, config, callback):
+        pings.put(helper.ping is None)
+        time.sleep(60)
+
+    monkeypatch.setattr(ListenProcesses, "_run_process", staticmethod(run_process))
+    helper = create_helper(listen_processes=2)
+    assert helper.ping is None
+    helper.listen(None)
+    # The workers are forked before the ping thread is started
+    assert [pings.get(timeout=10), pings.get(timeout=10)] == [True, True]
+    assert helper.ping is not None and helper.ping.is_alive()
+
+
+def test_listen_processes_no_fork(platform, create_helper, monkeypatch):
+    monkeypatch.setattr(multiprocessing, "get_all_start_methods", lambda: ["spawn"])
+    with pytest.raises(ValueError, match="fork"):
+        create_helper(listen_processes=2)
+    assert platform.connectors == {}
+
+
+def test_stix2_deduplicate_objects():
+    items = [
+        {"id": "indicator--" + str(index % 3), "name": str(index)} for index in range(7)
+    ]
+    # The first occurrence of each id is kept, in order
+    assert OpenCTIConnectorHelper.stix2_deduplicate_objects(items) == items[:3]
+    assert OpenCTIConnectorHelper.stix2_deduplicate_objects([]) == []
+
+
+def test_stix2_deduplicate_objects_size():
+    items = [{"id": "indicator--" + str(index)} for index in range(50000)]
+    start = time.monotonic()
+    result = OpenCTIConnectorHelper.stix2_deduplicate_objects(items + items)
+    assert len(result) == 50000
+    # A linear deduplication takes a few milliseconds, a quadratic one minutes
+    assert time.monotonic() - start < 5
+
+
+class FakeWorkApi:
+    def __init__(self, fail=False):
+        self.pings = []
+        self.fail = fail
+        self.work = self
+
+    def ping(self, work_id):
+        self.pings.append((work_id, time.monotonic()))
+        if self.fail:
+            raise ValueError("Ping failed")
+
+
+def test_work_keep_alive():
+    api = FakeWorkApi()
+    keep_alive = WorkKeepAlive(api, min_interval=0.05, max_interval=0.2)
+    keep_alive.start()
+    try:
+        start = time.monotonic()
+        keep_alive.register("a")
+        keep_alive.register("a")
+        time.sleep(0.5)
+        keep_alive.unregister("a")
+        pinged = len(api.pings)
+        # Still registered by a message
+        time.sleep(0.3)
+        assert len(api.pings) > pinged
+        keep_alive.unregister("a")
+        pinged = len(api.pings)
+        time.sleep(0.3)
+        assert len(api.pings) == pinged
+    finally:
+        keep_alive.stop()
+    times = [start] + [ping for _, ping in api.pings]
+    delays = [current - previous for previous, current in zip(times, times[1:])]
+    # The interval doubles up to the maximum interval
+    assert delays[0] == pytest.approx(0.05, abs=0.04)
+    assert delays[1] == pytest.approx(0.1, abs=0.04)
+    assert all(delay == pytest.approx(0.2, abs=0.04) for delay in delays[2:])
+
+
+def test_work_keep_alive_error():
+    api = FakeWorkApi(fail=True)
+    keep_alive = WorkKeepAlive(api, min_interval=0.05, max_interval=0.2)
+    keep_alive.start()
+    try:
+        keep_alive.register("a")
+        time.sleep(0.33)
+    finally:
+        keep_alive.stop()
+    # Failed pings are retried at the minimum interval
+    assert len(api.pings) >= 5
+
+
+class FakeStateHelper:
+    def __init__(self, state=None):
+        self.state = state
+        self.writes = []
+
+    def get_state(self):
+        return dict(self.state) if self.state is not None else None
+
+    def set_state(self, state):
+        self.state = state
+        self.writes.append(state["connectorLastEventId"])
+
+
+def test_stream_checkpointer_debounce():
+    helper = FakeStateHelper({"cursor": "1"})
+    checkpointer = StreamCheckpointer(helper, flush_interval=60, flush_events=3)
+    checkpointer.update("1-0")
+    checkpointer.update("2-0")
+    assert helper.writes == []
+    checkpointer.update("3-0")
+    assert helper.writes == ["3-0"]
+    # The state changed by the callback is kept
+    assert helper.state == {"cursor": "1", "connectorLastEventId": "3-0"}
+    checkpointer.update("4-0")
+    checkpointer.flush()
+    checkpointer.flush()
+    assert helper.writes == ["3-0", "4-0"]
+
+
+def test_stream_checkpointer_interval():
+    helper = FakeStateHelper()
+    checkpointer = StreamCheckpointer(helper, flush_interval=0.05, flush_events=100)
+    checkpointer.update("1-0")
+    checkpointer.tick()
+    assert helper.writes == []
+    time.sleep(0.06)
+    checkpointer.tick()
+    assert helper.writes == ["1-0"]
+    time.sleep(0.06)
+    # Nothing new to write
+    checkpointer.tick()
+    assert helper.writes == ["1-0"]
+    checkpointer.update("2-0")
+    assert helper.writes == ["1-0", "2-0"]
+
+
+def stream_event(event_id, entity_id, event="create"):
+    return Event(json.dumps({"data": {"id": entity_id}}), event, event_id)
+
+
+def partition_ids(workers):
+    """entity ids dispatched to different workers of a pipeline"""
+
+    ids = {}
+    index = 0
+    while len(ids) < workers:
+        entity_id = "entity-" + str(index)
+        ids.setdefault(zlib.crc32(entity_id.encode("utf-8")) % workers, entity_id)
+        index += 1
+    return [ids[partition] for partition in range(workers)]
+
+
+def test_stream_pipeline_checkpoint_order():
+    helper = FakeStateHelper()
+    slow, fast = partition_ids(2)
+    release = threading.Event()
+    processed = []
+
+    def callback(msg):
+        entity_id = json.loads(msg.data)["data"]["id"]
+        if entity_id == slow:
+            assert release.wait(10)
+        processed.append(msg.id)
+
+    pipeline = StreamPipeline(
+        callback, StreamCheckpointer(helper, flush_events=1), workers=2
+    )
+    pipeline.start()
+    pipeline.submit(stream_event("1-0", slow))
+    pipeline.submit(stream_event("2-0", fast))
+    pipeline.submit(stream_event("3-0", fast))
+    pipeline.submit(stream_event("4-0", None, "sync"))
+    deadline = time.monotonic() + 10
+    while len(processed) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The events of the fast partition wait for the slow one to be checkpointed
+    assert processed == ["2-0", "3-0"]
+    assert helper.writes == []
+    release.set()
+    pipeline.stop()
+    assert processed == ["2-0", "3-0", "1-0"]
+    assert helper.writes == ["4-0"]
+
+
+def test_stream_pipeline_bounded():
+    helper = FakeStateHelper()
+    release = threading.Event()
+    pipeline = StreamPipeline(
+        lambda msg: release.wait(10),
+        StreamCheckpointer(helper),
+        workers=1,
+        queue_size=2,
+    )
+    pipeline.start()
+    pipeline.submit(stream_event("1-0", "entity"))
+    pipeline.submit(stream_event("2-0", "entity"))
+    submit = threading.Thread(
+        target=pipeline.submit, args=[stream_event("3-0", "entity")]
+    )
+    submit.start()
+    submit.join(0.2)
+    # Blocked until the checkpoint advances
+    assert submit.is_alive()
+    release.set()
+    submit.join(10)
+    assert not submit.is_alive()
+    pipeline.stop()
+    assert len(pipeline.pending) == 0
+
+
+def test_stream_pipeline_error():
+    def callback(msg):
+        raise ValueError("Callback failed")
+
+    pipeline = StreamPipeline(
+        callback, StreamCheckpointer(FakeStateHelper()), workers=1, queue_size=1
+    )
+    pipeline.start()
+    pipeline.submit(stream_event("1-0", "entity"))
+    # Submitting does not block on the failed event
+    with pytest.raises(ValueError, match="Callback failed"):
+        pipeline.submit(stream_event("2-0", "entity"))
+    pipeline.stop()
+
+
+class FailingStateHelper(FakeStateHelper):
+    connect_live_stream_checkpoint_interval = 60
+    connect_live_stream_checkpoint_events = 100
+
+    def __init__(self):
+        super().__init__()
+        self.pings = 0
+
+    def get_state(self):
+        raise ValueError("State unavailable")
+
+    def force_ping(self):
+        self.pings += 1
+
+
+def test_listen_stream_init_error(monkeypatch):
+    errors = []
+    monkeypatch.setattr("sys.excepthook", lambda *exc_info: errors.append(exc_info))
+    helper = FailingStateHelper()
+    stream = ListenStream(
+        helper,
+        None,
+        None,
+        None,
+        True,
+        None,
+        None,
+        None,
+        None,
+        None,
+        None,
+        pipeline_workers=2,
+    )
+    # The pipeline is not started, the original error is reported
+    stream.run()
+    assert [exc_info[0] for exc_info in errors] == [ValueError]
+    assert str(errors[0][1]) == "State unavailable"
+    assert helper.pings == 1
+
+
+def test_stream_batcher_size():
+    helper = FakeStateHelper()
+    batches = []
+    batcher = StreamBatcher(
+        batches.append, StreamCheckpointer(helper, flush_events=1), 2, linger=60
+    )
+    batcher.add(stream_event("1-0", "a"))
+    assert batches == []
+    batcher.add(stream_event("2-0", None, "sync"))
+    batcher.add(stream_event("3-0", "b"))
+    assert [[event["id"] for event in batch] for batch in batches] == [["1-0", "3-0"]]
+    assert batches[0][1]["data"] == {"data": {"id": "b"}}
+    assert helper.writes == ["3-0"]
+
+
+def test_stream_batcher_linger():
+    helper = FakeStateHelper()
+    batches = []
+    batcher = StreamBatcher(
+        batches.append, StreamCheckpointer(helper, flush_events=1), 100, linger=0.05
+    )
+    batcher.add(stream_event("1-0", "a"))
+    batcher.tick()
+    assert batches == []
+    time.sleep(0.06)
+    # Delivered on the next message, such as a heartbeat
+    batcher.tick()
+    assert len(batches) == 1 and helper.writes == ["1-0"]
+    # The linger delay starts with the first event of the next batch
+    time.sleep(0.06)
+    batcher.add(stream_event("2-0", "a"))
+    assert len(batches) == 1
+
+
+def test_stream_batcher_error():
+    helper = FakeStateHelper()
+
+    def callback(events):
+        raise ValueError("Callback failed")
+
+    batcher = StreamBatcher(callback, StreamCheckpointer(helper, flush_events=1), 1)
+    with pytest.raises(ValueError):
+        batcher.add(stream_event("1-0", "a"))
+    # Not checkpointed, the batch is received again after a restart
+    assert helper.writes == []
+
+
+class FakeStreamResponse:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
+
+
+def test_stream_reader_parse():
+    response = FakeStreamResponse(
+        [
+            b': connected\r\nid: 1-0\r\nevent: create\r\ndata: {"a":',
+            b" 1}\r\ndata: \xc3",
+            b"\xa9\r\nretry: 1000\r\n\r\nevent: heartbeat\n",
+            b"\n",
+        ]
+    )
+    events = list(StreamReader.parse(response))
+    assert [(event.id, event.event, event.data) for event in events] == [
+        ("1-0", "create", '{"a": 1}\né'),
+        (None, "heartbeat", ""),
+    ]
+    assert events[0].retry == 1000
+
+
+def read_stream(reader, count):
+    events = []
+    for event in reader:
+        events.append(event)
+        if len(events) == count:
+            reader.close()
+    return events
+
+
+@pytest.mark.parametrize("gzip", [False, True], ids=["identity", "gzip"])
+def test_stream_reader_resume(mock_server, gzip):
+    mock_server.stream_events = [
+        (str(index) + "-0", "create", {"data": {"id": str(index)}})
+        for index in range(1, 6)
+    ]
+    mock_server.stream_limit = 2
+    mock_server.stream_gzip = gzip
+    reader = StreamReader(
+        mock_server.url + "/stream?from=0-0", {}, False, max_backoff=0.01
+    )
+    events = read_stream(reader, 5)
+    assert [event.id for event in events] == ["1-0", "2-0", "3-0", "4-0", "5-0"]
+    assert json.loads(events[4].data) == {"data": {"id": "5"}}
+    # Reconnected after the stream is closed, from the last received event
+    assert mock_server.stream_requests == [
+        "/stream?from=0-0",
+        "/stream?from=2-0",
+        "/stream?from=4-0",
+    ]
+    assert reader.get_metrics()["connections"] == 3
+    assert reader.get_metrics()["reconnects"] == 2
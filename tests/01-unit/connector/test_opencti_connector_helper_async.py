@@ -0,0 +1,222 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+from pycti.connector.opencti_connector_helper import message_context
+from pycti.connector.opencti_connector_helper_async import (
+    AsyncListenQueue,
+    AsyncOpenCTIConnectorHelper,
+)
+
+
+def test_async_api(platform, create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+
+    async def main():
+        with helper.api.request_headers_context({"opencti-applicant-id": "applicant"}):
+            observable = await helper.async_api.stix_cyber_observable.create(
+                observableData={"type": "ipv4-addr", "value": "10.0.0.1"}
+            )
+        await helper.async_api.stix_cyber_observable.read(id=observable["id"])
+        return observable
+
+    platform.reset()
+    observable = asyncio.run(main())
+    assert observable["value"] == "10.0.0.1"
+    # Calls run in the executor with the headers of their caller
+    assert platform.applicants == {"applicant": 1, None: 1}
+    assert helper.async_api.api_url == helper.api.api_url
+
+
+def test_async_listen(platform, broker, create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper, async_concurrency=4)
+    applicants = []
+
+    async def callback(event):
+        # Only completes if the 4 messages are processed concurrently
+        applicants.append(message_context.get().applicant_id)
+        while len(applicants) < 4:
+            await asyncio.sleep(0.01)
+        return "Processed " + event["entity_id"]
+
+    async def main():
+        listen = asyncio.ensure_future(helper.listen_async(callback))
+        await helper.run_in_executor(
+            broker.wait_empty, helper.config["listen"], timeout=10
+        )
+        await helper.stop_async()
+        await asyncio.wait_for(listen, 10)
+
+    works = [
+        platform.send_message(helper.connector_id, {"entity_id": str(index)})
+        for index in range(4)
+    ]
+    asyncio.run(asyncio.wait_for(main(), 20))
+    assert broker.acknowledged == 4
+    assert applicants == [platform.user["id"]] * 4
+    for index, work_id in enumerate(works):
+        work = platform.works[work_id]
+        assert work["status"] == "complete"
+        assert work["messages"][-1]["message"] == "Processed " + str(index)
+
+
+def test_async_listen_stop(platform, broker, create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    processing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def callback(event):
+        processing.set()
+        await release.wait()
+        return "Processed"
+
+    async def main():
+        listen = asyncio.ensure_future(helper.listen_async(callback))
+        await asyncio.wait_for(processing.wait(), 10)
+        stop = asyncio.ensure_future(helper.stop_async())
+        await asyncio.sleep(0.1)
+        # The message in flight is awaited, then acknowledged
+        assert not stop.done()
+        release.set()
+        await asyncio.wait_for(stop, 10)
+        await asyncio.wait_for(listen, 10)
+
+    platform.send_message(helper.connector_id, {"entity_id": "0"})
+    asyncio.run(asyncio.wait_for(main(), 20))
+    assert broker.acknowledged == 1
+    assert not helper.listen_queue.is_alive()
+
+
+class FakeChannel:
+    def __init__(self):
+        self.nacks = []
+
+    def basic_nack(self, delivery_tag=0, multiple=False, requeue=True):
+        self.nacks.append((delivery_tag, requeue))
+
+
+def test_async_listen_stopping_requeue(create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    queue = AsyncListenQueue(helper, helper.config, None, None)
+    queue.exit_event.set()
+    channel = FakeChannel()
+    queue._process_message(channel, SimpleNamespace(delivery_tag=1), None, b"{}")
+    # Once stopping, new messages are requeued instead of being processed
+    assert channel.nacks == [(1, True)]
+    assert queue.tasks == set()
+
+
+def test_async_listen_malformed(platform, broker, create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    processed = []
+
+    async def callback(event):
+        processed.append(event["entity_id"])
+        return "Processed"
+
+    async def main():
+        listen = asyncio.ensure_future(helper.listen_async(callback))
+        await helper.run_in_executor(broker.wait_empty, queue, timeout=10)
+        await helper.stop_async()
+        await asyncio.wait_for(listen, 10)
+
+    queue = helper.config["listen"]
+    broker.publish("", queue, json.dumps({"event": {"entity_id": "0"}}))
+    platform.send_message(helper.connector_id, {"entity_id": "1"})
+    asyncio.run(asyncio.wait_for(main(), 20))
+    # The message without internal data is rejected, not left unacknowledged
+    assert broker.rejected == 1
+    assert broker.acknowledged == 1
+    assert processed == ["1"]
+
+
+class FakeAsyncWorkApi:
+    def __init__(self):
+        self.pings = []
+
+    async def ping(self, work_id):
+        self.pings.append(work_id)
+
+
+class FakeAsyncApi:
+    def __init__(self):
+        self.work = FakeAsyncWorkApi()
+
+
+def test_async_keep_alive(create_helper):
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    helper.async_api = FakeAsyncApi()
+
+    async def main():
+        queue = AsyncListenQueue(
+            helper, helper.config, None, asyncio.get_running_loop()
+        )
+        queue.keep_alive_min_interval = 0.01
+        queue.keep_alive_max_interval = 0.01
+        queue._register("work")
+        task = queue.works["work"][1]
+        queue._register("work")
+        # A single task keeps a work alive, whatever its messages in flight
+        assert queue.works["work"] == [2, task]
+        await asyncio.sleep(0.05)
+        queue._unregister("work")
+        assert not task.done()
+        queue._unregister("work")
+        assert "work" not in queue.works
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        return len(helper.async_api.work.pings)
+
+    pings = asyncio.run(main())
+    assert pings > 0
+    assert set(helper.async_api.work.pings) == {"work"}
+
+
+def test_async_listen_stream_stop(platform, create_helper):
+    platform.stream_events = [
+        (str(index) + "-0", "create", {"data": {"id": str(index)}})
+        for index in range(1, 21)
+    ]
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    processed = []
+
+    async def callback(msg):
+        processed.append(msg.id)
+        if len(processed) == 3:
+            # Let the reader fill the queue and block on the next event
+            await asyncio.sleep(0.1)
+            helper.stopped.set()
+
+    async def main():
+        await helper.listen_stream_async(callback, queue_size=1)
+
+    # The reader blocked on the full queue is released on stop, the events
+    # read ahead are not processed
+    asyncio.run(asyncio.wait_for(main(), 10))
+    assert processed == ["1-0", "2-0", "3-0"]
+    assert helper.get_state()["connectorLastEventId"] == "3-0"
+    assert platform.stream_requests == ["/stream?from=0-0"]
+
+
+def test_async_listen_stream_no_id(platform, create_helper):
+    platform.stream_events = [
+        ("1-0", "create", {"data": {"id": "1"}}),
+        (None, "sync", {}),
+    ]
+    helper = create_helper(AsyncOpenCTIConnectorHelper)
+    events = []
+
+    async def callback(msg):
+        events.append(msg.event)
+
+    async def main():
+        listen = asyncio.ensure_future(helper.listen_stream_async(callback))
+        while len(platform.stream_requests) < 2:
+            await asyncio.sleep(0.01)
+        helper.stopped.set()
+        await listen
+
+    asyncio.run(asyncio.wait_for(main(), 10))
+    # The sync event without id does not reset the checkpoint
+    assert events[0] == "create"
+    assert helper.get_state()["connectorLastEventId"] == "1-0"
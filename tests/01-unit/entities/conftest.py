@@ -0,0 +1,17 @@
+import pytest
+
+from pycti import OpenCTIApiClient
+from tests.mock.opencti_platform import MockOpenCTIPlatform
+
+
+@pytest.fixture
+def platform():
+    with MockOpenCTIPlatform() as platform:
+        yield platform
+
+
+@pytest.fixture
+def client(platform):
+    client = OpenCTIApiClient(platform.url, "token", log_level="error")
+    platform.reset()
+    return client
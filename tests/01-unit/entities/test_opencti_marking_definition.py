@@ -0,0 +1,106 @@
+import itertools
+
+import pytest
+
+TLP = ["TLP:WHITE", "TLP:GREEN", "TLP:AMBER", "TLP:RED"]
+
+
+@pytest.fixture
+def markings(client):
+    markings = [
+        client.marking_definition.create(
+            definition_type="TLP", definition=definition, x_opencti_order=order
+        )
+        for order, definition in enumerate(TLP)
+    ]
+    markings.append(
+        client.marking_definition.create(
+            definition_type="PAP", definition="PAP:RED", x_opencti_order=3
+        )
+    )
+    return markings
+
+
+def check_max_marking_definition(max_marking_definition, marking_definitions):
+    """the comparison of the markings before the index"""
+
+    typed = [
+        marking_definition
+        for marking_definition in marking_definitions
+        if marking_definition["definition_type"]
+        == max_marking_definition["definition_type"]
+    ]
+    if len(typed) == 0:
+        return True
+    return any(
+        marking_definition["x_opencti_order"]
+        <= max_marking_definition["x_opencti_order"]
+        for marking_definition in typed
+    )
+
+
+def test_get_index(platform, client, markings):
+    platform.reset()
+    index = client.marking_definition.get_index()
+    for marking in markings:
+        assert index[marking["id"]]["definition"] == marking["definition"]
+        assert index[marking["standard_id"]] is index[marking["id"]]
+    # Loaded once per client, unless refreshed
+    assert client.marking_definition.get_index() is index
+    assert platform.requests == 1
+    assert client.marking_definition.get_index(refresh=True) is not index
+    assert platform.requests == 2
+
+
+def test_read_indexed(platform, client, markings):
+    index = client.marking_definition.get_index()
+    amber = markings[2]
+    typed_ids, allowed_ids = client.marking_definition.get_allowed_sets(
+        max_marking_definition=amber
+    )
+    assert allowed_ids == {
+        key
+        for marking in markings[:3]
+        for key in (marking["id"], marking["standard_id"])
+    }
+    assert typed_ids == allowed_ids | {markings[3]["id"], markings[3]["standard_id"]}
+    platform.reset()
+    assert client.marking_definition.read_indexed(id=amber["id"])["id"] == amber["id"]
+    assert platform.requests == 0
+    clear = client.marking_definition.create(
+        definition_type="TLP", definition="TLP:CLEAR", x_opencti_order=0
+    )
+    assert client.marking_definition.read_indexed(id=clear["id"])["id"] == clear["id"]
+    # The index is copied on write, the snapshots being read are left unchanged
+    assert clear["id"] not in index
+    assert clear["id"] in client.marking_definition.get_index()
+    _, allowed_ids = client.marking_definition.get_allowed_sets(
+        max_marking_definition=amber
+    )
+    assert clear["id"] in allowed_ids
+
+
+def test_check_max_marking_definition(client, markings):
+    client.marking_definition.get_index()
+    # Created after the index is loaded
+    out_of_index = [
+        client.marking_definition.create(
+            definition_type="TLP", definition="TLP:AMBER+STRICT", x_opencti_order=2
+        ),
+        client.marking_definition.create(
+            definition_type="PAP", definition="PAP:CLEAR", x_opencti_order=0
+        ),
+    ]
+    candidates = markings + out_of_index
+    for max_marking_definition in markings:
+        for size in range(3):
+            for marking_definitions in itertools.combinations(candidates, size):
+                assert client.stix2.check_max_marking_definition(
+                    max_marking_definition, list(marking_definitions)
+                ) == check_max_marking_definition(
+                    max_marking_definition, marking_definitions
+                ), (
+                    max_marking_definition["definition"],
+                    marking_definitions,
+                )
+    assert client.stix2.check_max_marking_definition(None, markings)
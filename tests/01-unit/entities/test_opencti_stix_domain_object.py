@@ -0,0 +1,99 @@
+from tests.mock.opencti_server import connection
+
+
+def resolve(client, *candidates, **kwargs):
+    return client.stix_domain_object.get_many_by_stix_id_or_name(
+        candidates=list(candidates), **kwargs
+    )
+
+
+def test_resolve(platform, client):
+    emotet = platform.add("Malware", {"name": "Emotet", "aliases": ["Heodo"]})
+    trickbot = platform.add("Malware", {"name": "TrickBot", "aliases": ["Trickster"]})
+    results = resolve(
+        client,
+        {"stix_id": trickbot["standard_id"], "name": "Emotet"},
+        {"name": "Emotet"},
+        {"name": "Heodo"},
+        {"name": "Geodo", "aliases": ["Unknown", "Trickster"]},
+        {"name": "Missing", "aliases": ["Unknown"]},
+    )
+    assert [result and result["id"] for result in results] == [
+        trickbot["id"],
+        emotet["id"],
+        emotet["id"],
+        trickbot["id"],
+        None,
+    ]
+    # One request resolves all the candidates of a batch
+    assert platform.requests == 1
+    result = client.stix_domain_object.get_by_stix_id_or_name(name="Heodo")
+    assert result["id"] == emotet["id"]
+
+
+def test_resolve_negative_cache(platform, client):
+    platform.add("Malware", {"name": "Emotet"})
+    assert resolve(client, {"name": "Missing"}, negativeCache=True) == [None]
+    assert platform.requests == 1
+    results = resolve(client, {"name": "Missing"}, {"name": "Emotet"})
+    assert results[0] is None and results[1]["name"] == "Emotet"
+    assert platform.requests == 2
+    # Only the names not found are remembered
+    results = resolve(client, {"name": "Missing"}, negativeCache=True)
+    assert results == [None]
+    assert platform.requests == 2
+    platform.add("Malware", {"name": "Missing"})
+    client.stix_domain_object.clear_negative_cache()
+    assert resolve(client, {"name": "Missing"}, negativeCache=True)[0] is not None
+    assert platform.requests == 3
+
+
+def test_resolve_truncated(platform, client):
+    for index in range(600):
+        platform.add("Malware", {"name": "Variant " + str(index), "aliases": ["Bot"]})
+    target = platform.add("Malware", {"name": "Target", "aliases": ["Tgt"]})
+    # The aliases lookup of the batch is truncated before the target
+    results = resolve(client, {"name": "Bot"}, {"name": "Tgt"}, {"name": "Missing"})
+    assert results[0]["name"] == "Variant 0"
+    assert results[1]["id"] == target["id"]
+    assert results[2] is None
+    assert platform.operations["StixDomainObjectsResolve"] == 1
+    assert platform.operations["StixDomainObjectResolve"] == 2
+
+
+def test_resolve_aliases_not_selected(mock_server, mock_client):
+    entities = [
+        {"id": "1", "name": "Emotet", "aliases": ["Heodo"]},
+        {"id": "2", "name": "TrickBot", "aliases": ["Trickster"]},
+    ]
+
+    def matches(entity, item):
+        field = entity[item["key"]]
+        values = field if isinstance(field, list) else [field]
+        return any(value in values for value in item["values"])
+
+    def list_entities(arguments):
+        # The aliases can be filtered on but are not returned
+        nodes = [
+            {"id": entity["id"], "name": entity["name"]}
+            for entity in entities
+            if all(matches(entity, item) for item in arguments["filters"])
+        ]
+        return connection(nodes[: arguments["first"]])
+
+    mock_server.resolve("stixDomainObjects", list_entities)
+    selection = "id name"
+    alone = mock_client.stix_domain_object.get_by_stix_id_or_name(
+        name="Trickster", customAttributes=selection
+    )
+    batch = resolve(
+        mock_client,
+        {"name": "Heodo"},
+        {"name": "Trickster"},
+        {"name": "Missing"},
+        customAttributes=selection,
+    )
+    # The entities of the aliases lookup cannot be told apart, each candidate
+    # is resolved on its own, alone or in a batch
+    assert alone["id"] == "2"
+    assert [result and result["id"] for result in batch] == ["1", "2", None]
@@ -0,0 +1,131 @@
+import pytest
+
+from pycti.utils.opencti_graphql import (
+    FULL_PLAN,
+    compact_query,
+    compile_plan,
+    parse_selection,
+    project_selection,
+)
+
+SELECTION = """
+    id
+    standard_id
+    name
+    hashes {
+        algorithm
+        hash
+    }
+    createdBy {
+        ... on Identity {
+            id
+            name
+        }
+    }
+    objectLabel {
+        edges {
+            node {
+                id
+            }
+        }
+    }
+    ... on Report {
+        published
+    }
+"""
+
+
+def test_compact_query():
+    query = """
+        query Labels($search: String) {
+            labels(search: "two  spaces") {
+                id
+            }
+        }
+    """
+    assert (
+        compact_query(query)
+        == 'query Labels($search: String) { labels(search: "two  spaces") { id } }'
+    )
+
+
+def test_parse_selection():
+    fields = parse_selection(
+        """
+        id
+        alias: name
+        objectMarking(first: 10) {
+            edges {
+                node {
+                    id
+                }
+            }
+        }
+        ... on Report {
+            objects {
+                edges {
+                    node {
+                        ... on BasicObject {
+                            id
+                        }
+                    }
+                }
+            }
+        }
+        """
+    )
+    assert fields == {
+        "id": None,
+        "alias": None,
+        "objectMarking": {"edges": {"node": {"id": None}}},
+        "objects": {"edges": {"node": {"id": None}}},
+    }
+
+
+def test_parse_selection_fragment_spread():
+    assert parse_selection("id ...ReportFields") is None
+
+
+def test_compile_plan():
+    plan = compile_plan(
+        parse_selection(
+            """
+            id
+            createdBy {
+                id
+                objectLabel {
+                    edges {
+                        node {
+                            id
+                        }
+                    }
+                }
+            }
+            externalReferences {
+                edges {
+                    node {
+                        id
+                    }
+                }
+            }
+            """
+        )
+    )
+    assert [key for key, _ in plan.created_by] == ["objectLabel"]
+    assert [key for key, _ in plan.fields] == ["externalReferences"]
+    assert plan.fields[0][1].fields == []
+    assert compile_plan(parse_selection("id ...ReportFields")) is FULL_PLAN
+
+
+def test_project_selection():
+    assert project_selection(SELECTION, "full") == SELECTION
+    assert project_selection(SELECTION, "ids") == "id standard_id"
+    assert project_selection(SELECTION, "core") == (
+        "id standard_id name hashes { algorithm hash } "
+        "createdBy { ... on Identity { id } } ... on Report { published }"
+    )
+
+
+def test_project_selection_unknown():
+    with pytest.raises(ValueError):
+        project_selection(SELECTION, "minimal")
@@ -0,0 +1,28 @@
+import pytest
+
+from pycti.utils import opencti_json
+
+
+@pytest.fixture(params=list(opencti_json.CODECS.keys()))
+def codec(request):
+    previous = opencti_json.get_codec().name
+    yield opencti_json.set_codec(request.param)
+    opencti_json.set_codec(previous)
+
+
+def test_round_trip(codec):
+    data = {"type": "bundle", "objects": [{"name": "é", "x_opencti_score": 50}]}
+    encoded = opencti_json.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert opencti_json.loads(encoded) == data
+    assert opencti_json.loads(opencti_json.dumps_str(data)) == data
+
+
+def test_large_integer(codec):
+    data = {"number": 2**70}
+    assert opencti_json.loads(opencti_json.dumps(data)) == data
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        opencti_json.set_codec("simdjson")
@@ -1,8 +1,15 @@
 import datetime
+import io
+import json
+import uuid
 
 import pytest
 
+from pycti import OpenCTIApiClient
 from pycti.utils.opencti_stix2 import OpenCTIStix2
+from tests.generators import generate_objects, generate_observables
+from tests.mock.opencti_platform import MockOpenCTIPlatform
+from tests.mock.opencti_server import connection
 
 
 @pytest.fixture
@@ -104,3 +111,285 @@ def test_import_bundle_from_file(opencti_stix2: OpenCTIStix2, caplog) -> None:
     for record in caplog.records:
         assert record.levelname == "ERROR"
     assert "The bundle file does not exists" in caplog.text
+
+
+def test_resolve_vocabulary_request_headers():
+    objects = generate_objects(40)
+    with MockOpenCTIPlatform() as platform:
+        client = OpenCTIApiClient(platform.url, "token", log_level="error")
+        platform.reset()
+        with client.request_headers_context({"opencti-applicant-id": "applicant"}):
+            client.stix2.resolve_vocabulary(objects)
+        assert set(platform.applicants.keys()) == {"applicant"}
+        assert platform.operations["BatchLabelAdd"] == 1
+        assert platform.operations["BatchKillChainPhaseAdd"] == 1
+        assert platform.operations["BatchExternalReferenceAdd"] == 1
+        assert "label_malicious-activity" in client.stix2.mapping_cache
+
+
+def test_import_bundle_bulk_error():
+    objects = []
+    for index in range(12):
+        ipv4 = {
+            "type": "ipv4-addr",
+            "spec_version": "2.1",
+            "id": "ipv4-addr--" + str(uuid.UUID(int=index, version=4)),
+            "value": "10.0.0." + str(index),
+        }
+        domain = {
+            "type": "domain-name",
+            "spec_version": "2.1",
+            "id": "domain-name--" + str(uuid.UUID(int=index, version=4)),
+            "value": "host" + str(index) + ".example.com",
+            "resolves_to_refs": [ipv4["id"]],
+        }
+        objects.extend([ipv4, domain])
+    bundle = {
+        "type": "bundle",
+        "id": "bundle--" + str(uuid.uuid4()),
+        "objects": objects,
+    }
+    with MockOpenCTIPlatform() as platform:
+        add = platform.resolvers["stixCyberObservableAdd"]
+
+        def add_observable(arguments):
+            value = (arguments.get("DomainName") or {}).get("value")
+            if value in ("host3.example.com", "host7.example.com"):
+                raise ValueError("Invalid domain " + value)
+            return add(arguments)
+
+        platform.resolve("stixCyberObservableAdd", add_observable)
+        relationships = []
+        platform.resolve(
+            "stixCyberObservableRelationshipAdd",
+            lambda arguments: relationships.append(arguments["input"]),
+        )
+        client = OpenCTIApiClient(platform.url, "token", log_level="error")
+        platform.reset()
+        with pytest.raises(ValueError, match="Invalid domain host3.example.com"):
+            client.stix2.import_bundle(bundle)
+        # The other observables and their relationships are imported first
+        assert platform.operations["BatchStixCyberObservableAdd"] == 1
+        assert platform.operations["BatchStixCyberObservableRelationshipAdd"] == 1
+        domains = client.stix_cyber_observable.list(types=["Domain-Name"])
+        assert len(domains) == 10
+        assert len(relationships) == 10
+        assert {item["relationship_type"] for item in relationships} == {
+            "obs_resolves-to"
+        }
+
+
+class FakeQueryBatch:
+    """replacement of `OpenCTIApiClient.query_batch`, resolving every item"""
+
+    def __init__(self, resolve):
+        self.resolve = resolve
+        self.calls = []
+
+    def __call__(
+        self,
+        operation,
+        field,
+        argument_types,
+        items,
+        selection,
+        batch_size=50,
+        max_workers=1,
+    ):
+        self.calls.append((field, items))
+        return [self.resolve(index, item) for index, item in enumerate(items)]
+
+
+def generate_relationships(count):
+    return [
+        {
+            "type": "relationship",
+            "spec_version": "2.1",
+            "id": "relationship--" + str(uuid.UUID(int=index, version=4)),
+            "relationship_type": "uses",
+            "source_ref": "malware--" + str(uuid.UUID(int=index, version=4)),
+            "target_ref": "attack-pattern--" + str(uuid.UUID(int=index, version=4)),
+        }
+        for index in range(count)
+    ]
+
+
+def created_relationship(index, item):
+    return (
+        {
+            "id": "created-" + str(index),
+            "standard_id": item["input"]["stix_id"],
+            "entity_type": "uses",
+            "parent_types": ["basic-relationship", "stix-core-relationship"],
+        },
+        None,
+    )
+
+
+def test_import_relationships_below_threshold(mock_client, monkeypatch):
+    query_batch = FakeQueryBatch(created_relationship)
+    monkeypatch.setattr(mock_client, "query_batch", query_batch)
+    imported = []
+    monkeypatch.setattr(
+        mock_client.stix2,
+        "import_relationship",
+        lambda stix_relation, update, types: imported.append(stix_relation["id"]),
+    )
+    relationships = generate_relationships(9)
+    mock_client.stix2.import_relationships(relationships)
+    # Few relationships are created one by one
+    assert imported == [item["id"] for item in relationships]
+    assert query_batch.calls == []
+
+
+def test_import_relationships_bulk(mock_client, monkeypatch):
+    query_batch = FakeQueryBatch(created_relationship)
+    monkeypatch.setattr(mock_client, "query_batch", query_batch)
+    relationships = generate_relationships(12)
+    mock_client.stix2.import_relationships(relationships)
+    assert len(query_batch.calls) == 1
+    field, items = query_batch.calls[0]
+    assert field == "stixCoreRelationshipAdd"
+    assert [item["input"]["fromId"] for item in items] == [
+        item["source_ref"] for item in relationships
+    ]
+    # Every result is mapped to the relationship at the same position
+    for index, item in enumerate(relationships):
+        assert mock_client.stix2.mapping_cache[item["id"]] == {
+            "id": "created-" + str(index),
+            "type": "uses",
+        }
+
+
+def test_import_relationships_bulk_error(mock_client, monkeypatch):
+    def create(index, item):
+        if index == 5:
+            return None, {"name": "FunctionalError", "message": "Invalid relationship"}
+        return created_relationship(index, item)
+
+    monkeypatch.setattr(mock_client, "query_batch", FakeQueryBatch(create))
+    relationships = generate_relationships(12)
+    with pytest.raises(ValueError, match="Invalid relationship"):
+        mock_client.stix2.import_relationships(relationships)
+    # The failure of an alias does not prevent the others from being imported
+    cached = [
+        mock_client.stix2.mapping_cache.get(item["id"], {}).get("id")
+        for item in relationships
+    ]
+    assert cached == [
+        None if index == 5 else "created-" + str(index) for index in range(12)
+    ]
+
+
+def test_list_many_observable_relationships(mock_client, monkeypatch):
+    def list_relationships(index, item):
+        nodes = [{"id": item["fromId"] + "-" + str(rank)} for rank in range(index)]
+        return {"edges": [{"node": node} for node in nodes]}, None
+
+    query_batch = FakeQueryBatch(list_relationships)
+    monkeypatch.setattr(mock_client, "query_batch", query_batch)
+    relationships = mock_client.stix_cyber_observable_relationship.list_many(
+        fromIds=["a", "b", "a", "c"], customAttributes="id"
+    )
+    # The relationships of every source are listed once, in order
+    assert [item["fromId"] for item in query_batch.calls[0][1]] == ["a", "b", "c"]
+    assert {
+        from_id: [item["id"] for item in items]
+        for from_id, items in relationships.items()
+    } == {"a": [], "b": ["b-0"], "c": ["c-0", "c-1"]}
+
+
+def test_list_many_observable_relationships_error(mock_client, monkeypatch):
+    def list_relationships(index, item):
+        if item["fromId"] == "b":
+            return None, {"name": "ForbiddenAccess", "message": "Forbidden"}
+        return {"edges": []}, None
+
+    monkeypatch.setattr(mock_client, "query_batch", FakeQueryBatch(list_relationships))
+    with pytest.raises(ValueError, match="Forbidden"):
+        mock_client.stix_cyber_observable_relationship.list_many(
+            fromIds=["a", "b", "c"]
+        )
+
+
+def resolve_observables(mock_server, size):
+    """list generated observables on the mock server, each resolving to the next"""
+
+    observables = generate_observables(size)
+    positions = {
+        observable["id"]: index for index, observable in enumerate(observables)
+    }
+
+    def list_observables(arguments):
+        start = int(arguments.get("after") or 0)
+        end = start + arguments["first"]
+        return connection(
+            observables[start:end], has_next_page=end < size, end_cursor=str(end)
+        )
+
+    def list_relationships(arguments):
+        position = positions[arguments["fromId"]]
+        target = observables[(position + 1) % size]
+        return connection(
+            [
+                {
+                    "id": "relationship-" + str(position),
+                    "entity_type": "obs_resolves-to",
+                    "relationship_type": "obs_resolves-to",
+                    "to": {"id": target["id"], "standard_id": target["standard_id"]},
+                }
+            ]
+        )
+
+    mock_server.resolve("stixCyberObservables", list_observables)
+    mock_server.resolve("stixCyberObservableRelationships", list_relationships)
+    return observables
+
+
+def test_export_list_concurrent(mock_client, mock_server):
+    observables = resolve_observables(mock_server, 25)
+    # Workers complete in any order
+    mock_server.jitter = 0.01
+    bundle = mock_client.stix2.export_list("IPv4-Addr", max_workers=1)
+    assert [item["id"] for item in bundle["objects"]] == [
+        observable["standard_id"] for observable in observables
+    ]
+    assert bundle["objects"][0]["resolves_to_refs"] == [observables[1]["standard_id"]]
+    assert mock_client.stix2.export_list("IPv4-Addr", max_workers=4)["objects"] == (
+        bundle["objects"]
+    )
+    streamed = json.loads(
+        "".join(
+            mock_client.stix2.stream_export_list(
+                "IPv4-Addr", page_size=10, max_workers=4
+            )
+        )
+    )
+    assert streamed["type"] == "bundle"
+    assert streamed["objects"] == bundle["objects"]
+    output = io.StringIO()
+    mock_client.stix2.write_export_list(
+        output, "IPv4-Addr", page_size=10, max_workers=4
+    )
+    assert json.loads(output.getvalue())["objects"] == bundle["objects"]
+
+
+def test_export_list_concurrent_error(mock_client, mock_server, monkeypatch):
+    observables = resolve_observables(mock_server, 25)
+    prepare_export = mock_client.stix2.prepare_export
+
+    def fail_export(entity, *args, **kwargs):
+        if entity["id"] == observables[12]["standard_id"]:
+            raise ValueError("Export failed")
+        return prepare_export(entity, *args, **kwargs)
+
+    monkeypatch.setattr(mock_client.stix2, "prepare_export", fail_export)
+    # The error of a worker is raised to the caller
+    with pytest.raises(ValueError, match="Export failed"):
+        mock_client.stix2.export_list("IPv4-Addr", max_workers=4)
+    with pytest.raises(ValueError, match="Export failed"):
+        list(
+            mock_client.stix2.stream_export_list(
+                "IPv4-Addr", page_size=10, max_workers=4
+            )
+        )
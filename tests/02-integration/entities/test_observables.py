@@ -0,0 +1,23 @@
+# coding: utf-8
+
+
+def test_observables_create_bulk(api_client):
+    observables = [
+        {"observableData": {"type": "ipv4-addr", "value": "198.51.100." + str(i)}}
+        for i in range(1, 6)
+    ]
+    observables.append({"observableData": {}})
+
+    results = api_client.stix_cyber_observable.create_bulk(
+        observables=observables, batch_size=2
+    )
+
+    assert len(results) == len(observables)
+    for index, result in enumerate(results[:-1]):
+        assert result["error"] is None
+        assert result["result"]["entity_type"] == "IPv4-Addr"
+        created = api_client.stix_cyber_observable.read(id=result["result"]["id"])
+        assert created["observable_value"] == "198.51.100." + str(index + 1)
+        api_client.stix_cyber_observable.delete(id=result["result"]["id"])
+    assert results[-1]["result"] is None
+    assert results[-1]["error"] is not None
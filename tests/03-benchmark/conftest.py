@@ -0,0 +1,61 @@
+import functools
+
+import pytest
+
+from pycti import OpenCTIApiClient
+from tests.generators import generate_bundle
+from tests.mock.opencti_platform import MockOpenCTIPlatform
+from tests.mock.opencti_server import MockOpenCTIServer
+
+
+def pytest_generate_tests(metafunc):
+    if "bundle_size" in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption("--bundle-sizes").split(",")
+            if size.strip() != ""
+        ]
+        metafunc.parametrize("bundle_size", sizes, ids=[str(size) for size in sizes])
+
+
+@functools.lru_cache(maxsize=1)
+def cached_bundle(size: int):
+    return generate_bundle(size)
+
+
+@pytest.fixture
+def bundle(bundle_size):
+    return cached_bundle(bundle_size)
+
+
+@pytest.fixture
+def rounds(bundle_size):
+    """number of rounds of a benchmark, fewer for larger bundles"""
+
+    return max(1, min(20, 100000 // bundle_size))
+
+
+@pytest.fixture
+def latency():
+    """latency of the mock server, in seconds"""
+
+    return 0.0
+
+
+@pytest.fixture
+def mock_server(latency):
+    with MockOpenCTIServer(latency=latency) as server:
+        yield server
+
+
+@pytest.fixture
+def api_client(mock_server):
+    client = OpenCTIApiClient(mock_server.url, "token", log_level="error")
+    mock_server.reset()
+    return client
+
+
+@pytest.fixture
+def platform(latency):
+    with MockOpenCTIPlatform(latency=latency) as platform, platform.broker.patch():
+        yield platform
@@ -0,0 +1,107 @@
+import copy
+import math
+from collections import Counter
+
+import pytest
+
+from pycti import OpenCTIApiClient
+from tests.generators import (
+    generate_entities,
+    generate_observable_bundle,
+    generate_observables,
+)
+from tests.mock.opencti_server import connection
+
+pytestmark = [
+    pytest.mark.benchmarks,
+    pytest.mark.parametrize("latency", [0.0, 0.005], ids=["local", "remote"]),
+]
+
+SIZE = 1000
+
+
+def test_read_many(benchmark, api_client, mock_server):
+    entities = {entity["id"]: entity for entity in generate_entities(SIZE, "Indicator")}
+    mock_server.resolve("indicator", lambda arguments: entities.get(arguments["id"]))
+
+    def read():
+        mock_server.reset()
+        return api_client.indicator.read_many(ids=list(entities.keys()))
+
+    result = benchmark.pedantic(read, rounds=3)
+    assert len(result) == SIZE
+    assert mock_server.requests == math.ceil(SIZE / 50)
+
+
+def test_export_list_observables(benchmark, api_client, mock_server):
+    observables = generate_observables(SIZE)
+    positions = {
+        observable["id"]: index for index, observable in enumerate(observables)
+    }
+
+    def list_observables(arguments):
+        start = int(arguments.get("after") or 0)
+        end = start + arguments["first"]
+        return connection(
+            observables[start:end], has_next_page=end < SIZE, end_cursor=str(end)
+        )
+
+    def list_relationships(arguments):
+        position = positions[arguments["fromId"]]
+        target = observables[(position + 1) % SIZE]
+        return connection(
+            [
+                {
+                    "id": "relationship-" + str(position),
+                    "entity_type": "obs_resolves-to",
+                    "relationship_type": "obs_resolves-to",
+                    "to": {"id": target["id"], "standard_id": target["standard_id"]},
+                }
+            ]
+        )
+
+    mock_server.resolve("stixCyberObservables", list_observables)
+    mock_server.resolve("stixCyberObservableRelationships", list_relationships)
+
+    def export():
+        mock_server.reset()
+        return api_client.stix2.export_list("IPv4-Addr")
+
+    bundle = benchmark.pedantic(export, rounds=3)
+    assert len(bundle["objects"]) == SIZE
+    assert "resolves_to_refs" in bundle["objects"][0]
+    # One request per page of observables and per 50 observable relationships
+    pages = math.ceil(SIZE / 100)
+    assert mock_server.requests == pages + math.ceil(SIZE / 50)
+
+
+def test_import_bundle_observables(benchmark, platform):
+    bundle = generate_observable_bundle(SIZE)
+    types = Counter(item["type"] for item in bundle["objects"])
+
+    def setup():
+        # A new client for each round, not to reuse the cached labels
+        client = OpenCTIApiClient(platform.url, "token", log_level="error")
+        platform.reset()
+        return (client, copy.deepcopy(bundle)), {}
+
+    def import_bundle(client, data):
+        return client.stix2.import_bundle(data)
+
+    result = benchmark.pedantic(import_bundle, setup=setup, rounds=3)
+    assert len(result) == SIZE
+
+    def batches(count):
+        return math.ceil(count / 50)
+
+    # Addresses and domain names are created by 50, once the addresses exist,
+    # and so are the resolves-to relationships. Labels are created at once.
+    operations = {
+        "OrganizationAdd": types["identity"],
+        "BatchLabelAdd": 1,
+        "BatchStixCyberObservableAdd": batches(types["ipv4-addr"])
+        + batches(types["domain-name"]),
+        "BatchStixCyberObservableRelationshipAdd": batches(types["domain-name"]),
+    }
+    assert platform.operations == operations
+    assert platform.requests == sum(operations.values())
@@ -0,0 +1,83 @@
+import json
+import uuid
+
+import pytest
+
+from pycti import OpenCTIApiClient
+from tests.generators import generate_bundle
+
+pytestmark = [
+    pytest.mark.benchmarks,
+    pytest.mark.parametrize("latency", [0.0, 0.005], ids=["local", "remote"]),
+]
+
+MESSAGES = 100
+SIZE = 200
+
+
+@pytest.mark.parametrize("workers", [1, 8])
+def test_listen(benchmark, platform, create_helper, workers):
+    helper = create_helper(listen_workers=workers)
+    queue = helper.config["listen"]
+    observables = [
+        helper.api.stix_cyber_observable.create(
+            observableData={"type": "ipv4-addr", "value": "10.0.0." + str(index)}
+        )
+        for index in range(MESSAGES)
+    ]
+
+    def callback(event):
+        # Enrichments are bound by the latency of their API calls, not by
+        # the processing of their small bundles
+        observable = helper.api.stix_cyber_observable.read(id=event["entity_id"])
+        bundle = {
+            "type": "bundle",
+            "id": "bundle--" + str(uuid.uuid4()),
+            "objects": [
+                {
+                    "type": "ipv4-addr",
+                    "spec_version": "2.1",
+                    "id": observable["standard_id"],
+                    "value": observable["value"],
+                    "x_opencti_score": 50,
+                }
+            ],
+        }
+        helper.send_stix2_bundle(json.dumps(bundle))
+        return "Processed"
+
+    def setup():
+        # Only the bundles of the last round are checked
+        platform.process_bundles(helper.connector_id)
+
+    def process():
+        for observable in observables:
+            platform.send_message(helper.connector_id, {"entity_id": observable["id"]})
+        assert platform.broker.wait_empty(queue, timeout=600)
+
+    helper.listen(callback)
+    benchmark.pedantic(process, setup=setup, rounds=3)
+    bundles = platform.process_bundles(helper.connector_id)
+    assert len(bundles) == MESSAGES
+
+
+def test_import(benchmark, platform, create_helper):
+    bundle = generate_bundle(SIZE)
+    content = json.dumps(bundle)
+    client = OpenCTIApiClient(platform.url, "token", log_level="error")
+    helper = create_helper(type="EXTERNAL_IMPORT")
+
+    def run():
+        # The connector pushes its bundle, the worker imports the split
+        # bundles in order
+        work_id = helper.api.work.initiate_work(helper.connector_id, "Import")
+        helper.send_stix2_bundle(content, work_id=work_id)
+        for item in platform.process_bundles(helper.connector_id):
+            client.stix2.import_bundle(item)
+        return work_id
+
+    # Every round tracks its own work
+    work_id = benchmark.pedantic(run, rounds=3)
+    tracking = platform.works[work_id]["tracking"]
+    assert tracking["import_processed_number"] == SIZE
+    assert all(platform.get(item["id"]) is not None for item in bundle["objects"])
@@ -0,0 +1,25 @@
+import pytest
+
+from pycti.utils import opencti_json
+from pycti.utils.opencti_stix2_splitter import OpenCTIStix2Splitter
+
+pytestmark = pytest.mark.benchmarks
+
+
+def test_split_bundle(benchmark, bundle, bundle_size, rounds):
+    content = opencti_json.dumps_str(bundle)
+    bundles = benchmark.pedantic(
+        lambda: OpenCTIStix2Splitter().split_bundle(content), rounds=rounds
+    )
+    assert len(bundles) == bundle_size
+
+
+def test_create_bundle(benchmark, bundle, rounds):
+    objects = bundle["objects"]
+    result = benchmark.pedantic(
+        lambda: OpenCTIStix2Splitter().stix2_create_bundle(
+            bundle["id"], 0, objects, use_json=True, event_version=None
+        ),
+        rounds=rounds,
+    )
+    assert len(result) > 0
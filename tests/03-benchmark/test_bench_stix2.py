@@ -0,0 +1,58 @@
+import copy
+
+import pytest
+
+from pycti import OpenCTIConnectorHelper
+from tests.generators import generate_entities
+
+pytestmark = pytest.mark.benchmarks
+
+# Entities of the API are much larger than STIX objects, bound their number
+MAX_ENTITIES = 100000
+
+
+@pytest.fixture
+def entities(bundle_size):
+    if bundle_size > MAX_ENTITIES:
+        pytest.skip("at most " + str(MAX_ENTITIES) + " entities are benchmarked")
+    return generate_entities(bundle_size)
+
+
+def test_deduplicate_objects(benchmark, bundle, bundle_size, rounds):
+    objects = bundle["objects"] + bundle["objects"][: bundle_size // 2]
+    result = benchmark.pedantic(
+        OpenCTIConnectorHelper.stix2_deduplicate_objects, (objects,), rounds=rounds
+    )
+    assert len(result) == bundle_size
+
+
+def test_process_multiple_fields(benchmark, api_client, entities, rounds):
+    def setup():
+        return (copy.deepcopy(entities),), {}
+
+    def process(data):
+        return [api_client.process_multiple_fields(entity) for entity in data]
+
+    result = benchmark.pedantic(process, setup=setup, rounds=rounds)
+    assert len(result) == len(entities)
+    assert "objectMarkingIds" in result[0]
+
+
+def test_export_entities(benchmark, api_client, mock_server, entities, rounds):
+    processed = [api_client.process_multiple_fields(entity) for entity in entities]
+
+    def setup():
+        return (copy.deepcopy(processed),), {}
+
+    def export(data):
+        return [
+            api_client.stix2.prepare_export(
+                api_client.stix2.generate_export(entity), "simple"
+            )
+            for entity in data
+        ]
+
+    result = benchmark.pedantic(export, setup=setup, rounds=rounds)
+    assert len(result) == len(entities)
+    # Entities without relationships are exported without any request
+    assert mock_server.requests == 0
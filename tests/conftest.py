@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 from pytest_cases import fixture
 
@@ -5,6 +7,7 @@ from pycti import (
     OpenCTIApiClient,
     OpenCTIApiConnector,
     OpenCTIApiWork,
+    OpenCTIConnectorHelper,
     OpenCTIStix2,
     OpenCTIStix2Splitter,
 )
@@ -39,20 +42,59 @@ def opencti_splitter():
     return OpenCTIStix2Splitter()
 
 
+@fixture
+def create_helper(platform):
+    """factory of connector helpers registered on the mock platform, stopped
+    at teardown"""
+
+    helpers = []
+
+    def create(helper_class=OpenCTIConnectorHelper, **connector):
+        helper = helper_class(
+            {
+                "opencti": {"url": platform.url, "token": "token"},
+                "connector": {
+                    "id": str(uuid.uuid4()),
+                    "type": "INTERNAL_ENRICHMENT",
+                    "name": "Mock",
+                    "scope": "IPv4-Addr",
+                    "log_level": "error",
+                    **connector,
+                },
+            }
+        )
+        helpers.append(helper)
+        return helper
+
+    yield create
+    for helper in helpers:
+        helper.stop()
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--connectors", action="store_true", default=False, help="run connector tests"
     )
+    parser.addoption(
+        "--benchmarks", action="store_true", default=False, help="run benchmarks"
+    )
+    parser.addoption(
+        "--bundle-sizes",
+        default="1000",
+        help="comma separated number of objects of the benchmarked bundles",
+    )
 
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "connectors: mark connector tests to run")
+    config.addinivalue_line("markers", "benchmarks: mark benchmarks to run")
 
 
 def pytest_collection_modifyitems(config, items):
-    if config.getoption("--connectors"):
-        return
     skip_connectors = pytest.mark.skip(reason="need --connectors to run")
+    skip_benchmarks = pytest.mark.skip(reason="need --benchmarks to run")
     for item in items:
-        if "connectors" in item.keywords:
+        if "connectors" in item.keywords and not config.getoption("--connectors"):
             item.add_marker(skip_connectors)
+        if "benchmarks" in item.keywords and not config.getoption("--benchmarks"):
+            item.add_marker(skip_benchmarks)
@@ -0,0 +1,288 @@
+import random
+import uuid
+from typing import Dict, List
+
+TLP_WHITE = "marking-definition--613f2e26-407d-48c7-9eca-b8e91df99dc9"
+TLP_GREEN = "marking-definition--34098fce-860f-48ae-8e50-ebd3cc5e41da"
+CREATED = "2021-06-01T00:00:00.000Z"
+
+
+def generate_id(rand: random.Random, stix_type: str) -> str:
+    return stix_type + "--" + str(uuid.UUID(int=rand.getrandbits(128), version=4))
+
+
+def generate_objects(size: int, seed: int = 42) -> List[Dict]:
+    """generate a list of synthetic STIX objects with references
+
+    Objects come in groups of an indicator, a malware, two observables and the
+    relationships between them, a report referencing the last groups is added
+    every 100 objects. Authors and markings are shared by all the objects. The
+    same seed always gives the same objects.
+
+    :param size: number of objects to generate
+    :type size: int
+    :param seed: seed of the generated ids
+    :type seed: int
+    :return: list of STIX objects
+    :rtype: list
+    """
+
+    rand = random.Random(seed)
+    authors = [
+        {
+            "type": "identity",
+            "spec_version": "2.1",
+            "id": generate_id(rand, "identity"),
+            "created": CREATED,
+            "modified": CREATED,
+            "name": "Author " + str(index),
+            "identity_class": "organization",
+        }
+        for index in range(10)
+    ]
+    objects = authors[: min(size, len(authors))]
+    report_refs = []
+    index = 0
+    while len(objects) < size:
+        author = authors[index % len(authors)]["id"]
+        markings = [TLP_WHITE if index % 2 == 0 else TLP_GREEN]
+        address = "10." + ".".join(str(index >> shift & 255) for shift in (16, 8, 0))
+        ipv4 = {
+            "type": "ipv4-addr",
+            "spec_version": "2.1",
+            "id": generate_id(rand, "ipv4-addr"),
+            "value": address,
+            "object_marking_refs": markings,
+        }
+        domain = {
+            "type": "domain-name",
+            "spec_version": "2.1",
+            "id": generate_id(rand, "domain-name"),
+            "value": "host" + str(index) + ".example.com",
+            "resolves_to_refs": [ipv4["id"]],
+            "object_marking_refs": markings,
+        }
+        indicator = {
+            "type": "indicator",
+            "spec_version": "2.1",
+            "id": generate_id(rand, "indicator"),
+            "created": CREATED,
+            "modified": CREATED,
+            "name": address,
+            "pattern": "[ipv4-addr:value = '" + address + "']",
+            "pattern_type": "stix",
+            "valid_from": CREATED,
+            "labels": ["malicious-activity"],
+            "created_by_ref": author,
+            "object_marking_refs": markings,
+        }
+        malware = {
+            "type": "malware",
+            "spec_version": "2.1",
+            "id": generate_id(rand, "malware"),
+            "created": CREATED,
+            "modified": CREATED,
+            "name": "Malware " + str(index),
+            "is_family": True,
+            "kill_chain_phases": [
+                {"kill_chain_name": "mitre-attack", "phase_name": "execution"}
+            ],
+            "external_references": [
+                {
+                    "source_name": "example",
+                    "url": "https://example.com/malware/" + str(index),
+                }
+            ],
+            "created_by_ref": author,
+            "object_marking_refs": markings,
+        }
+        group = [ipv4, domain, indicator, malware]
+        for relationship_type, source, target in (
+            ("indicates", indicator, malware),
+            ("based-on", indicator, ipv4),
+            ("communicates-with", malware, domain),
+        ):
+            group.append(
+                {
+                    "type": "relationship",
+                    "spec_version": "2.1",
+                    "id": generate_id(rand, "relationship"),
+                    "created": CREATED,
+                    "modified": CREATED,
+                    "relationship_type": relationship_type,
+                    "source_ref": source["id"],
+                    "target_ref": target["id"],
+                    "created_by_ref": author,
+                    "object_marking_refs": markings,
+                }
+            )
+        for item in group:
+            if len(objects) == size:
+                break
+            objects.append(item)
+            report_refs.append(item["id"])
+        if len(report_refs) >= 100 and len(objects) < size:
+            objects.append(
+                {
+                    "type": "report",
+                    "spec_version": "2.1",
+                    "id": generate_id(rand, "report"),
+                    "created": CREATED,
+                    "modified": CREATED,
+                    "name": "Report " + str(index),
+                    "published": CREATED,
+                    "report_types": ["threat-report"],
+                    "object_refs": report_refs,
+                    "created_by_ref": author,
+                    "object_marking_refs": markings,
+                }
+            )
+            report_refs = []
+        index += 1
+    return objects
+
+
+def generate_bundle(size: int, seed: int = 42) -> Dict:
+    """generate a synthetic STIX2 bundle, see `generate_objects`"""
+
+    return {
+        "type": "bundle",
+        "id": "bundle--" + str(uuid.UUID(int=seed, version=4)),
+        "objects": generate_objects(size, seed),
+    }
+
+
+def generate_observable_bundle(size: int, seed: int = 42) -> Dict:
+    """generate a synthetic STIX2 bundle of labelled observables
+
+    The bundle holds the authors and the IPv4 addresses and domain names of
+    `generate_objects`, each domain name resolving to an address. Observables
+    share five labels.
+    """
+
+    objects = [
+        item
+        for item in generate_objects(size * 4, seed)
+        if item["type"] in ("identity", "ipv4-addr", "domain-name")
+    ][:size]
+    for index, item in enumerate(objects):
+        if item["type"] != "identity":
+            item["labels"] = ["label-" + str(index % 5)]
+    return {
+        "type": "bundle",
+        "id": "bundle--" + str(uuid.UUID(int=seed, version=4)),
+        "objects": objects,
+    }
+
+
+def generate_entities(size: int, entity_type: str = "Indicator") -> List[Dict]:
+    """generate entities as returned by the OpenCTI API, before processing
+
+    :param size: number of entities to generate
+    :type size: int
+    :param entity_type: the type of the entities
+    :type entity_type: str
+    :return: list of entities
+    :rtype: list
+    """
+
+    rand = random.Random(size)
+    stix_type = entity_type.lower()
+    marking = {
+        "id": "f2c2a1a4-3b2c-4f3a-9a63-1d7f0f3f1f51",
+        "standard_id": TLP_GREEN,
+        "entity_type": "Marking-Definition",
+        "definition_type": "TLP",
+        "definition": "TLP:GREEN",
+        "x_opencti_order": 1,
+        "x_opencti_color": "#2e7d32",
+        "created": CREATED,
+        "modified": CREATED,
+    }
+    return [
+        {
+            "id": str(uuid.UUID(int=rand.getrandbits(128), version=4)),
+            "standard_id": generate_id(rand, stix_type),
+            "entity_type": entity_type,
+            "parent_types": ["Basic-Object", "Stix-Object", "Stix-Core-Object"],
+            "spec_version": "2.1",
+            "created_at": CREATED,
+            "updated_at": CREATED,
+            "created": CREATED,
+            "modified": CREATED,
+            "name": "Entity " + str(index),
+            "description": "Synthetic entity " + str(index),
+            "pattern": "[ipv4-addr:value = '10.0.0." + str(index % 256) + "']",
+            "pattern_type": "stix",
+            "valid_from": CREATED,
+            "createdBy": None,
+            "objectMarking": {"edges": [{"node": marking}]},
+            "objectLabel": {
+                "edges": [
+                    {
+                        "node": {
+                            "id": "label-" + str(index % 10),
+                            "value": "label " + str(index % 10),
+                            "color": "#ffffff",
+                        }
+                    }
+                ]
+            },
+            "externalReferences": {
+                "edges": [
+                    {
+                        "node": {
+                            "id": "reference-" + str(index),
+                            "source_name": "example",
+                            "description": None,
+                            "url": "https://example.com/" + str(index),
+                            "hash": None,
+                            "external_id": None,
+                            "importFiles": {"edges": []},
+                        }
+                    }
+                ]
+            },
+            "killChainPhases": {"edges": []},
+            "importFiles": {"edges": []},
+        }
+        for index in range(size)
+    ]
+
+
+def generate_observables(size: int, entity_type: str = "IPv4-Addr") -> List[Dict]:
+    """generate observables as returned by the OpenCTI API, before processing
+
+    :param size: number of observables to generate
+    :type size: int
+    :param entity_type: the type of the observables
+    :type entity_type: str
+    :return: list of observables
+    :rtype: list
+    """
+
+    rand = random.Random(size)
+    stix_type = entity_type.lower()
+    observables = []
+    for index in range(size):
+        value = "10." + ".".join(str(index >> shift & 255) for shift in (16, 8, 0))
+        observables.append(
+            {
+                "id": str(uuid.UUID(int=rand.getrandbits(128), version=4)),
+                "standard_id": generate_id(rand, stix_type),
+                "entity_type": entity_type,
+                "parent_types": ["Basic-Object", "Stix-Object", "Stix-Core-Object"],
+                "spec_version": "2.1",
+                "created_at": CREATED,
+                "updated_at": CREATED,
+                "observable_value": value,
+                "value": value,
+                "x_opencti_score": 50,
+                "createdBy": None,
+                "objectMarking": {"edges": []},
+                "objectLabel": {"edges": []},
+                "externalReferences": {"edges": []},
+                "importFiles": {"edges": []},
+            }
+        )
+    return observables
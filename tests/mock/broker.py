@@ -0,0 +1,357 @@
+import contextlib
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from unittest import mock
+
+import pika
+import pika.exceptions
+import pika.frame
+import pika.spec
+
+
+class Message:
+    def __init__(
+        self, exchange: str, routing_key: str, body: bytes, properties=None
+    ) -> None:
+        self.exchange = exchange
+        self.routing_key = routing_key
+        self.body = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.properties = properties or pika.BasicProperties()
+        self.redelivered = False
+
+
+class InMemoryBroker:
+    """In-memory stand-in of RabbitMQ for the pika blocking API
+
+    Exchanges are direct exchanges routing messages to the queues bound with
+    the same routing key. `patch` replaces `pika.BlockingConnection` by
+    connections to this broker, so the code using pika runs unchanged. Messages
+    left unacknowledged by a closed channel are requeued as redelivered.
+
+    :param fail_connections: number of the next connections to refuse
+    :type fail_connections: int
+    """
+
+    def __init__(self, fail_connections: int = 0) -> None:
+        self.condition = threading.Condition()
+        self.queues: Dict[str, Deque[Message]] = {}
+        self.bindings: Dict[Tuple[str, str], List[str]] = {}
+        self.unroutable: List[Message] = []
+        self.connections: List["BlockingConnection"] = []
+        self.fail_connections = fail_connections
+        self.published = 0
+        self.acknowledged = 0
+        self.rejected = 0
+        self.closed = False
+
+    def declare_queue(self, queue: str) -> None:
+        with self.condition:
+            self.queues.setdefault(queue, deque())
+
+    def bind(self, exchange: str, routing_key: str, queue: str) -> None:
+        with self.condition:
+            self.queues.setdefault(queue, deque())
+            queues = self.bindings.setdefault((exchange, routing_key), [])
+            if queue not in queues:
+                queues.append(queue)
+
+    def publish(
+        self, exchange: str, routing_key: str, body: bytes, properties=None
+    ) -> bool:
+        """route a message, to the queue named as the routing key if no exchange"""
+
+        message = Message(exchange, routing_key, body, properties)
+        with self.condition:
+            if exchange == "":
+                queues = [routing_key] if routing_key in self.queues else []
+            else:
+                queues = self.bindings.get((exchange, routing_key), [])
+            if len(queues) == 0:
+                self.unroutable.append(message)
+                return False
+            for queue in queues:
+                self.queues[queue].append(message)
+            self.published += 1
+            self.condition.notify_all()
+        return True
+
+    def messages(self, queue: str) -> List[bytes]:
+        """bodies of the messages waiting in a queue"""
+
+        with self.condition:
+            return [message.body for message in self.queues.get(queue, [])]
+
+    def purge(self, queue: str) -> int:
+        with self.condition:
+            count = len(self.queues.get(queue, []))
+            self.queues[queue] = deque()
+            return count
+
+    def drain(self, queue: str) -> List[Message]:
+        """remove and return the messages waiting in a queue"""
+
+        with self.condition:
+            messages = list(self.queues.get(queue, []))
+            self.queues[queue] = deque()
+            return messages
+
+    def wait_empty(self, queue: str, timeout: Optional[float] = None) -> bool:
+        """wait until a queue is empty and all its messages are acknowledged"""
+
+        def empty():
+            return len(self.queues.get(queue, [])) == 0 and all(
+                len(channel.unacked) == 0
+                for connection in self.connections
+                for channel in connection.channels
+            )
+
+        with self.condition:
+            return self.condition.wait_for(empty, timeout)
+
+    def connection(self, parameters=None) -> "BlockingConnection":
+        with self.condition:
+            if self.closed:
+                raise pika.exceptions.AMQPConnectionError("Broker is shut down")
+            if self.fail_connections > 0:
+                self.fail_connections -= 1
+                raise pika.exceptions.AMQPConnectionError("Connection refused")
+            connection = BlockingConnection(self, parameters)
+            self.connections.append(connection)
+            return connection
+
+    @contextlib.contextmanager
+    def patch(self):
+        """replace the pika blocking connections by connections to this broker"""
+
+        with mock.patch.object(pika, "BlockingConnection", self.connection):
+            try:
+                yield self
+            finally:
+                self.shutdown()
+
+    def shutdown(self) -> None:
+        """close every connection, consumers return from `start_consuming`"""
+
+        with self.condition:
+            self.closed = True
+            connections = list(self.connections)
+        for connection in connections:
+            connection.close()
+
+
+class BlockingConnection:
+    """Stub of `pika.BlockingConnection` connected to an `InMemoryBroker`"""
+
+    def __init__(self, broker: InMemoryBroker, parameters=None) -> None:
+        self.broker = broker
+        self.parameters = parameters
+        self.channels: List["BlockingChannel"] = []
+        self.callbacks: Deque[Callable] = deque()
+        self.is_open = True
+
+    @property
+    def is_closed(self) -> bool:
+        return not self.is_open
+
+    def channel(self, channel_number: Optional[int] = None) -> "BlockingChannel":
+        if not self.is_open:
+            raise pika.exceptions.ConnectionWrongStateError("Connection is closed")
+        channel = BlockingChannel(self, channel_number or len(self.channels) + 1)
+        self.channels.append(channel)
+        return channel
+
+    def add_callback_threadsafe(self, callback: Callable) -> None:
+        with self.broker.condition:
+            if not self.is_open:
+                raise pika.exceptions.ConnectionWrongStateError("Connection is closed")
+            self.callbacks.append(callback)
+            self.broker.condition.notify_all()
+
+    def process_data_events(self, time_limit: float = 0) -> None:
+        self.run_callbacks()
+        if time_limit:
+            time.sleep(time_limit)
+
+    def sleep(self, duration: float) -> None:
+        self.process_data_events(duration)
+
+    def run_callbacks(self) -> None:
+        while True:
+            with self.broker.condition:
+                if len(self.callbacks) == 0:
+                    return
+                callback = self.callbacks.popleft()
+            callback()
+
+    def close(self, reply_code: int = 200, reply_text: str = "Normal shutdown"):
+        with self.broker.condition:
+            if not self.is_open:
+                return
+            self.is_open = False
+            channels = list(self.channels)
+            self.broker.condition.notify_all()
+        for channel in channels:
+            channel.close()
+        with self.broker.condition:
+            if self in self.broker.connections:
+                self.broker.connections.remove(self)
+            self.broker.condition.notify_all()
+
+
+class BlockingChannel:
+    """Stub of `pika.adapters.blocking_connection.BlockingChannel`"""
+
+    def __init__(self, connection: BlockingConnection, channel_number: int) -> None:
+        self.connection = connection
+        self.broker = connection.broker
+        self.channel_number = channel_number
+        self.prefetch_count = 0
+        self.consumers: Dict[str, Tuple[str, Callable, bool]] = {}
+        self.unacked: Dict[int, Tuple[str, Message]] = {}
+        self.delivery_tags = itertools.count(1)
+        self.consumer_tags = itertools.count(1)
+        self.consuming = False
+        self.is_open = True
+
+    @property
+    def is_closed(self) -> bool:
+        return not self.is_open
+
+    def check_open(self) -> None:
+        if not self.is_open:
+            raise pika.exceptions.ChannelWrongStateError("Channel is closed")
+
+    def basic_qos(self, prefetch_size=0, prefetch_count=0, global_qos=False):
+        self.check_open()
+        self.prefetch_count = prefetch_count
+
+    def confirm_delivery(self) -> None:
+        self.check_open()
+
+    def queue_declare(self, queue: str = "", **kwargs):
+        self.check_open()
+        self.broker.declare_queue(queue)
+        return pika.frame.Method(
+            self.channel_number,
+            pika.spec.Queue.DeclareOk(
+                queue=queue, message_count=len(self.broker.queues[queue])
+            ),
+        )
+
+    def exchange_declare(self, exchange: str = None, **kwargs) -> None:
+        self.check_open()
+
+    def queue_bind(self, queue: str, exchange: str, routing_key: str = None, **kwargs):
+        self.check_open()
+        self.broker.bind(exchange, routing_key or queue, queue)
+
+    def basic_publish(
+        self, exchange: str, routing_key: str, body, properties=None, mandatory=False
+    ) -> None:
+        self.check_open()
+        routed = self.broker.publish(exchange, routing_key, body, properties)
+        if not routed and mandatory:
+            raise pika.exceptions.UnroutableError([])
+
+    def basic_consume(
+        self,
+        queue: str,
+        on_message_callback: Callable,
+        auto_ack: bool = False,
+        **kwargs,
+    ) -> str:
+        self.check_open()
+        with self.broker.condition:
+            if queue not in self.broker.queues:
+                raise pika.exceptions.ChannelClosedByBroker(
+                    404, "NOT_FOUND - no queue '" + queue + "'"
+                )
+            consumer_tag = "ctag" + str(next(self.consumer_tags))
+            self.consumers[consumer_tag] = (queue, on_message_callback, auto_ack)
+        return consumer_tag
+
+    def basic_ack(self, delivery_tag: int = 0, multiple: bool = False) -> None:
+        with self.broker.condition:
+            tags = (
+                [tag for tag in self.unacked if tag <= delivery_tag]
+                if multiple
+                else [delivery_tag]
+            )
+            for tag in tags:
+                if self.unacked.pop(tag, None) is not None:
+                    self.broker.acknowledged += 1
+            self.broker.condition.notify_all()
+
+    def basic_nack(self, delivery_tag: int = 0, multiple=False, requeue=True) -> None:
+        with self.broker.condition:
+            entry = self.unacked.pop(delivery_tag, None)
+            if entry is not None and requeue:
+                queue, message = entry
+                message.redelivered = True
+                self.broker.queues[queue].appendleft(message)
+            elif entry is not None:
+                self.broker.rejected += 1
+            self.broker.condition.notify_all()
+
+    def next_delivery(self) -> Optional[Tuple[str, Callable, int, Message]]:
+        """take the next message to deliver to a consumer, if any"""
+
+        for consumer_tag, (queue, callback, auto_ack) in self.consumers.items():
+            if (
+                self.prefetch_count > 0
+                and not auto_ack
+                and len(self.unacked) >= self.prefetch_count
+            ):
+                return None
+            messages = self.broker.queues[queue]
+            if len(messages) > 0:
+                message = messages.popleft()
+                delivery_tag = next(self.delivery_tags)
+                if not auto_ack:
+                    self.unacked[delivery_tag] = (queue, message)
+                return consumer_tag, callback, delivery_tag, message
+        return None
+
+    def start_consuming(self) -> None:
+        """deliver messages until `stop_consuming` or the connection is closed"""
+
+        self.consuming = True
+        while True:
+            self.connection.run_callbacks()
+            with self.broker.condition:
+                if not self.consuming or not self.is_open:
+                    return
+                delivery = self.next_delivery()
+                if delivery is None:
+                    self.broker.condition.wait(0.05)
+                    continue
+            consumer_tag, callback, delivery_tag, message = delivery
+            method = pika.spec.Basic.Deliver(
+                consumer_tag=consumer_tag,
+                delivery_tag=delivery_tag,
+                redelivered=message.redelivered,
+                exchange=message.exchange,
+                routing_key=message.routing_key,
+            )
+            callback(self, method, message.properties, message.body)
+
+    def stop_consuming(self, consumer_tag: str = None) -> None:
+        with self.broker.condition:
+            self.consuming = False
+            self.broker.condition.notify_all()
+
+    def close(self, reply_code: int = 0, reply_text: str = "Normal shutdown"):
+        with self.broker.condition:
+            if not self.is_open:
+                return
+            self.is_open = False
+            self.consuming = False
+            # Unacknowledged messages are redelivered
+            for _, (queue, message) in sorted(self.unacked.items(), reverse=True):
+                message.redelivered = True
+                self.broker.queues[queue].appendleft(message)
+            self.unacked = {}
+            self.broker.condition.notify_all()
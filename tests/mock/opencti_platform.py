@@ -0,0 +1,669 @@
+import base64
+import datetime
+import json
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from tests.mock.broker import InMemoryBroker
+from tests.mock.opencti_server import MockOpenCTIServer, connection
+
+BASIC = ["Basic-Object", "Stix-Object"]
+DOMAIN_OBJECT = BASIC + ["Stix-Core-Object", "Stix-Domain-Object"]
+META_OBJECT = BASIC + ["Stix-Meta-Object"]
+OBSERVABLE = BASIC + ["Stix-Core-Object", "Stix-Cyber-Observable"]
+RELATIONSHIP = ["basic-relationship", "stix-relationship"]
+
+# Entity type, read, list and add fields
+ENTITIES = [
+    ("Attack-Pattern", "attackPattern", "attackPatterns", "attackPatternAdd"),
+    ("Campaign", "campaign", "campaigns", "campaignAdd"),
+    ("Course-Of-Action", "courseOfAction", "coursesOfAction", "courseOfActionAdd"),
+    ("Incident", "incident", "incidents", "incidentAdd"),
+    ("Indicator", "indicator", "indicators", "indicatorAdd"),
+    ("Infrastructure", "infrastructure", "infrastructures", "infrastructureAdd"),
+    ("Intrusion-Set", "intrusionSet", "intrusionSets", "intrusionSetAdd"),
+    ("Malware", "malware", "malwares", "malwareAdd"),
+    ("Note", "note", "notes", "noteAdd"),
+    ("Observed-Data", "observedData", "observedDatas", "observedDataAdd"),
+    ("Opinion", "opinion", "opinions", "opinionAdd"),
+    ("Report", "report", "reports", "reportAdd"),
+    ("Threat-Actor", "threatActor", "threatActors", "threatActorAdd"),
+    ("Tool", "tool", "tools", "toolAdd"),
+    ("Vulnerability", "vulnerability", "vulnerabilities", "vulnerabilityAdd"),
+]
+META_ENTITIES = [
+    ("Label", "label", "labels", "labelAdd"),
+    ("Kill-Chain-Phase", "killChainPhase", "killChainPhases", "killChainPhaseAdd"),
+    (
+        "External-Reference",
+        "externalReference",
+        "externalReferences",
+        "externalReferenceAdd",
+    ),
+    (
+        "Marking-Definition",
+        "markingDefinition",
+        "markingDefinitions",
+        "markingDefinitionAdd",
+    ),
+]
+# Read and list fields of abstract types
+ABSTRACT_ENTITIES = [
+    ("Identity", "identity", "identities"),
+    ("Location", "location", "locations"),
+    ("Stix-Domain-Object", "stixDomainObject", "stixDomainObjects"),
+    ("Stix-Core-Object", "stixCoreObject", "stixCoreObjects"),
+    ("Stix-Cyber-Observable", "stixCyberObservable", "stixCyberObservables"),
+    ("stix-core-relationship", "stixCoreRelationship", "stixCoreRelationships"),
+    (
+        "stix-sighting-relationship",
+        "stixSightingRelationship",
+        "stixSightingRelationships",
+    ),
+    (
+        "stix-cyber-observable-relationship",
+        "stixCyberObservableRelationship",
+        "stixCyberObservableRelationships",
+    ),
+]
+REFERENCES = ["objectMarking", "objectLabel", "externalReferences", "killChainPhases"]
+# Fields identifying an entity when no STIX id is given, for upserts
+NATURAL_KEYS = [
+    ("name",),
+    ("value",),
+    ("observable_value",),
+    ("definition_type", "definition"),
+    ("kill_chain_name", "phase_name"),
+    ("source_name", "url", "external_id"),
+    ("relationship_type", "fromId", "toId"),
+]
+OBSERVABLE_FIELDS = [
+    "type",
+    "stix_id",
+    "x_opencti_score",
+    "x_opencti_description",
+    "createIndicator",
+    "createdBy",
+    "objectMarking",
+    "objectLabel",
+    "externalReferences",
+]
+
+
+def now() -> str:
+    return (
+        datetime.datetime.utcnow()
+        .replace(tzinfo=datetime.timezone.utc)
+        .isoformat(timespec="milliseconds")
+        .replace("+00:00", "Z")
+    )
+
+
+class MockOpenCTIPlatform(MockOpenCTIServer):
+    """Mock OpenCTI platform keeping its data in memory
+
+    Implements the subset of the API used by pycti connectors: entities can be
+    added (upserted on their STIX id or natural key), read and listed with
+    filters and pagination, works follow their messages and expectations, and
+    connectors are registered and pinged. Registered connectors get queues on
+    an `InMemoryBroker`, see `send_message` to trigger them.
+
+    See `MockOpenCTIServer` for latency and error injection.
+
+    :param broker: the broker of the connector queues
+    :type broker: InMemoryBroker
+    """
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.broker = broker or InMemoryBroker()
+        self.store_lock = threading.RLock()
+        self.entities: Dict[str, Dict] = {}
+        self.works: Dict[str, Dict] = {}
+        self.connectors: Dict[str, Dict] = {}
+        self.user = {"id": str(uuid.uuid4()), "name": "admin"}
+        for entity_type, read, list_field, add in ENTITIES:
+            self.register_entity(entity_type, read, list_field, add, DOMAIN_OBJECT)
+        for entity_type, read, list_field, add in META_ENTITIES:
+            self.register_entity(entity_type, read, list_field, add, META_OBJECT)
+        for entity_type, read, list_field in ABSTRACT_ENTITIES:
+            self.register_entity(entity_type, read, list_field)
+        self.resolve(
+            "organizationAdd",
+            lambda arguments: self.add("Organization", arguments["input"]),
+        )
+        self.resolve(
+            "individualAdd",
+            lambda arguments: self.add("Individual", arguments["input"]),
+        )
+        self.resolve(
+            "identityAdd",
+            lambda arguments: self.add(arguments["input"]["type"], arguments["input"]),
+        )
+        self.resolve(
+            "locationAdd",
+            lambda arguments: self.add(arguments["input"]["type"], arguments["input"]),
+        )
+        self.resolve("stixCyberObservableAdd", self.add_observable)
+        self.resolve(
+            "stixCoreRelationshipAdd",
+            lambda arguments: self.add(
+                "stix-core-relationship",
+                arguments["input"],
+                RELATIONSHIP + ["stix-core-relationship"],
+            ),
+        )
+        self.resolve(
+            "stixSightingRelationshipAdd",
+            lambda arguments: self.add(
+                "stix-sighting-relationship",
+                arguments["input"],
+                RELATIONSHIP + ["stix-sighting-relationship"],
+            ),
+        )
+        for edit in (
+            "stixDomainObjectEdit",
+            "stixCoreObjectEdit",
+            "stixCyberObservableEdit",
+            "stixCoreRelationshipEdit",
+        ):
+            self.resolve(edit, self.edit_entity)
+        # Works
+        self.resolve("workAdd", self.add_work)
+        self.resolve("work", lambda arguments: self.works.get(arguments["id"]))
+        self.resolve("works", self.list_works)
+        self.resolve("workEdit", self.edit_work)
+        # Connectors
+        self.resolve("registerConnector", self.register_connector)
+        self.resolve("pingConnector", self.ping_connector)
+        self.resolve("deleteConnector", self.delete_connector)
+        self.resolve("connectors", lambda arguments: list(self.connectors.values()))
+        self.resolve(
+            "connector", lambda arguments: self.connectors.get(arguments["id"])
+        )
+
+    # Entities
+
+    def register_entity(
+        self,
+        entity_type: str,
+        read: str,
+        list_field: str,
+        add: Optional[str] = None,
+        parent_types: Optional[List[str]] = None,
+    ) -> None:
+        self.resolve(read, lambda arguments: self.read_entity(entity_type, arguments))
+        self.resolve(
+            list_field, lambda arguments: self.list_entities(entity_type, arguments)
+        )
+        if add is not None:
+            self.resolve(
+                add,
+                lambda arguments: self.add(
+                    entity_type, arguments["input"], parent_types
+                ),
+            )
+
+    def get(self, id: Optional[str]) -> Optional[Dict]:
+        """get an entity by id or standard id"""
+
+        if id is None:
+            return None
+        with self.store_lock:
+            return self.entities.get(id)
+
+    def find(self, entity_type: str, data: Dict) -> Optional[Dict]:
+        for key in ("stix_id", "id"):
+            entity = self.get(data.get(key))
+            if entity is not None:
+                return entity
+        for fields in NATURAL_KEYS:
+            if all(data.get(field) is not None for field in fields):
+                for entity in self.entities.values():
+                    if entity["entity_type"] == entity_type and all(
+                        entity.get(field) == data[field] for field in fields
+                    ):
+                        return entity
+                return None
+        return None
+
+    def add(
+        self, entity_type: str, data: Dict, parent_types: Optional[List[str]] = None
+    ) -> Dict:
+        """add an entity, or update the existing one with the same identity"""
+
+        if parent_types is None:
+            parent_types = DOMAIN_OBJECT
+            if entity_type in ("Organization", "Individual", "Sector", "System"):
+                parent_types = DOMAIN_OBJECT + ["Identity"]
+            elif entity_type in ("City", "Country", "Region", "Position"):
+                parent_types = DOMAIN_OBJECT + ["Location"]
+        with self.store_lock:
+            entity = self.find(entity_type, data)
+            if entity is None:
+                stix_type = {
+                    "stix-core-relationship": "relationship",
+                    "stix-sighting-relationship": "sighting",
+                }.get(entity_type, entity_type.lower())
+                timestamp = now()
+                entity = {
+                    "id": str(uuid.uuid4()),
+                    "standard_id": data.get("stix_id")
+                    or stix_type + "--" + str(uuid.uuid4()),
+                    "entity_type": entity_type,
+                    "parent_types": parent_types,
+                    "spec_version": "2.1",
+                    "created_at": timestamp,
+                    "updated_at": timestamp,
+                    "created": timestamp,
+                    "modified": timestamp,
+                    "createdBy": None,
+                    "importFiles": connection([]),
+                }
+                for reference in REFERENCES:
+                    entity[reference] = connection([])
+                self.entities[entity["id"]] = entity
+                self.entities[entity["standard_id"]] = entity
+            else:
+                entity["updated_at"] = now()
+            self.update(entity, data)
+            return entity
+
+    def update(self, entity: Dict, data: Dict) -> None:
+        for key, value in data.items():
+            if key in ("stix_id", "update", "type", "input"):
+                continue
+            if key == "createdBy":
+                entity["createdBy"] = self.get(value)
+            elif key in REFERENCES:
+                entity[key] = connection(
+                    [item for item in (self.get(id) for id in value or []) if item]
+                )
+            elif key == "fromId":
+                entity["fromId"] = value
+                entity["from"] = self.get(value)
+            elif key == "toId":
+                entity["toId"] = value
+                entity["to"] = self.get(value)
+            else:
+                entity[key] = value
+
+    def add_observable(self, arguments: Dict) -> Dict:
+        entity_type = arguments["type"]
+        data = {
+            key: value for key, value in arguments.items() if key in OBSERVABLE_FIELDS
+        }
+        for key, value in arguments.items():
+            if key not in OBSERVABLE_FIELDS and isinstance(value, dict):
+                data.update(value)
+        for field in ("value", "name", "key", "body", "number"):
+            if data.get(field) is not None:
+                data["observable_value"] = str(data[field])
+                break
+        return self.add(entity_type, data, OBSERVABLE)
+
+    def edit_entity(self, arguments: Dict) -> Dict:
+        entity = self.get(arguments["id"])
+        if entity is None:
+            raise ValueError("Entity " + arguments["id"] + " not found")
+
+        def field_patch(patch_arguments: Dict) -> Dict:
+            patches = patch_arguments["input"]
+            for patch in patches if isinstance(patches, list) else [patches]:
+                values = patch["value"]
+                entity[patch["key"]] = (
+                    values[0]
+                    if isinstance(values, list) and len(values) == 1
+                    else values
+                )
+            return entity
+
+        def relation_add(relation_arguments: Dict) -> Dict:
+            relation = relation_arguments["input"]
+            target = self.get(relation["toId"])
+            key = {
+                "object-marking": "objectMarking",
+                "object-label": "objectLabel",
+                "external-reference": "externalReferences",
+                "kill-chain-phase": "killChainPhases",
+            }.get(relation["relationship_type"])
+            if key is not None and target is not None:
+                entity[key]["edges"].append({"node": target})
+            elif relation["relationship_type"] == "created-by":
+                entity["createdBy"] = target
+            return {"id": str(uuid.uuid4()), "from": entity, "to": target}
+
+        def delete(_: Dict) -> str:
+            with self.store_lock:
+                self.entities.pop(entity["id"], None)
+                self.entities.pop(entity["standard_id"], None)
+            return entity["id"]
+
+        return {
+            "fieldPatch": field_patch,
+            "relationAdd": relation_add,
+            "relationDelete": lambda _: entity,
+            "delete": delete,
+        }
+
+    def read_entity(self, entity_type: str, arguments: Dict) -> Optional[Dict]:
+        entity = self.get(arguments.get("id"))
+        if entity is not None and self.is_a(entity, entity_type):
+            return entity
+        return None
+
+    @staticmethod
+    def is_a(entity: Dict, entity_type: str) -> bool:
+        return (
+            entity["entity_type"] == entity_type
+            or entity_type in entity["parent_types"]
+        )
+
+    @staticmethod
+    def matches(entity: Dict, filters: List[Dict]) -> bool:
+        for entity_filter in filters or []:
+            keys = entity_filter["key"]
+            values = entity_filter["values"]
+            matched = False
+            for key in keys if isinstance(keys, list) else [keys]:
+                if key == "entity_type":
+                    matched = any(
+                        MockOpenCTIPlatform.is_a(entity, value) for value in values
+                    )
+                else:
+                    field = entity.get(key)
+                    if isinstance(field, list):
+                        matched = any(value in field for value in values)
+                    else:
+                        matched = field in values
+                if matched:
+                    break
+            if not matched:
+                return False
+        return True
+
+    def list_entities(self, entity_type: str, arguments: Dict) -> Dict:
+        types = arguments.get("types")
+        search = arguments.get("search")
+        with self.store_lock:
+            entities = list(
+                {id(entity): entity for entity in self.entities.values()}.values()
+            )
+        selected = []
+        for entity in entities:
+            if not self.is_a(entity, entity_type):
+                continue
+            if types and not any(self.is_a(entity, item) for item in types):
+                continue
+            if search and not any(
+                search.lower() in str(entity.get(field) or "").lower()
+                for field in ("name", "value", "observable_value", "description")
+            ):
+                continue
+            if not self.matches(entity, arguments.get("filters")):
+                continue
+            if not self.matches_relationship(entity, arguments):
+                continue
+            selected.append(entity)
+        start = int(arguments.get("after") or 0)
+        first = arguments.get("first") or 500
+        end = start + first
+        return connection(
+            selected[start:end], has_next_page=end < len(selected), end_cursor=str(end)
+        )
+
+    @staticmethod
+    def matches_relationship(entity: Dict, arguments: Dict) -> bool:
+        relationship_type = arguments.get("relationship_type")
+        if relationship_type:
+            types = (
+                relationship_type
+                if isinstance(relationship_type, list)
+                else [relationship_type]
+            )
+            if entity.get("relationship_type") not in types:
+                return False
+        for argument, field in (("fromId", "fromId"), ("toId", "toId")):
+            value = arguments.get(argument)
+            if value:
+                values = value if isinstance(value, list) else [value]
+                if entity.get(field) not in values:
+                    return False
+        element_id = arguments.get("elementId")
+        if element_id and element_id not in (entity.get("fromId"), entity.get("toId")):
+            return False
+        return True
+
+    # Works
+
+    def add_work(self, arguments: Dict) -> Dict:
+        work = {
+            "id": "work_" + arguments["connectorId"] + "_" + str(uuid.uuid4()),
+            "name": arguments.get("friendlyName"),
+            "connector": {"id": arguments["connectorId"]},
+            "user": {"name": self.user["name"]},
+            "timestamp": now(),
+            "status": "wait",
+            "event_source_id": None,
+            "received_time": None,
+            "processed_time": None,
+            "completed_time": None,
+            "tracking": {"import_expected_number": 0, "import_processed_number": 0},
+            "messages": [],
+            "errors": [],
+        }
+        with self.store_lock:
+            self.works[work["id"]] = work
+        return work
+
+    def list_works(self, arguments: Dict) -> Dict:
+        with self.store_lock:
+            works = [
+                work
+                for work in self.works.values()
+                if all(
+                    self.match_work(work, work_filter)
+                    for work_filter in arguments.get("filters") or []
+                )
+            ]
+        return connection(works[: arguments.get("first") or len(works)])
+
+    @staticmethod
+    def match_work(work: Dict, work_filter: Dict) -> bool:
+        key = work_filter["key"]
+        value = work["connector"]["id"] if key == "connector_id" else work.get(key)
+        return value in work_filter["values"]
+
+    @staticmethod
+    def complete_work(work: Dict) -> None:
+        tracking = work["tracking"]
+        if (
+            work["processed_time"] is not None
+            and tracking["import_processed_number"]
+            >= tracking["import_expected_number"]
+        ):
+            work["status"] = "complete"
+            work["completed_time"] = now()
+
+    def edit_work(self, arguments: Dict) -> Dict:
+        work = self.works.get(arguments["id"])
+        if work is None:
+            raise ValueError("Work " + arguments["id"] + " not found")
+
+        def message(text: Optional[str], sequence: int = 0) -> Dict:
+            return {
+                "timestamp": now(),
+                "message": text,
+                "sequence": sequence,
+                "source": None,
+            }
+
+        def to_received(work_arguments: Dict) -> str:
+            with self.store_lock:
+                work["status"] = "progress"
+                work["received_time"] = now()
+                work["messages"].append(message(work_arguments.get("message")))
+            return work["id"]
+
+        def to_processed(work_arguments: Dict) -> str:
+            with self.store_lock:
+                work["processed_time"] = now()
+                if work_arguments.get("inError"):
+                    work["errors"].append(message(work_arguments.get("message")))
+                else:
+                    work["messages"].append(message(work_arguments.get("message")))
+                self.complete_work(work)
+            return work["id"]
+
+        def report_expectation(work_arguments: Dict) -> str:
+            with self.store_lock:
+                work["tracking"]["import_processed_number"] += 1
+                error = work_arguments.get("error")
+                if error is not None:
+                    work["errors"].append(message(error.get("error")))
+                self.complete_work(work)
+            return work["id"]
+
+        def add_expectations(work_arguments: Dict) -> str:
+            with self.store_lock:
+                work["tracking"]["import_expected_number"] += (
+                    work_arguments.get("expectations") or 0
+                )
+                if work["status"] == "complete":
+                    work["status"] = "progress"
+                    work["completed_time"] = None
+            return work["id"]
+
+        def delete(_: Dict) -> str:
+            with self.store_lock:
+                self.works.pop(work["id"], None)
+            return work["id"]
+
+        return {
+            "toReceived": to_received,
+            "toProcessed": to_processed,
+            "ping": lambda _: work["id"],
+            "reportExpectation": report_expectation,
+            "addExpectations": add_expectations,
+            "delete": delete,
+        }
+
+    # Connectors
+
+    def register_connector(self, arguments: Dict) -> Dict:
+        data = arguments["input"]
+        connector_id = data["id"]
+        with self.store_lock:
+            connector = self.connectors.get(connector_id)
+            if connector is None:
+                connector = {
+                    "id": connector_id,
+                    "connector_state": None,
+                    "connector_user": {"id": self.user["id"]},
+                    "active": True,
+                    "config": {
+                        "connection": {
+                            "host": "mock-broker",
+                            "vhost": "/",
+                            "use_ssl": False,
+                            "port": 5672,
+                            "user": "guest",
+                            "pass": "guest",
+                        },
+                        "listen": "listen_" + connector_id,
+                        "listen_exchange": "amqp.connector.exchange",
+                        "push": "push_" + connector_id,
+                        "push_exchange": "amqp.worker.exchange",
+                    },
+                }
+                self.connectors[connector_id] = connector
+            connector.update(data)
+            connector["updated_at"] = now()
+        config = connector["config"]
+        self.broker.bind(
+            config["listen_exchange"],
+            "listen_routing_" + connector_id,
+            config["listen"],
+        )
+        self.broker.bind(
+            config["push_exchange"], "push_routing_" + connector_id, config["push"]
+        )
+        return connector
+
+    def ping_connector(self, arguments: Dict) -> Dict:
+        connector = self.connectors.get(arguments["id"])
+        if connector is None:
+            raise ValueError("Connector " + arguments["id"] + " not found")
+        with self.store_lock:
+            connector["updated_at"] = now()
+            if connector["connector_state"] is None:
+                connector["connector_state"] = arguments.get("state")
+        return connector
+
+    def set_connector_state(self, connector_id: str, state: Any) -> None:
+        """reset the state of a connector, as done from the platform"""
+
+        with self.store_lock:
+            self.connectors[connector_id]["connector_state"] = (
+                json.dumps(state) if state is not None else None
+            )
+
+    def delete_connector(self, arguments: Dict) -> str:
+        with self.store_lock:
+            self.connectors.pop(arguments["id"], None)
+        return arguments["id"]
+
+    def send_message(
+        self, connector_id: str, event: Dict, with_work: bool = True
+    ) -> Optional[str]:
+        """send a message to the queue of a connector, as done by the platform
+
+        :param connector_id: the id of the connector
+        :type connector_id: str
+        :param event: the event of the message
+        :type event: dict
+        :param with_work: create a work tracking the message
+        :type with_work: bool
+        :return: the id of the work, if any
+        :rtype: str
+        """
+
+        work_id = None
+        if with_work:
+            work_id = self.add_work(
+                {"connectorId": connector_id, "friendlyName": "Mock work"}
+            )["id"]
+        config = self.connectors[connector_id]["config"]
+        self.broker.publish(
+            config["listen_exchange"],
+            "listen_routing_" + connector_id,
+            json.dumps(
+                {
+                    "internal": {"work_id": work_id, "applicant_id": self.user["id"]},
+                    "event": event,
+                }
+            ),
+        )
+        return work_id
+
+    def process_bundles(self, connector_id: str) -> List[Dict]:
+        """consume the bundles pushed by a connector, as done by the workers
+
+        Every bundle is counted as processed in the expectations of its work.
+
+        :param connector_id: the id of the connector
+        :type connector_id: str
+        :return: the consumed bundles
+        :rtype: list
+        """
+
+        bundles = []
+        push = self.connectors[connector_id]["config"]["push"]
+        for pushed in self.broker.drain(push):
+            message = json.loads(pushed.body)
+            bundles.append(json.loads(base64.b64decode(message["content"])))
+            work_id = message.get("work_id")
+            if work_id in self.works:
+                self.edit_work({"id": work_id})["reportExpectation"]({})
+        return bundles
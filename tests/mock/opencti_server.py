@@ -0,0 +1,459 @@
+import json
+import random
+import re
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+NAME = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+OPERATION = re.compile(r"\s*(query|mutation)\s*([_A-Za-z][_0-9A-Za-z]*)?")
+STRING = re.compile(r'"((?:[^"\\]|\\.)*)"')
+NUMBER = re.compile(r"-?[0-9]+(\.[0-9]+)?([eE][-+]?[0-9]+)?")
+
+
+def connection(nodes: List[Dict], has_next_page: bool = False, end_cursor=None):
+    """build a GraphQL connection (edges and pageInfo) from a list of nodes"""
+
+    return {
+        "edges": [{"node": node} for node in nodes],
+        "pageInfo": {
+            "startCursor": None,
+            "endCursor": end_cursor,
+            "hasNextPage": has_next_page,
+            "hasPreviousPage": False,
+            "globalCount": len(nodes),
+        },
+    }
+
+
+class Parser:
+    """Minimal parser of the root fields of a GraphQL document
+
+    Only what is needed to route the requests of pycti is parsed: the
+    operation, the root fields with their alias and arguments. Selections are
+    skipped, resolvers return whole objects.
+    """
+
+    def __init__(self, document: str, variables: Optional[Dict]) -> None:
+        self.document = document
+        self.variables = variables or {}
+        self.position = 0
+
+    def skip(self) -> None:
+        while self.position < len(self.document):
+            char = self.document[self.position]
+            if char.isspace() or char == ",":
+                self.position += 1
+            elif char == "#":
+                end = self.document.find("\n", self.position)
+                self.position = len(self.document) if end == -1 else end
+            else:
+                return
+
+    def peek(self) -> str:
+        self.skip()
+        return self.document[self.position : self.position + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(
+                "Expected " + char + " at " + str(self.position) + " of the document"
+            )
+        self.position += 1
+
+    def name(self) -> str:
+        self.skip()
+        match = NAME.match(self.document, self.position)
+        if match is None:
+            raise ValueError("Expected a name at " + str(self.position))
+        self.position = match.end()
+        return match.group(0)
+
+    def skip_block(self, opening: str, closing: str) -> None:
+        self.expect(opening)
+        delimiters = re.compile("[" + re.escape(opening + closing) + '"]')
+        depth = 1
+        while depth > 0:
+            match = delimiters.search(self.document, self.position)
+            if match is None:
+                raise ValueError("Unterminated " + opening + " in the document")
+            self.position = match.start()
+            char = match.group(0)
+            if char == '"':
+                self.value()
+                continue
+            if char == opening:
+                depth += 1
+            else:
+                depth -= 1
+            self.position += 1
+
+    def value(self) -> Any:
+        char = self.peek()
+        if char == "$":
+            self.position += 1
+            return self.variables.get(self.name())
+        if char == '"':
+            match = STRING.match(self.document, self.position)
+            self.position = match.end()
+            return json.loads(match.group(0))
+        if char == "[":
+            self.position += 1
+            values = []
+            while self.peek() != "]":
+                values.append(self.value())
+            self.position += 1
+            return values
+        if char == "{":
+            self.position += 1
+            values = {}
+            while self.peek() != "}":
+                key = self.name()
+                self.expect(":")
+                values[key] = self.value()
+            self.position += 1
+            return values
+        match = NUMBER.match(self.document, self.position)
+        if match is not None and match.end() > self.position:
+            self.position = match.end()
+            return json.loads(match.group(0))
+        literal = self.name()
+        return {"true": True, "false": False, "null": None}.get(literal, literal)
+
+    def arguments(self) -> Dict:
+        arguments = {}
+        if self.peek() == "(":
+            self.position += 1
+            while self.peek() != ")":
+                name = self.name()
+                self.expect(":")
+                arguments[name] = self.value()
+            self.position += 1
+        return arguments
+
+    def selection(self) -> List[Tuple[str, str, Dict, Optional[str]]]:
+        """parse a selection set, the selections of its fields are not parsed
+
+        :return: the list of the fields as (alias, field, arguments, selection)
+                 tuples, the selection being the source of the selection set
+                 of the field, if any
+        """
+
+        self.expect("{")
+        fields = []
+        while self.peek() != "}":
+            alias = self.name()
+            field = alias
+            if self.peek() == ":":
+                self.position += 1
+                field = self.name()
+            arguments = self.arguments()
+            selection = None
+            if self.peek() == "{":
+                start = self.position
+                self.skip_block("{", "}")
+                selection = self.document[start : self.position]
+            fields.append((alias, field, arguments, selection))
+        self.position += 1
+        return fields
+
+    def parse(
+        self,
+    ) -> Tuple[str, Optional[str], List[Tuple[str, str, Dict, Optional[str]]]]:
+        """parse the document
+
+        :return: the operation type, the operation name and the root fields,
+                 see `selection`
+        """
+
+        match = OPERATION.match(self.document)
+        operation, name = ("query", None)
+        if match is not None:
+            operation, name = match.group(1), match.group(2)
+            self.position = match.end()
+            if self.peek() == "(":
+                self.skip_block("(", ")")
+        return operation, name, self.selection()
+
+
+def event_position(event_id: str) -> Tuple[int, ...]:
+    return tuple(int(part) for part in event_id.split("-"))
+
+
+class MockOpenCTIServer:
+    """In-process HTTP server answering the GraphQL requests of pycti
+
+    Every root field of a request is resolved by the resolver registered for
+    its name, called with the arguments of the field. Fields without resolver
+    resolve to None. A resolver may return a dict of functions (such as the
+    `workEdit` mutations), the fields selected in it are then called with their
+    own arguments.
+
+    Requests are counted, by operation name too, they can be delayed to
+    simulate a remote platform and fail to test the error handling.
+
+    The `stream_events` are served as a live stream on `/stream`, after the
+    event given as `from` parameter, the events without id are served on
+    every connection. The server closes the stream after `stream_limit`
+    events, if set, to test the reconnections.
+
+    :param latency: delay of every request, in seconds
+    :type latency: float
+    :param jitter: maximum random delay added to the latency, in seconds
+    :type jitter: float
+    :param error_rate: probability of a field to fail with a GraphQL error
+    :type error_rate: float
+    :param http_error_rate: probability of a request to fail with a HTTP 500
+    :type http_error_rate: float
+    :param seed: seed of the random latencies and errors
+    :type seed: int
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        http_error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.http_error_rate = http_error_rate
+        self.random = random.Random(seed)
+        self.resolvers: Dict[str, Callable[[Dict], Any]] = {
+            "threatActors": lambda arguments: connection([]),
+        }
+        self.errors: Dict[str, List] = {}
+        self.stream_events: List[Tuple[str, str, Dict]] = []
+        self.stream_limit: Optional[int] = None
+        self.stream_gzip = False
+        self.stream_requests: List[str] = []
+        self.requests = 0
+        self.failed_requests = 0
+        self.operations = Counter()
+        self.applicants = Counter()
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return "http://127.0.0.1:" + str(self.server.server_address[1])
+
+    def resolve(self, name: str, resolver: Callable[[Dict], Any]) -> None:
+        """register the resolver of a root field"""
+
+        self.resolvers[name] = resolver
+
+    def inject_error(
+        self,
+        field: str,
+        message: str = "Injected error",
+        name: str = "INTERNAL_SERVER_ERROR",
+        times: Optional[int] = 1,
+    ) -> None:
+        """make the next resolutions of a root field fail with a GraphQL error
+
+        :param field: name of the root field
+        :type field: str
+        :param message: message of the error
+        :type message: str
+        :param name: name of the error
+        :type name: str
+        :param times: number of failing resolutions, None to always fail
+        :type times: int
+        """
+
+        with self.lock:
+            self.errors[field] = [{"name": name, "message": message}, times]
+
+    def reset(self) -> None:
+        """reset the request counters"""
+
+        with self.lock:
+            self.requests = 0
+            self.failed_requests = 0
+            self.operations = Counter()
+            self.applicants = Counter()
+
+    def injected_error(self, field: str) -> Optional[Dict]:
+        with self.lock:
+            injected = self.errors.get(field)
+            if injected is not None:
+                if injected[1] is not None:
+                    injected[1] -= 1
+                    if injected[1] <= 0:
+                        del self.errors[field]
+                return dict(injected[0])
+            if self.error_rate > 0 and self.random.random() < self.error_rate:
+                return {"name": "INTERNAL_SERVER_ERROR", "message": "Random error"}
+        return None
+
+    def resolve_object(self, value: Dict, selection: str, variables: Dict) -> Dict:
+        result = {}
+        for alias, field, arguments, _ in Parser(selection, variables).selection():
+            resolver = value.get(field)
+            result[alias] = resolver(arguments) if callable(resolver) else resolver
+        return result
+
+    def execute(self, payload: Dict, headers: Optional[Dict] = None) -> Dict:
+        """execute a GraphQL request, returning the response payload
+
+        Requests are counted by operation name and by applicant, the
+        `opencti-applicant-id` header.
+        """
+
+        variables = payload.get("variables")
+        _, name, fields = Parser(payload["query"], variables).parse()
+        with self.lock:
+            self.requests += 1
+            self.operations[name] += 1
+            self.applicants[(headers or {}).get("opencti-applicant-id")] += 1
+        data = {}
+        errors = []
+        for alias, field, arguments, selection in fields:
+            error = self.injected_error(field)
+            if error is not None:
+                error["path"] = [alias]
+                errors.append(error)
+                data[alias] = None
+                continue
+            resolver = self.resolvers.get(field)
+            try:
+                value = resolver(arguments) if resolver is not None else None
+                if (
+                    isinstance(value, dict)
+                    and selection is not None
+                    and any(callable(item) for item in value.values())
+                ):
+                    value = self.resolve_object(value, selection, variables)
+            except Exception as e:  # pylint: disable=broad-except
+                errors.append(
+                    {"name": type(e).__name__, "message": str(e), "path": [alias]}
+                )
+                value = None
+            data[alias] = value
+        if len(errors) > 0:
+            return {"errors": errors, "data": data}
+        return {"data": data}
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(0, self.jitter) if self.jitter > 0 else 0
+        return self.latency + jitter
+
+    def http_error(self) -> bool:
+        with self.lock:
+            if self.http_error_rate > 0 and self.random.random() < self.http_error_rate:
+                self.failed_requests += 1
+                return True
+        return False
+
+    def stream(self, path: str) -> List[Tuple[str, str, Dict]]:
+        """get the events served to a live stream request"""
+
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(path).query)
+        start = event_position(query.get("from", ["0-0"])[0])
+        with self.lock:
+            self.stream_requests.append(path)
+            events = [
+                event
+                for event in self.stream_events
+                if event[0] is None or event_position(event[0]) > start
+            ]
+        return events[: self.stream_limit]
+
+    def start(self) -> "MockOpenCTIServer":
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                delay = mock.delay()
+                if delay > 0:
+                    time.sleep(delay)
+                if mock.http_error():
+                    status = 500
+                    body = b"Internal Server Error"
+                else:
+                    status = 200
+                    body = json.dumps(mock.execute(payload, self.headers)).encode(
+                        "utf-8"
+                    )
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if not self.path.startswith("/stream"):
+                    self.send_error(404)
+                    return
+                events = mock.stream(self.path)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                if mock.stream_gzip:
+                    self.send_header("Content-Encoding", "gzip")
+                self.end_headers()
+                compressor = zlib.compressobj(wbits=31) if mock.stream_gzip else None
+
+                def write(data: bytes) -> None:
+                    if compressor is not None:
+                        data = compressor.compress(data) + compressor.flush(
+                            zlib.Z_SYNC_FLUSH
+                        )
+                    if len(data) > 0:
+                        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+                write(b": connected\n\n")
+                for event_id, event, data in events:
+                    write(
+                        (
+                            ("id: " + event_id + "\n" if event_id is not None else "")
+                            + "event: "
+                            + event
+                            + "\ndata: "
+                            + json.dumps(data)
+                            + "\n\n"
+                        ).encode("utf-8")
+                    )
+                if compressor is not None:
+                    tail = compressor.flush()
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(tail), tail))
+                self.wfile.write(b"0\r\n\r\n")
+                self.close_connection = True
+
+            def log_message(self, format, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=[0.05], daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self) -> "MockOpenCTIServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()